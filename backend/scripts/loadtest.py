@@ -0,0 +1,434 @@
+"""Load generator for the API.
+
+Builds job and scenario payloads with the test factories and sends a random
+mix of requests to the app, either in-process through ASGI or to a running
+server, from a fixed number of concurrent clients. Reports throughput,
+latency percentiles and error rates per route and saves them as JSON, so
+runs can be compared between versions.
+
+Run from the backend directory:
+
+    poetry run python scripts/loadtest.py --requests 2000 --concurrency 32 -o new.json
+    poetry run python scripts/loadtest.py --url http://localhost:8000 --duration 60
+    poetry run python scripts/loadtest.py --compare old.json new.json
+
+Payloads are drawn from a small pool, so identical requests repeat as they do
+when dashboards reload; pass a larger `--pool` to measure cold computations.
+Any response other than 2xx counts as an error.
+"""
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import json
+from pathlib import Path
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import factory.random
+import httpx
+import numpy as np
+
+# Make the test factories importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from networth.models.scenario import (  # noqa: E402
+    Expense,
+    ExpenseCategory,
+    FinancialScenario,
+    Income,
+    Investment,
+)
+from tests.test_util.factories import JobFactory, RegularStockGrantFactory  # noqa: E402
+
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class Payloads:
+    """Pools of JSON-ready jobs and scenarios to draw request bodies from."""
+
+    jobs: List[dict]
+    scenarios: List[dict]
+
+    @classmethod
+    def build(cls, size: int, seed: int = 0) -> "Payloads":
+        factory.random.reseed_random(seed)
+        rng = np.random.default_rng(seed)
+        jobs, scenarios = [], []
+        for _ in range(size):
+            job = JobFactory.build()
+            job.comp_package.stock_grants = RegularStockGrantFactory.build_batch(2)
+            jobs.append(job.model_dump(mode="json"))
+            scenarios.append(_scenario(job, rng).model_dump(mode="json"))
+        return cls(jobs=jobs, scenarios=scenarios)
+
+
+def _sample(values: list, size: int, rng: np.random.Generator) -> list:
+    return [values[i] for i in rng.choice(len(values), size, replace=False)]
+
+
+def _scenario(job, rng: np.random.Generator) -> FinancialScenario:
+    """A scenario funded by the job's latest salary."""
+    salary = job.comp_package.base_salary_history[-1].annual_amount.amount / 100
+    return FinancialScenario(
+        name=job.name,
+        start_date=job.comp_package.start_date,
+        incomes=[
+            Income(
+                source=job.name,
+                amount=round(salary, 2),
+                is_monthly=False,
+                tax_rate=round(rng.uniform(0.2, 0.4), 2),
+                growth_rate=round(rng.uniform(0, 0.05), 3),
+            )
+        ],
+        expenses=[
+            Expense(
+                category=category,
+                amount=round(rng.uniform(100, 3_000), 2),
+                growth_rate=0.025,
+            )
+            for category in _sample(list(ExpenseCategory), 3, rng)
+        ],
+        investments=[
+            Investment(
+                name="Index fund",
+                initial_amount=round(rng.uniform(0, 200_000), 2),
+                monthly_contribution=round(rng.uniform(0, 2_000), 2),
+                expected_return_rate=round(rng.uniform(0.03, 0.08), 3),
+            )
+        ],
+    )
+
+
+@dataclass(frozen=True)
+class Route:
+    name: str
+    method: str
+    path: str
+    body: Callable[[Payloads, np.random.Generator], dict]
+
+
+def _pick(pool: List[dict], rng: np.random.Generator) -> dict:
+    return pool[rng.integers(len(pool))]
+
+
+def _dashboard(payloads: Payloads, rng: np.random.Generator) -> dict:
+    job = _pick(payloads.jobs, rng)
+    year = int(job["comp_package"]["start_date"][:4])
+    return {
+        "jobs": {"job": job},
+        "scenarios": {"base": _pick(payloads.scenarios, rng)},
+        "queries": [
+            {
+                "type": "totals",
+                "job": "job",
+                "windows": [
+                    {"start_date": f"{y}-01-01", "end_date": f"{y + 1}-01-01"}
+                    for y in range(year, year + 4)
+                ],
+            },
+            {"type": "series", "job": "job", "resolution": "monthly"},
+            {
+                "type": "withholding",
+                "job": "job",
+                "filing_status": "married_jointly",
+                "state": "CA",
+            },
+            {"type": "projection", "scenario": "base", "years": 30},
+        ],
+    }
+
+
+ROUTES = {
+    route.name: route
+    for route in [
+        Route(
+            "create_job",
+            "POST",
+            "/jobs/",
+            lambda p, rng: {
+                key: _pick(p.jobs, rng)[key] for key in ("name", "comp_package")
+            },
+        ),
+        Route(
+            "series",
+            "POST",
+            "/jobs/series",
+            lambda p, rng: {
+                "job": _pick(p.jobs, rng),
+                "resolution": str(rng.choice(["weekly", "monthly", "auto"])),
+                "num_points": 120,
+            },
+        ),
+        Route(
+            "withholding",
+            "POST",
+            "/jobs/withholding",
+            lambda p, rng: {
+                "job": _pick(p.jobs, rng),
+                "filing_status": "married_jointly",
+                "state": "CA",
+            },
+        ),
+        Route(
+            "projection",
+            "POST",
+            "/projections/",
+            lambda p, rng: {
+                "model": {"base_scenario": _pick(p.scenarios, rng)},
+                "years": 30,
+            },
+        ),
+        Route(
+            "simulation",
+            "POST",
+            "/projections/simulate",
+            lambda p, rng: {
+                "scenario": _pick(p.scenarios, rng),
+                "years": 30,
+                "num_paths": 1_000,
+                "seed": int(rng.integers(10)),
+            },
+        ),
+        Route(
+            "goal_seek",
+            "POST",
+            "/projections/goal-seek",
+            lambda p, rng: {
+                "scenario": _pick(p.scenarios, rng),
+                "parameter": "monthly_contribution",
+                "targets": [1_000_000, 2_000_000],
+                "year": 20,
+            },
+        ),
+        Route("dashboard", "POST", "/dashboard", _dashboard),
+    ]
+}
+
+
+@dataclass(frozen=True)
+class Sample:
+    route: str
+    # None when the request failed without a response
+    status: Optional[int]
+    latency: float
+
+    @property
+    def ok(self) -> bool:
+        return self.status is not None and 200 <= self.status < 300
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    routes: Sequence[Route],
+    payloads: Payloads,
+    concurrency: int,
+    requests: Optional[int] = None,
+    duration: Optional[float] = None,
+    seed: int = 0,
+) -> Tuple[List[Sample], float]:
+    """Send requests from `concurrency` clients until `requests` were sent or
+    `duration` seconds passed. Returns the samples and the elapsed time."""
+    if (requests is None) == (duration is None):
+        raise ValueError("Pass exactly one of requests and duration")
+    rng = np.random.default_rng(seed)
+    samples: List[Sample] = []
+    sent = 0
+    start = time.perf_counter()
+    deadline = start + duration if duration is not None else None
+
+    def more() -> bool:
+        if deadline is not None:
+            return time.perf_counter() < deadline
+        return sent < requests
+
+    async def worker():
+        nonlocal sent
+        while more():
+            sent += 1
+            route = routes[rng.integers(len(routes))]
+            body = route.body(payloads, rng)
+            began = time.perf_counter()
+            try:
+                response = await client.request(route.method, route.path, json=body)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = None
+            samples.append(Sample(route.name, status, time.perf_counter() - began))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, time.perf_counter() - start
+
+
+def _stats(samples: List[Sample], elapsed: float) -> dict:
+    latencies = np.array([sample.latency for sample in samples]) * 1_000
+    errors = sum(not sample.ok for sample in samples)
+    statuses: Dict[str, int] = {}
+    for sample in samples:
+        key = str(sample.status) if sample.status is not None else "failed"
+        statuses[key] = statuses.get(key, 0) + 1
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": errors / len(samples),
+        "throughput": len(samples) / elapsed,
+        "statuses": dict(sorted(statuses.items())),
+        "latency_ms": {
+            **{
+                f"p{p}": float(value)
+                for p, value in zip(PERCENTILES, np.percentile(latencies, PERCENTILES))
+            },
+            "mean": float(latencies.mean()),
+            "max": float(latencies.max()),
+        },
+    }
+
+
+def summarize(samples: List[Sample], elapsed: float) -> dict:
+    """Statistics per route and over all requests; throughput is per second
+    of the whole run."""
+    by_route: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        by_route.setdefault(sample.route, []).append(sample)
+    return {
+        "routes": {
+            name: _stats(route_samples, elapsed)
+            for name, route_samples in sorted(by_route.items())
+        },
+        "all": _stats(samples, elapsed) if samples else None,
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _row(name: str, stats: dict) -> str:
+    latency = stats["latency_ms"]
+    return (
+        f"{name:<14}{stats['requests']:>8}{stats['throughput']:>10.1f}"
+        f"{latency['p50']:>9.1f}{latency['p95']:>9.1f}{latency['p99']:>9.1f}"
+        f"{stats['error_rate']:>8.1%}"
+    )
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"{'route':<14}{'reqs':>8}{'req/s':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'err':>8}"
+    )
+    for name, stats in report["routes"].items():
+        print(_row(name, stats))
+    print(_row("all", report["all"]))
+
+
+def print_comparison(before: dict, after: dict) -> None:
+    """Latency percentiles and throughput of two reports, route by route."""
+
+    def change(old: float, new: float) -> str:
+        return f"{(new - old) / old:+.0%}" if old else "n/a"
+
+    print(f"{'route':<14}{'metric':<12}{'before':>10}{'after':>10}{'change':>8}")
+    routes = {**before["routes"], "all": before["all"]}
+    new_routes = {**after["routes"], "all": after["all"]}
+    for name, old in routes.items():
+        new = new_routes.get(name)
+        if new is None:
+            continue
+        metrics = [(f"p{p} ms", "latency_ms", f"p{p}") for p in PERCENTILES]
+        for label, group, key in metrics:
+            a, b = old[group][key], new[group][key]
+            print(f"{name:<14}{label:<12}{a:>10.1f}{b:>10.1f}{change(a, b):>8}")
+        a, b = old["throughput"], new["throughput"]
+        print(f"{name:<14}{'req/s':<12}{a:>10.1f}{b:>10.1f}{change(a, b):>8}")
+        a, b = old["error_rate"], new["error_rate"]
+        print(f"{name:<14}{'errors':<12}{a:>10.1%}{b:>10.1%}")
+
+
+def _client(url: Optional[str], timeout: float) -> httpx.AsyncClient:
+    if url:
+        return httpx.AsyncClient(base_url=url, timeout=timeout)
+    from networth.main import create_app
+
+    transport = httpx.ASGITransport(app=create_app())
+    return httpx.AsyncClient(
+        transport=transport, base_url="http://loadtest", timeout=timeout
+    )
+
+
+async def _main(args: argparse.Namespace) -> dict:
+    routes = [ROUTES[name] for name in args.routes]
+    payloads = Payloads.build(args.pool, args.seed)
+    async with _client(args.url, args.timeout) as client:
+        samples, elapsed = await run_load(
+            client,
+            routes,
+            payloads,
+            args.concurrency,
+            requests=None if args.duration else args.requests,
+            duration=args.duration,
+            seed=args.seed,
+        )
+    return {
+        "meta": {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "revision": _git_revision(),
+            "target": args.url or "in-process",
+            "concurrency": args.concurrency,
+            "pool": args.pool,
+            "seed": args.seed,
+            "elapsed": elapsed,
+        },
+        **summarize(samples, elapsed),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="Server to load; default runs the app in-process")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1_000)
+    parser.add_argument(
+        "--duration", type=float, help="Run for this many seconds instead"
+    )
+    parser.add_argument(
+        "--routes", nargs="+", choices=list(ROUTES), default=list(ROUTES)
+    )
+    parser.add_argument("--pool", type=int, default=20, help="Payloads per kind")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("-o", "--output", type=Path, help="Save the report as JSON")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        type=Path,
+        metavar=("BEFORE", "AFTER"),
+        help="Compare two saved reports instead of running",
+    )
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        before, after = (json.loads(path.read_text()) for path in args.compare)
+        print_comparison(before, after)
+        return
+
+    report = asyncio.run(_main(args))
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
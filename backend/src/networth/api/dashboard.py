@@ -0,0 +1,221 @@
+"""One request for everything a dashboard shows.
+
+The request carries the jobs and scenarios once, under names chosen by the
+client, plus a list of queries that refer to them by name. Each entity is
+validated once, intermediate results such as a job's PackedCompensation or
+a scenario's projection are built once and shared by every query that needs
+them, and the results come back in query order. A query that fails yields an
+error result instead of failing the whole dashboard.
+"""
+
+from datetime import date
+from decimal import Decimal
+from typing import Annotated, Dict, List, Literal, Optional, Union
+
+from fastapi import APIRouter
+from pydantic import BaseModel, Field, model_validator
+
+from networth.api.job import CompensationSeriesResponse, series_response
+from networth.api.precompute import artifact_cache
+from networth.api.singleflight import flight_key, flights
+from networth.cache import model_codec
+from networth.finance.compensation_arrays import PackedCompensation
+from networth.finance.series import MAX_PERIODS, SeriesResolution, compensation_series
+from networth.finance.sweep import ScenarioArrays, project_net_worth
+from networth.finance.withholding import estimate_package_withholding
+from networth.models.compensation_package import CompensationBreakdown
+from networth.models.job import Job
+from networth.models.scenario import FinancialScenario
+from networth.models.taxes import VestTaxYear
+
+router = APIRouter()
+
+MAX_QUERIES = 100
+
+
+class DateWindow(BaseModel):
+    start_date: date
+    end_date: date
+
+
+class TotalsQuery(BaseModel):
+    type: Literal["totals"] = "totals"
+    job: str
+    windows: List[DateWindow] = Field(min_length=1, max_length=1_000)
+
+
+class SeriesQuery(BaseModel):
+    type: Literal["series"] = "series"
+    job: str
+    resolution: SeriesResolution = SeriesResolution.MONTHLY
+    num_points: Optional[int] = Field(default=None, ge=1, le=MAX_PERIODS)
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+
+class WithholdingQuery(BaseModel):
+    type: Literal["withholding"] = "withholding"
+    job: str
+    filing_status: str
+    state: str
+    inflation_rate: Optional[float] = Field(default=None, ge=0, le=1)
+
+
+class ProjectionQuery(BaseModel):
+    type: Literal["projection"] = "projection"
+    scenario: str
+    years: int = Field(ge=0, le=200)
+
+
+DashboardQuery = Annotated[
+    Union[TotalsQuery, SeriesQuery, WithholdingQuery, ProjectionQuery],
+    Field(discriminator="type"),
+]
+
+
+class DashboardRequest(BaseModel):
+    jobs: Dict[str, Job] = {}
+    scenarios: Dict[str, FinancialScenario] = {}
+    queries: List[DashboardQuery] = Field(min_length=1, max_length=MAX_QUERIES)
+
+    @model_validator(mode="after")
+    def check_references(self) -> "DashboardRequest":
+        for i, query in enumerate(self.queries):
+            if isinstance(query, ProjectionQuery):
+                if query.scenario not in self.scenarios:
+                    raise ValueError(f"Query {i}: unknown scenario {query.scenario!r}")
+            elif query.job not in self.jobs:
+                raise ValueError(f"Query {i}: unknown job {query.job!r}")
+        return self
+
+
+class TotalsResult(BaseModel):
+    type: Literal["totals"] = "totals"
+    breakdowns: List[CompensationBreakdown]
+    totals: List[Decimal]
+
+
+class SeriesResult(BaseModel):
+    type: Literal["series"] = "series"
+    series: CompensationSeriesResponse
+
+
+class WithholdingResult(BaseModel):
+    type: Literal["withholding"] = "withholding"
+    years: List[VestTaxYear]
+
+
+class ProjectionResult(BaseModel):
+    type: Literal["projection"] = "projection"
+    years: List[int]
+    net_worth: List[float]
+
+
+class ErrorResult(BaseModel):
+    type: Literal["error"] = "error"
+    detail: str
+
+
+DashboardResult = Annotated[
+    Union[TotalsResult, SeriesResult, WithholdingResult, ProjectionResult, ErrorResult],
+    Field(discriminator="type"),
+]
+
+
+class DashboardResponse(BaseModel):
+    # One result per query, in query order
+    results: List[DashboardResult]
+
+
+class _Dashboard:
+    """Intermediate results shared by the queries of one request."""
+
+    def __init__(self, request: DashboardRequest):
+        self.request = request
+        self._packed: Dict[str, PackedCompensation] = {}
+        self._net_worth: Dict[str, List[float]] = {}
+        # Every projection of a scenario is a prefix of its longest one
+        self._years: Dict[str, int] = {}
+        for query in request.queries:
+            if isinstance(query, ProjectionQuery):
+                self._years[query.scenario] = max(
+                    query.years, self._years.get(query.scenario, 0)
+                )
+
+    def packed(self, job: str) -> PackedCompensation:
+        if job not in self._packed:
+            stored = self.request.jobs[job]
+            # Stored jobs usually have theirs precomputed
+            packed = artifact_cache.packed(stored)
+            if packed is None:
+                packed = PackedCompensation.from_package(stored.comp_package)
+            self._packed[job] = packed
+        return self._packed[job]
+
+    def net_worth(self, scenario: str) -> List[float]:
+        if scenario not in self._net_worth:
+            arrays = ScenarioArrays.from_scenario(self.request.scenarios[scenario])
+            self._net_worth[scenario] = project_net_worth(
+                arrays, self._years[scenario]
+            ).tolist()
+        return self._net_worth[scenario]
+
+    def totals(self, query: TotalsQuery) -> TotalsResult:
+        breakdowns = self.packed(query.job).breakdowns(
+            [window.start_date for window in query.windows],
+            [window.end_date for window in query.windows],
+        )
+        return TotalsResult(
+            breakdowns=breakdowns,
+            totals=[breakdown.total for breakdown in breakdowns],
+        )
+
+    def series(self, query: SeriesQuery) -> SeriesResult:
+        series = compensation_series(
+            self.request.jobs[query.job].comp_package,
+            query.resolution,
+            start_date=query.start_date,
+            end_date=query.end_date,
+            num_points=query.num_points,
+            packed=self.packed(query.job),
+        )
+        return SeriesResult(series=series_response(series))
+
+    def withholding(self, query: WithholdingQuery) -> WithholdingResult:
+        schedule = estimate_package_withholding(
+            self.request.jobs[query.job].comp_package,
+            query.filing_status,
+            query.state,
+            query.inflation_rate,
+            packed=self.packed(query.job),
+        )
+        return WithholdingResult(years=list(schedule.years.values()))
+
+    def projection(self, query: ProjectionQuery) -> ProjectionResult:
+        return ProjectionResult(
+            years=list(range(query.years + 1)),
+            net_worth=self.net_worth(query.scenario)[: query.years + 1],
+        )
+
+    def evaluate(self, query) -> DashboardResult:
+        try:
+            return getattr(self, query.type)(query)
+        except ValueError as e:
+            return ErrorResult(detail=str(e))
+
+
+def _evaluate(request: DashboardRequest) -> DashboardResponse:
+    dashboard = _Dashboard(request)
+    return DashboardResponse(
+        results=[dashboard.evaluate(query) for query in request.queries]
+    )
+
+
+_dashboard_codec = model_codec(DashboardResponse)
+
+
+@router.post("/dashboard", response_model=DashboardResponse)
+async def dashboard(request: DashboardRequest):
+    return await flights.run(
+        flight_key("dashboard", request), _evaluate, request, codec=_dashboard_codec
+    )
@@ -1,46 +1,236 @@
+from datetime import date
 from fastapi import APIRouter, HTTPException
-from typing import List
-import ksuid
+from typing import Dict, List, Optional
+from uuid import UUID
 
-from networth.models.job import Job
+from pydantic import BaseModel, Field
+
+from networth.api.precompute import artifact_cache, scheduler
+from networth.api.projection import streaming_export
+from networth.api.singleflight import flight_key, flights
+from networth.api.store import job_store
+from networth.cache import model_codec
+from networth.finance.bootstrap import DEFAULT_PERCENTILES
+from networth.finance.equity import simulate_equity_value
+from networth.finance.export import ExportFormat, ledger_batches
+from networth.finance.series import (
+    MAX_PERIODS,
+    CompensationSeries,
+    SeriesResolution,
+    compensation_series,
+)
+from networth.finance.withholding import estimate_package_withholding
+from networth.models.job import Job, JobCreate
+from networth.models.taxes import VestTaxYear
 
 router = APIRouter()
 
 
+class WithholdingRequest(BaseModel):
+    job: Job
+    filing_status: str
+    state: str
+    # Index brackets of future years instead of reusing the latest ones
+    inflation_rate: Optional[float] = Field(default=None, ge=0, le=1)
+
+
+class EquitySimulationRequest(BaseModel):
+    job: Job
+    valuation_date: date
+    drift: float
+    volatility: float = Field(ge=0)
+    num_paths: int = Field(default=10_000, ge=1, le=200_000)
+    current_price: Optional[float] = Field(default=None, gt=0)
+    seed: Optional[int] = None
+
+
+class EquitySimulationResponse(BaseModel):
+    years: List[int]
+    mean: List[float]
+    percentiles: Dict[str, List[float]]
+
+
+class CompensationSeriesRequest(BaseModel):
+    job: Job
+    resolution: SeriesResolution = SeriesResolution.MONTHLY
+    num_points: Optional[int] = Field(default=None, ge=1, le=MAX_PERIODS)
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+
+class CompensationSeriesResponse(BaseModel):
+    resolution: SeriesResolution
+    period_starts: List[date]
+    period_ends: List[date]
+    salary: List[float]
+    bonuses: List[float]
+    stock_grants: List[float]
+    signing_bonuses: List[float]
+    total: List[float]
+    cumulative: List[float]
+
+
 @router.post("/jobs/", response_model=Job)
 async def create_job(job: JobCreate):
-    # Generate a new KSUID for the job
-    job_id = str(ksuid.ksuid())
-
-    # Create the job with the generated ID
-    return Job(
-        id=job_id, name=job.name, start_date=job.start_date, end_date=job.end_date
-    )
+    # The job gets a newly generated id from NWBase
+    created = job_store.add(Job(name=job.name, comp_package=job.comp_package))
+    scheduler.job_changed(created)
+    return created
 
 
 @router.get("/jobs/{job_id}", response_model=Job)
-async def read_job(job_id: str):
-    # Add your database query logic here
-    # For now, raising a not found error
-    raise HTTPException(status_code=404, detail="Job not found")
+async def read_job(job_id: UUID):
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    scheduler.job_read(job)
+    return job
 
 
 @router.get("/jobs/", response_model=List[Job])
 async def list_jobs():
-    # Add your database query logic here
-    # For now, returning an empty list
-    return []
+    return job_store.list()
 
 
 @router.put("/jobs/{job_id}", response_model=Job)
-async def update_job(job_id: str, job: JobCreate):
-    # Add your database update logic here
-    # For now, raising a not found error
-    raise HTTPException(status_code=404, detail="Job not found")
+async def update_job(job_id: UUID, job: JobCreate):
+    updated = job_store.update(job_id, job)
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    scheduler.job_changed(updated)
+    return updated
+
+
+@router.delete("/jobs/{job_id}", status_code=204)
+async def delete_job(job_id: UUID):
+    if not job_store.delete(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    scheduler.job_deleted(job_id)
+
+
+@router.post("/jobs/ledger/export")
+async def export_job_ledger(job: Job, format: ExportFormat = ExportFormat.CSV):
+    return streaming_export(ledger_batches(job.comp_package), format, "ledger")
+
+
+_withholding_codec = model_codec(List[VestTaxYear])
+
+
+def _estimate_withholding(request: WithholdingRequest) -> List[VestTaxYear]:
+    schedule = estimate_package_withholding(
+        request.job.comp_package,
+        request.filing_status,
+        request.state,
+        request.inflation_rate,
+        packed=artifact_cache.packed(request.job),
+    )
+    return list(schedule.years.values())
+
+
+@router.post("/jobs/withholding", response_model=List[VestTaxYear])
+async def estimate_job_withholding(request: WithholdingRequest):
+    try:
+        return await flights.run(
+            flight_key(
+                "withholding",
+                request.job,
+                filing_status=request.filing_status,
+                state=request.state,
+                inflation_rate=request.inflation_rate,
+            ),
+            _estimate_withholding,
+            request,
+            codec=_withholding_codec,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+_equity_simulation_codec = model_codec(EquitySimulationResponse)
+
+
+def _simulate_equity(request: EquitySimulationRequest) -> EquitySimulationResponse:
+    result = simulate_equity_value(
+        request.job.comp_package.stock_grants,
+        request.valuation_date,
+        request.drift,
+        request.volatility,
+        num_paths=request.num_paths,
+        current_price=request.current_price,
+        seed=request.seed,
+    )
+    return EquitySimulationResponse(
+        years=result.years.tolist(),
+        mean=result.mean().tolist(),
+        percentiles={
+            str(p): values.tolist()
+            for p, values in result.percentiles(DEFAULT_PERCENTILES).items()
+        },
+    )
+
+
+@router.post("/jobs/equity/simulate", response_model=EquitySimulationResponse)
+async def simulate_job_equity(request: EquitySimulationRequest):
+    try:
+        return await flights.run(
+            flight_key(
+                "equity_simulation",
+                request.job,
+                **request.model_dump(mode="json", exclude={"job"}),
+            ),
+            _simulate_equity,
+            request,
+            # Unseeded runs are random and must not be reused
+            codec=_equity_simulation_codec if request.seed is not None else None,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+_series_codec = model_codec(CompensationSeriesResponse)
+
+
+def series_response(series: CompensationSeries) -> CompensationSeriesResponse:
+    dates = series.boundaries.astype("datetime64[D]").tolist()
+    return CompensationSeriesResponse(
+        resolution=series.resolution,
+        period_starts=dates[:-1],
+        period_ends=dates[1:],
+        salary=(series.salary / 100).tolist(),
+        bonuses=(series.bonuses / 100).tolist(),
+        stock_grants=(series.stock_grants / 100).tolist(),
+        signing_bonuses=(series.signing_bonuses / 100).tolist(),
+        total=(series.total / 100).tolist(),
+        cumulative=(series.cumulative / 100).tolist(),
+    )
+
+
+def _compensation_series(
+    request: CompensationSeriesRequest,
+) -> CompensationSeriesResponse:
+    series = compensation_series(
+        request.job.comp_package,
+        request.resolution,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        num_points=request.num_points,
+        packed=artifact_cache.packed(request.job),
+    )
+    return series_response(series)
 
 
-@router.delete("/jobs/{job_id}")
-async def delete_job(job_id: str):
-    # Add your database deletion logic here
-    # For now, raising a not found error
-    raise HTTPException(status_code=404, detail="Job not found")
+@router.post("/jobs/series", response_model=CompensationSeriesResponse)
+async def job_compensation_series(request: CompensationSeriesRequest):
+    try:
+        return await flights.run(
+            flight_key(
+                "compensation_series",
+                request.job,
+                **request.model_dump(mode="json", exclude={"job"}),
+            ),
+            _compensation_series,
+            request,
+            codec=_series_codec,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
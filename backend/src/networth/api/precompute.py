@@ -0,0 +1,271 @@
+"""Background precomputation of stored jobs' compensation arrays.
+
+The first request that touches a job pays for expanding its vesting
+schedules and packing its salary, bonus and vest events
+(`PackedCompensation`), which every dashboard, series and withholding query
+starts from. `PrecomputeScheduler` builds them ahead of time: jobs that were
+just created or updated are queued first, then jobs that clients read often
+but whose arrays are missing (never built, or evicted from the
+`ArtifactCache`), most-read first.
+
+A few worker tasks do the work, one job at a time each, in the thread pool.
+Before each job they wait until no foreground computation is in flight,
+backing off exponentially while the API is busy, so precomputation only
+uses idle time. Artifacts are tied to the `updated_at` the store gave the
+job version they were built from, and are only served for a job carrying
+that version's compensation package, so an edited job is never served stale
+arrays, even when a client sends it with the stored job's id and
+`updated_at`.
+"""
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+import heapq
+import itertools
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from starlette.concurrency import run_in_threadpool
+
+from networth.api.singleflight import flights
+from networth.api.store import JobStore, job_store
+from networth.finance.compensation_arrays import PackedCompensation
+from networth.models.compensation_package import CompensationPackage
+from networth.models.job import Job
+
+logger = logging.getLogger(__name__)
+
+# Queue priorities; lower runs first
+CHANGED = 0
+READ = 1
+
+
+@dataclass
+class JobArtifacts:
+    job_id: UUID
+    updated_at: datetime
+    # The stored package the arrays were built from
+    package: CompensationPackage
+    packed: PackedCompensation
+
+
+def build_artifacts(job: Job) -> JobArtifacts:
+    return JobArtifacts(
+        job_id=job.id,
+        updated_at=job.updated_at,
+        package=job.comp_package,
+        packed=PackedCompensation.from_package(job.comp_package),
+    )
+
+
+class ArtifactCache:
+    """The artifacts of the `max_jobs` most recently used jobs.
+
+    Lookups take the job itself and only match artifacts built from the same
+    stored version of it, with the same compensation package.
+    """
+
+    def __init__(self, max_jobs: int = 256):
+        self.max_jobs = max_jobs
+        self._artifacts: OrderedDict[UUID, JobArtifacts] = OrderedDict()
+        # Read from request threads and written from the event loop
+        self._lock = threading.Lock()
+
+    def get(self, job: Job) -> Optional[JobArtifacts]:
+        package = job.comp_package
+        with self._lock:
+            artifacts = self._artifacts.get(job.id)
+            if artifacts is None or artifacts.updated_at != job.updated_at:
+                return None
+            # Both come from the request body, so check the package too; a
+            # field comparison costs far less than serializing or rebuilding it
+            if package is not artifacts.package and package != artifacts.package:
+                return None
+            self._artifacts.move_to_end(job.id)
+            return artifacts
+
+    def packed(self, job: Job) -> Optional[PackedCompensation]:
+        artifacts = self.get(job)
+        return artifacts.packed if artifacts is not None else None
+
+    def is_current(self, job: Job) -> bool:
+        """Whether a stored job's artifacts are built from its current version."""
+        with self._lock:
+            artifacts = self._artifacts.get(job.id)
+            return artifacts is not None and artifacts.updated_at == job.updated_at
+
+    def put(self, artifacts: JobArtifacts) -> None:
+        with self._lock:
+            self._artifacts[artifacts.job_id] = artifacts
+            self._artifacts.move_to_end(artifacts.job_id)
+            while len(self._artifacts) > self.max_jobs:
+                self._artifacts.popitem(last=False)
+
+    def discard(self, job_id: UUID) -> None:
+        with self._lock:
+            self._artifacts.pop(job_id, None)
+
+    def __len__(self) -> int:
+        return len(self._artifacts)
+
+
+def _foreground_busy() -> bool:
+    return len(flights) > 0
+
+
+class PrecomputeScheduler:
+    """Priority queue of jobs whose artifacts should be built.
+
+    Args:
+        store: Where queued jobs are looked up when their turn comes
+        artifacts: Where the results go
+        concurrency: Number of jobs built at the same time
+        max_pending: Read-triggered jobs are dropped once this many are queued
+        hot_reads: Reads after which a job without artifacts is queued
+        busy: Whether foreground work is running; defaults to any in-flight
+            computation in `flights`
+        idle_delay: First wait while the API is busy, in seconds
+        max_delay: Longest wait between checks, in seconds
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        artifacts: ArtifactCache,
+        concurrency: int = 1,
+        max_pending: int = 1_000,
+        hot_reads: int = 2,
+        busy: Callable[[], bool] = _foreground_busy,
+        idle_delay: float = 0.01,
+        max_delay: float = 1.0,
+    ):
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+        self.store = store
+        self.artifacts = artifacts
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.hot_reads = hot_reads
+        self.busy = busy
+        self.idle_delay = idle_delay
+        self.max_delay = max_delay
+        self.built = 0
+        self.failed = 0
+        self.deferrals = 0
+        self._heap: List[Tuple[Tuple[int, int], int, UUID]] = []
+        self._pending: Dict[UUID, Tuple[int, int]] = {}
+        self._order = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._workers: List[asyncio.Task] = []
+        self._active = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def schedule(self, job_id: UUID, priority: int = CHANGED) -> bool:
+        """Queue a job, or move it up if it is queued with a lower priority.
+
+        Returns whether the job is queued afterwards.
+        """
+        rank = (priority, -self.store.reads[job_id])
+        queued = self._pending.get(job_id)
+        if queued is not None and queued <= rank:
+            return True
+        if queued is None and priority != CHANGED:
+            if len(self._pending) >= self.max_pending:
+                return False
+        self._pending[job_id] = rank
+        heapq.heappush(self._heap, (rank, next(self._order), job_id))
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    def job_changed(self, job: Job) -> None:
+        self.schedule(job.id, CHANGED)
+
+    def job_read(self, job: Job) -> None:
+        reads = self.store.record_read(job.id)
+        if reads >= self.hot_reads and not self.artifacts.is_current(job):
+            self.schedule(job.id, READ)
+
+    def job_deleted(self, job_id: UUID) -> None:
+        self._pending.pop(job_id, None)
+        self.artifacts.discard(job_id)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def _next(self) -> UUID:
+        while True:
+            while self._heap:
+                rank, _, job_id = heapq.heappop(self._heap)
+                # Entries superseded by a higher priority are skipped
+                if self._pending.get(job_id) == rank:
+                    del self._pending[job_id]
+                    return job_id
+            self._wakeup.clear()
+            await self._wakeup.wait()
+
+    async def _wait_for_idle(self) -> None:
+        delay = self.idle_delay
+        while self.busy():
+            self.deferrals += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_delay)
+
+    async def _build(self, job_id: UUID) -> None:
+        await self._wait_for_idle()
+        # The job may have changed or gone while it waited
+        job = self.store.get(job_id)
+        if job is None or self.artifacts.is_current(job):
+            return
+        try:
+            artifacts = await run_in_threadpool(build_artifacts, job)
+        except Exception:
+            self.failed += 1
+            logger.exception(f"Precomputing job {job_id} failed")
+            return
+        # Only keep them if the job wasn't updated in the meantime
+        if self.store.get(job_id) is job:
+            self.artifacts.put(artifacts)
+            self.built += 1
+
+    async def _work(self) -> None:
+        while True:
+            job_id = await self._next()
+            self._active += 1
+            try:
+                await self._build(job_id)
+            finally:
+                self._active -= 1
+
+    def start(self) -> None:
+        if self.running:
+            raise RuntimeError("Scheduler is already running")
+        self._wakeup = asyncio.Event()
+        if self._heap:
+            self._wakeup.set()
+        self._workers = [
+            asyncio.create_task(self._work()) for _ in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._wakeup = None
+
+    async def drain(self) -> None:
+        """Wait until every queued job has been handled."""
+        while self._pending or self._active:
+            await asyncio.sleep(0.005)
+
+
+artifact_cache = ArtifactCache()
+scheduler = PrecomputeScheduler(job_store, artifact_cache)
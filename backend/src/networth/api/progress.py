@@ -0,0 +1,127 @@
+"""Server-sent event streaming for long-running computations.
+
+A computation is a generator of ProgressEvents. Each step runs in the thread
+pool so the event loop stays responsive, and between steps the run checks
+whether it was cancelled or the client went away; in either case the
+generator is closed so that its resources are released immediately, or as
+soon as a step still running in the thread pool returns.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Dict, Iterator, Optional
+from uuid import uuid4
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from networth.finance.progress import ProgressEvent
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+def sse_event(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+class ProgressRun:
+    def __init__(self, steps: Iterator[ProgressEvent]):
+        self.id = str(uuid4())
+        self.steps = steps
+        self.cancelled = asyncio.Event()
+        self._step: Optional[asyncio.Future] = None
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+    async def _next_step(self):
+        self._step = asyncio.ensure_future(run_in_threadpool(next, self.steps, _DONE))
+        # A cancelled stream leaves the step to finish before closing the steps
+        return await asyncio.shield(self._step)
+
+    def _close(self) -> None:
+        close = getattr(self.steps, "close", None)
+        if close is not None:
+            close()
+
+    def _step_finished(self, step: asyncio.Future) -> None:
+        if not step.cancelled():
+            # Nobody awaits an abandoned step; mark its error as retrieved
+            step.exception()
+        self._close()
+
+    async def stream(self, request: Request, registry: "RunRegistry"):
+        event_id = 0
+        try:
+            yield sse_event("started", {"run_id": self.id}, event_id)
+            while True:
+                if self.cancelled.is_set():
+                    yield sse_event("cancelled", {"run_id": self.id})
+                    return
+                if await request.is_disconnected():
+                    logger.info(f"Client disconnected from run {self.id}")
+                    return
+
+                step = await self._next_step()
+                if step is _DONE:
+                    return
+                event_id += 1
+                yield sse_event(step.event, step.data, event_id)
+        finally:
+            registry.remove(self.id)
+            if self._step is not None and not self._step.done():
+                # Closing a generator while it runs raises ValueError
+                self._step.add_done_callback(self._step_finished)
+            else:
+                self._close()
+
+
+class RunRegistry:
+    """The runs currently streaming in this process, so they can be cancelled."""
+
+    def __init__(self):
+        self.runs: Dict[str, ProgressRun] = {}
+
+    def start(self, steps: Iterator[ProgressEvent]) -> ProgressRun:
+        run = ProgressRun(steps)
+        self.runs[run.id] = run
+        return run
+
+    def cancel(self, run_id: str) -> bool:
+        run = self.runs.get(run_id)
+        if run is None:
+            return False
+        run.cancel()
+        return True
+
+    def remove(self, run_id: str) -> None:
+        self.runs.pop(run_id, None)
+
+    def __len__(self) -> int:
+        return len(self.runs)
+
+
+runs = RunRegistry()
+
+
+def progress_response(
+    request: Request, steps: Iterator[ProgressEvent]
+) -> StreamingResponse:
+    run = runs.start(steps)
+    return StreamingResponse(
+        run.stream(request, runs),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "X-Run-Id": run.id,
+        },
+    )
@@ -0,0 +1,211 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+from networth.api.progress import progress_response, runs
+from networth.api.singleflight import flight_key, flights
+from networth.cache import model_codec
+from networth.finance.export import ExportFormat, iter_export, projection_batches
+from networth.finance.bootstrap import DEFAULT_PERCENTILES, simulate_net_worth
+from networth.finance.goal_seek import solve_for
+from networth.finance.progress import projection_progress, simulation_progress
+from networth.finance.sweep import ScenarioArrays, project_net_worth
+from networth.models.scenario import FinancialModel, FinancialScenario
+
+router = APIRouter()
+
+
+class ProjectionRequest(BaseModel):
+    model: FinancialModel
+    years: int = Field(ge=0, le=200)
+
+
+class ProjectionResponse(BaseModel):
+    years: List[int]
+    net_worth: Dict[str, List[float]]
+
+
+class SimulationRequest(BaseModel):
+    scenario: FinancialScenario
+    years: int = Field(ge=0, le=200)
+    num_paths: int = Field(default=10_000, ge=1, le=200_000)
+    block_size: int = Field(default=5, ge=1)
+    recenter: bool = False
+    seed: Optional[int] = None
+
+
+class SimulationResponse(BaseModel):
+    years: List[int]
+    mean: List[float]
+    percentiles: Dict[str, List[float]]
+
+
+class GoalSeekRequest(BaseModel):
+    scenario: FinancialScenario
+    parameter: str
+    targets: List[float] = Field(min_length=1, max_length=10_000)
+    year: int = Field(ge=0, le=200)
+
+
+class GoalSeekResponse(BaseModel):
+    parameter: str
+    year: int
+    targets: List[float]
+    # None where the target cannot be reached
+    values: List[Optional[float]]
+
+
+_projection_codec = model_codec(ProjectionResponse)
+_simulation_codec = model_codec(SimulationResponse)
+_goal_seek_codec = model_codec(GoalSeekResponse)
+
+
+def _project(model: FinancialModel, years: int) -> ProjectionResponse:
+    scenarios = {"base": model.base_scenario, **model.alternative_scenarios}
+    return ProjectionResponse(
+        years=list(range(years + 1)),
+        net_worth={
+            name: project_net_worth(
+                ScenarioArrays.from_scenario(scenario), years
+            ).tolist()
+            for name, scenario in scenarios.items()
+        },
+    )
+
+
+@router.post("/projections/", response_model=ProjectionResponse)
+async def project(request: ProjectionRequest):
+    return await flights.run(
+        flight_key("projection", request.model, years=request.years),
+        _project,
+        request.model,
+        request.years,
+        codec=_projection_codec,
+    )
+
+
+def streaming_export(batches, export_format: ExportFormat, filename: str):
+    if export_format.requires_pyarrow:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(
+                status_code=501, detail=f"{export_format.value} export is not available"
+            )
+
+    return StreamingResponse(
+        iter_export(batches, export_format),
+        media_type=export_format.media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'
+        },
+    )
+
+
+@router.post("/projections/export")
+async def export_projection(
+    request: ProjectionRequest, format: ExportFormat = ExportFormat.CSV
+):
+    return streaming_export(
+        projection_batches(request.model, request.years), format, "projection"
+    )
+
+
+@router.post("/projections/stream")
+async def stream_projection(
+    request: ProjectionRequest, http_request: Request, chunk_years: int = 10
+):
+    """Server-sent events with partial results while the projection runs."""
+    if chunk_years < 1:
+        raise HTTPException(status_code=422, detail="chunk_years must be positive")
+    return progress_response(
+        http_request, projection_progress(request.model, request.years, chunk_years)
+    )
+
+
+@router.delete("/projections/runs/{run_id}")
+async def cancel_run(run_id: str):
+    if not runs.cancel(run_id):
+        raise HTTPException(status_code=404, detail="Run not found")
+    return {"run_id": run_id, "cancelled": True}
+
+
+def _simulate(request: SimulationRequest) -> SimulationResponse:
+    result = simulate_net_worth(
+        request.scenario,
+        request.years,
+        num_paths=request.num_paths,
+        block_size=request.block_size,
+        recenter=request.recenter,
+        seed=request.seed,
+    )
+    return SimulationResponse(
+        years=list(range(request.years + 1)),
+        mean=result.mean().tolist(),
+        percentiles={
+            str(p): values.tolist()
+            for p, values in result.percentiles(DEFAULT_PERCENTILES).items()
+        },
+    )
+
+
+@router.post("/projections/simulate", response_model=SimulationResponse)
+async def simulate(request: SimulationRequest):
+    # Concurrent identical unseeded requests share one set of paths
+    return await flights.run(
+        flight_key("simulation", request),
+        _simulate,
+        request,
+        # Unseeded runs are random and must not be reused
+        codec=_simulation_codec if request.seed is not None else None,
+    )
+
+
+@router.post("/projections/simulate/stream")
+async def stream_simulation(
+    request: SimulationRequest, http_request: Request, batch_paths: int = 10_000
+):
+    """Server-sent events with percentiles over the paths simulated so far."""
+    if batch_paths < 1:
+        raise HTTPException(status_code=422, detail="batch_paths must be positive")
+    return progress_response(
+        http_request,
+        simulation_progress(
+            request.scenario,
+            request.years,
+            request.num_paths,
+            batch_paths=batch_paths,
+            block_size=request.block_size,
+            recenter=request.recenter,
+            seed=request.seed,
+        ),
+    )
+
+
+def _goal_seek(request: GoalSeekRequest) -> GoalSeekResponse:
+    result = solve_for(
+        request.scenario, request.parameter, request.targets, request.year
+    )
+    return GoalSeekResponse(
+        parameter=result.parameter,
+        year=result.year,
+        targets=result.targets.tolist(),
+        values=[
+            float(value) if converged else None
+            for value, converged in zip(result.values, result.converged)
+        ],
+    )
+
+
+@router.post("/projections/goal-seek", response_model=GoalSeekResponse)
+async def goal_seek(request: GoalSeekRequest):
+    try:
+        return await flights.run(
+            flight_key("goal_seek", request),
+            _goal_seek,
+            request,
+            codec=_goal_seek_codec,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
@@ -0,0 +1,119 @@
+"""Coalescing of concurrent identical computations.
+
+When several requests ask for the same result at the same time (a dashboard
+opening in a few tabs), only the first one starts the computation and the
+others await its result. Nothing is kept in the process once the
+computation finishes, so this removes duplicate work under bursts without
+serving stale results.
+
+Callers that pass a `codec` also go through the host's `SharedCache`, when
+one is configured, so a result computed by any worker is reused by the
+others. Keys hash the entities' contents, so an edited entity is recomputed
+whatever id or `updated_at` the client sends with it, and bodies that leave
+ids and timestamps to their defaults still share a key.
+"""
+
+import asyncio
+import hashlib
+import json
+from functools import partial
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+from networth.cache import Codec, SharedCache
+
+T = TypeVar("T")
+
+
+# NWBase ids and audit timestamps default to a new uuid4 and the time a body
+# is parsed, and no computation depends on them
+_IDENTITY_FIELDS = frozenset({"id", "created_at", "updated_at"})
+
+
+def _content(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {
+            key: _content(item)
+            for key, item in value.items()
+            if key not in _IDENTITY_FIELDS
+        }
+    if isinstance(value, list):
+        return [_content(item) for item in value]
+    return value
+
+
+def _entity_key(entity: Any) -> Hashable:
+    if isinstance(entity, BaseModel):
+        content = _content(entity.model_dump(mode="json"))
+        payload = json.dumps(content, sort_keys=True).encode()
+        return (type(entity).__name__, hashlib.sha256(payload).hexdigest())
+    return entity
+
+
+def flight_key(operation: str, *entities: Any, **params: Any) -> Tuple:
+    """Key identifying a computation by operation, entity contents and parameters.
+
+    Models are identified by a hash of everything but their ids,
+    `created_at` and `updated_at`, at every level, so equal bodies share a
+    key and edited ones never do.
+    """
+    return (
+        operation,
+        tuple(_entity_key(entity) for entity in entities),
+        json.dumps(params, sort_keys=True, default=str),
+    )
+
+
+class SingleFlight:
+    """At most one in-flight computation per key in this process.
+
+    Computations run in the thread pool. A caller that goes away does not
+    cancel the computation for the callers still waiting on it.
+    """
+
+    def __init__(self, cache: Optional[SharedCache] = None):
+        self.cache = cache
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    def _finished(self, key: Hashable, future: asyncio.Future) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            # Mark the error as retrieved even if every caller went away
+            future.exception()
+
+    async def run(
+        self,
+        key: Hashable,
+        fn: Callable[..., T],
+        *args,
+        codec: Optional[Codec[T]] = None,
+        **kwargs,
+    ) -> T:
+        """Result of `fn(*args, **kwargs)`, shared with concurrent callers of `key`.
+
+        With a `codec`, the result is also looked up in and stored to the
+        shared cache; only pass one for deterministic computations.
+        """
+        future = self._calls.get(key)
+        if future is None:
+            self.started += 1
+            compute = partial(fn, *args, **kwargs)
+            if codec is not None and self.cache is not None:
+                compute = partial(self.cache.get_or_compute, key, compute, codec)
+            future = asyncio.ensure_future(run_in_threadpool(compute))
+            self._calls[key] = future
+            future.add_done_callback(lambda f: self._finished(key, f))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(future)
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+flights = SingleFlight(cache=SharedCache.from_env())
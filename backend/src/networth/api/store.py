@@ -0,0 +1,61 @@
+"""In-memory job storage for the CRUD endpoints.
+
+Jobs are kept per process until a database is wired in. Every change gives
+the stored job a new `updated_at`. Client reads are counted so that
+frequently opened jobs can be kept warm.
+"""
+
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from networth.models.job import Job, JobCreate
+
+
+class JobStore:
+    def __init__(self):
+        self._jobs: Dict[UUID, Job] = {}
+        self.reads: Counter = Counter()
+
+    def add(self, job: Job) -> Job:
+        self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id: UUID) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def record_read(self, job_id: UUID) -> int:
+        """Count a read of the job by a client; returns its number of reads."""
+        self.reads[job_id] += 1
+        return self.reads[job_id]
+
+    def list(self) -> List[Job]:
+        return list(self._jobs.values())
+
+    def update(self, job_id: UUID, changes: JobCreate) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        updated = Job(
+            id=job.id,
+            created_at=job.created_at,
+            updated_at=datetime.now(),
+            name=changes.name,
+            comp_package=changes.comp_package,
+        )
+        self._jobs[job_id] = updated
+        return updated
+
+    def delete(self, job_id: UUID) -> bool:
+        self.reads.pop(job_id, None)
+        return self._jobs.pop(job_id, None) is not None
+
+    def __contains__(self, job_id: UUID) -> bool:
+        return job_id in self._jobs
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+
+job_store = JobStore()
@@ -0,0 +1,229 @@
+"""Result cache shared by every worker process on a host.
+
+Under several uvicorn workers each process would otherwise compute and hold
+its own copy of every result. `SharedCache` stores encoded results in one
+SQLite database in the shared cache directory (see `NETWORTH_CACHE_DIR`),
+opened in WAL mode and memory-mapped, so readers in all workers share the
+same pages and a result computed by one worker is a hit for the others.
+
+Entries are keyed by a namespace, a digest of the caller's key and a cache
+version. Bumping `CACHE_VERSION` (or setting `NETWORTH_SHARED_CACHE_VERSION`
+per deployment) turns every older entry into a miss; `invalidate` drops a
+namespace for all workers at once. The number of entries is bounded and the
+oldest ones are evicted first, as are entries older than `ttl` seconds.
+
+The cache is opt-in: `SharedCache.from_env` only returns one when
+`NETWORTH_SHARED_CACHE` is set. Database errors are treated as misses, so
+a busy or broken cache slows requests down rather than failing them.
+"""
+
+from dataclasses import dataclass
+import hashlib
+import io
+import json
+import logging
+import os
+from pathlib import Path
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Generic, Hashable, Optional, TypeVar, Union
+
+import numpy as np
+from pydantic import TypeAdapter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Bump when the meaning or encoding of cached results changes
+CACHE_VERSION = "1"
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_TTL = 24 * 60 * 60
+MMAP_SIZE = 256 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    version TEXT NOT NULL,
+    created REAL NOT NULL,
+    value BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_namespace ON entries (namespace);
+CREATE INDEX IF NOT EXISTS entries_created ON entries (created);
+"""
+
+
+@dataclass(frozen=True)
+class Codec(Generic[T]):
+    """How values of one type are stored in the cache."""
+
+    encode: Callable[[T], bytes]
+    decode: Callable[[bytes], T]
+
+
+def model_codec(type_: Any) -> Codec:
+    """JSON codec for a pydantic model or any type pydantic can validate,
+    such as `List[SomeModel]`."""
+    adapter = TypeAdapter(type_)
+    return Codec(encode=adapter.dump_json, decode=adapter.validate_json)
+
+
+def _encode_array(array: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def _decode_array(data: bytes) -> np.ndarray:
+    return np.load(io.BytesIO(data), allow_pickle=False)
+
+
+ARRAY_CODEC: Codec[np.ndarray] = Codec(encode=_encode_array, decode=_decode_array)
+
+
+def cache_key(key: Hashable) -> str:
+    """Stable digest of a key made of strings, numbers and tuples of them,
+    such as a `flight_key`."""
+    encoded = json.dumps(key, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _namespace(key: Hashable) -> str:
+    return str(key[0]) if isinstance(key, tuple) and key else ""
+
+
+def default_path() -> Path:
+    cache_dir = Path(
+        os.environ.get("NETWORTH_CACHE_DIR", Path(tempfile.gettempdir()) / "networth")
+    )
+    return cache_dir / "shared-cache.sqlite3"
+
+
+class SharedCache:
+    """A bounded key-value cache in a SQLite file shared between processes.
+
+    Keys are tuples whose first element is the namespace, as built by
+    `flight_key`. They must identify inputs by content, not by client-set
+    ids or timestamps, since entries outlive the requests that stored them.
+    Each thread uses its own connection.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path, None] = None,
+        version: str = CACHE_VERSION,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+        timeout: float = 1.0,
+    ):
+        if max_entries < 1:
+            raise ValueError("Cache needs room for at least one entry")
+        self.path = Path(path) if path is not None else default_path()
+        self.version = version
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as connection:
+            connection.executescript(_SCHEMA)
+
+    @classmethod
+    def from_env(cls) -> Optional["SharedCache"]:
+        """The host's shared cache if `NETWORTH_SHARED_CACHE` is set, else None."""
+        if not os.environ.get("NETWORTH_SHARED_CACHE"):
+            return None
+        return cls(
+            version=os.environ.get("NETWORTH_SHARED_CACHE_VERSION", CACHE_VERSION)
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """The stored bytes for `key`, or None on a miss."""
+        try:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT value FROM entries WHERE key = ? AND created >= ?",
+                    (self._key(key), time.time() - self.ttl),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache read failed: {e}")
+            row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def set(self, key: Hashable, value: bytes) -> None:
+        now = time.time()
+        try:
+            with self._connection() as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                    (self._key(key), _namespace(key), self.version, now, value),
+                )
+                connection.execute(
+                    "DELETE FROM entries WHERE created < ?", (now - self.ttl,)
+                )
+                connection.execute(
+                    "DELETE FROM entries WHERE key IN (SELECT key FROM entries"
+                    " ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Shared cache write failed: {e}")
+
+    def get_or_compute(
+        self, key: Hashable, compute: Callable[[], T], codec: Codec[T]
+    ) -> T:
+        """The cached value for `key`, computing and storing it on a miss."""
+        data = self.get(key)
+        if data is not None:
+            try:
+                return codec.decode(data)
+            except ValueError as e:
+                logger.warning(f"Ignoring undecodable shared cache entry: {e}")
+        value = compute()
+        self.set(key, codec.encode(value))
+        return value
+
+    def invalidate(self, namespace: Optional[str] = None) -> None:
+        """Drop every entry in `namespace`, or all entries, for every worker."""
+        with self._connection() as connection:
+            if namespace is None:
+                connection.execute("DELETE FROM entries")
+            else:
+                connection.execute(
+                    "DELETE FROM entries WHERE namespace = ?", (namespace,)
+                )
+
+    def __len__(self) -> int:
+        (count,) = (
+            self._connection()
+            .execute("SELECT COUNT(*) FROM entries WHERE version = ?", (self.version,))
+            .fetchone()
+        )
+        return count
+
+    def _key(self, key: Hashable) -> str:
+        # The version is part of the stored key, so versions never collide
+        return f"{self.version}:{_namespace(key)}:{cache_key(key)}"
@@ -0,0 +1,67 @@
+"""Vectorized calendar arithmetic on NumPy `datetime64[D]` arrays.
+
+Dates are exchanged with the rest of the code base either as `datetime64[D]`
+arrays or as int64 days since the Unix epoch (the integer view of the same
+values), which is what the packed compensation arrays store.
+"""
+
+from datetime import date
+from typing import Iterable
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+# Unix epoch days plus this offset are ordinal days (date.toordinal)
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def to_days(dates: Iterable[date]) -> np.ndarray:
+    """Dates as int64 days since the Unix epoch."""
+    return np.array(list(dates), dtype="datetime64[D]").astype(np.int64)
+
+
+def from_days(days: int) -> date:
+    return np.datetime64(days, "D").astype(date)
+
+
+def as_dates(values: ArrayLike) -> np.ndarray:
+    """`datetime64[D]` array from dates, datetime64 values or epoch days."""
+    return np.asarray(values).astype("datetime64[D]")
+
+
+def days_between(start: ArrayLike, end: ArrayLike) -> np.ndarray:
+    """Whole days from `start` to `end` (negative when `end` is earlier)."""
+    return (as_dates(end) - as_dates(start)).astype(np.int64)
+
+
+def month_lengths(months: ArrayLike) -> np.ndarray:
+    """Number of days in each `datetime64[M]` month."""
+    months = np.asarray(months, "datetime64[M]")
+    return (months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")
+
+
+def add_months(dates: ArrayLike, months: ArrayLike) -> np.ndarray:
+    """`dates` shifted by whole `months`, broadcast together.
+
+    Days that don't exist in the target month are clamped to its last day,
+    so Jan 31 + 1 month is Feb 28 (or 29), while Feb 28 + 1 month stays on
+    Mar 28.
+    """
+    dates = as_dates(dates)
+    month = dates.astype("datetime64[M]")
+    day_of_month = dates - month.astype("datetime64[D]")
+    target = month + np.asarray(months, np.int64).astype("timedelta64[M]")
+    last_day = month_lengths(target) - np.timedelta64(1, "D")
+    return target.astype("datetime64[D]") + np.minimum(day_of_month, last_day)
+
+
+def calendar_years(dates: ArrayLike) -> np.ndarray:
+    """Calendar year of each date."""
+    return as_dates(dates).astype("datetime64[Y]").astype(np.int64) + 1970
+
+
+def date_range(start: ArrayLike, stop: ArrayLike, step_days: int = 1) -> np.ndarray:
+    """Every `step_days` from `start` up to, but excluding, `stop`."""
+    if step_days < 1:
+        raise ValueError("Step must be at least one day")
+    return np.arange(as_dates(start), as_dates(stop), np.timedelta64(step_days, "D"))
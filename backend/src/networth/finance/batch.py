@@ -0,0 +1,315 @@
+"""Compensation totals for many packages over a shared set of windows.
+
+Every package is packed into one set of columnar arrays: salary segments are
+concatenated with per-employee offsets, and dated events are keyed by
+`(employee << DAY_BITS) | ordinal day` so that one sorted array and one
+cumulative sum answer every employee's window totals with a single
+searchsorted. Large batches are split into employee shards evaluated in a
+process pool; the packed arrays and the result matrices live in shared
+memory, so workers receive only a block name and an employee range.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from multiprocessing.shared_memory import SharedMemory
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from networth.dates import EPOCH_ORDINAL, to_days
+from networth.finance.compensation_arrays import (
+    _OPEN_END,
+    PackedCompensation,
+    cents_to_decimal,
+)
+from networth.finance.rollup import COMPONENTS
+from networth.models.compensation_package import (
+    CompensationBreakdown,
+    CompensationPackage,
+)
+
+# Ordinal days (date.toordinal) fit in 22 bits up to year 9999
+DAY_BITS = 22
+
+EVENT_KINDS = ("bonus", "stock", "signing")
+
+
+@dataclass
+class PackedBatch:
+    """Columnar compensation arrays for a list of employees."""
+
+    employee_ids: List[str]
+    arrays: Dict[str, np.ndarray]
+
+    @classmethod
+    def from_packages(cls, packages: Sequence[CompensationPackage]) -> "PackedBatch":
+        packed = [PackedCompensation.from_package(p) for p in packages]
+        arrays = {
+            "salary_offsets": np.concatenate(
+                ([0], np.cumsum([len(p.salary_starts) for p in packed]))
+            ).astype(np.int64),
+        }
+        for column in ("salary_starts", "salary_ends", "salary_amounts"):
+            arrays[column] = np.concatenate(
+                [getattr(p, column) for p in packed] + [np.empty(0, np.int64)]
+            ).astype(np.int64)
+
+        for kind in EVENT_KINDS:
+            keys, amounts = [], []
+            for employee, p in enumerate(packed):
+                days = getattr(p, f"{kind}_days")
+                keys.append((employee << DAY_BITS) + days + EPOCH_ORDINAL)
+                amounts.append(getattr(p, f"{kind}_amounts"))
+            # Each employee's days are sorted, so the keys are sorted overall
+            arrays[f"{kind}_keys"] = np.concatenate(
+                keys + [np.empty(0, np.int64)]
+            ).astype(np.int64)
+            arrays[f"{kind}_cumulative"] = np.concatenate(
+                ([0], np.cumsum(np.concatenate(amounts + [np.empty(0, np.int64)])))
+            ).astype(np.int64)
+
+        return cls(employee_ids=[p.employee_id for p in packages], arrays=arrays)
+
+    def __len__(self) -> int:
+        return len(self.employee_ids)
+
+
+def _event_sums(
+    keys: np.ndarray,
+    cumulative: np.ndarray,
+    employees: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    inclusive_end: bool,
+) -> np.ndarray:
+    base = (employees << DAY_BITS)[:, np.newaxis] + EPOCH_ORDINAL
+    lo = np.searchsorted(keys, base + starts, side="left")
+    hi = np.searchsorted(keys, base + ends, side="right" if inclusive_end else "left")
+    return np.where(hi > lo, cumulative[hi] - cumulative[np.minimum(lo, hi)], 0)
+
+
+def _salary_sums(
+    arrays: Dict[str, np.ndarray],
+    lo: int,
+    hi: int,
+    starts: np.ndarray,
+    ends: np.ndarray,
+) -> np.ndarray:
+    """Salary per employee in [lo, hi) and window, with the same day count and
+    rounding as PackedCompensation.salary_cents."""
+    offsets = arrays["salary_offsets"][lo : hi + 1]
+    segments = slice(offsets[0], offsets[-1])
+    salary_starts = arrays["salary_starts"][segments, np.newaxis]
+    salary_ends = arrays["salary_ends"][segments, np.newaxis]
+
+    period_start = np.maximum(starts, salary_starts)
+    period_end = np.where(
+        salary_ends == _OPEN_END, ends, np.minimum(ends, salary_ends - 1)
+    )
+    days = np.maximum(0, period_end - period_start - 1)
+    prorated = np.rint(
+        arrays["salary_amounts"][segments, np.newaxis] * (days / 365)
+    ).astype(np.int64)
+    prorated = np.where(salary_starts < ends, prorated, 0)
+
+    result = np.zeros((hi - lo, len(starts)), np.int64)
+    has_salary = np.diff(offsets) > 0
+    if has_salary.any():
+        result[has_salary] = np.add.reduceat(
+            prorated, offsets[:-1][has_salary] - offsets[0], axis=0
+        )
+    return result
+
+
+def evaluate_shard(
+    arrays: Dict[str, np.ndarray],
+    lo: int,
+    hi: int,
+    starts: np.ndarray,
+    ends: np.ndarray,
+) -> np.ndarray:
+    """Component totals in cents with shape (4, hi - lo, windows), in the
+    order of COMPONENTS."""
+    employees = np.arange(lo, hi, dtype=np.int64)
+    return np.stack(
+        [
+            _salary_sums(arrays, lo, hi, starts, ends),
+            _event_sums(
+                arrays["bonus_keys"],
+                arrays["bonus_cumulative"],
+                employees,
+                starts,
+                ends,
+                False,
+            ),
+            _event_sums(
+                arrays["stock_keys"],
+                arrays["stock_cumulative"],
+                employees,
+                starts,
+                ends,
+                True,
+            ),
+            _event_sums(
+                arrays["signing_keys"],
+                arrays["signing_cumulative"],
+                employees,
+                starts,
+                ends,
+                False,
+            ),
+        ]
+    )
+
+
+class SharedArrays:
+    """Named int64 arrays laid out back to back in one shared memory block.
+
+    The creating process owns the block and must `unlink` it; other processes
+    `attach` by the picklable `spec` and only `close` it.
+    """
+
+    def __init__(self, shm: SharedMemory, layout: Dict[str, Tuple[int, tuple]]):
+        self.shm = shm
+        self.layout = layout
+        self.arrays = {
+            name: np.ndarray(shape, np.int64, buffer=shm.buf, offset=offset)
+            for name, (offset, shape) in layout.items()
+        }
+
+    @classmethod
+    def create(cls, shapes: Dict[str, tuple]) -> "SharedArrays":
+        layout, offset = {}, 0
+        for name, shape in shapes.items():
+            layout[name] = (offset, shape)
+            offset += int(np.prod(shape)) * np.dtype(np.int64).itemsize
+        return cls(SharedMemory(create=True, size=max(offset, 1)), layout)
+
+    @classmethod
+    def attach(cls, spec: Tuple[str, Dict[str, Tuple[int, tuple]]]) -> "SharedArrays":
+        name, layout = spec
+        # Pool workers share the creator's resource tracker, so attaching
+        # registers nothing new and the creator's unlink cleans up.
+        return cls(SharedMemory(name=name), layout)
+
+    @property
+    def spec(self) -> Tuple[str, Dict[str, Tuple[int, tuple]]]:
+        return self.shm.name, self.layout
+
+    def close(self) -> None:
+        # Views into the buffer must be released before it can be closed
+        self.arrays = {}
+        self.shm.close()
+
+    def unlink(self) -> None:
+        self.close()
+        self.shm.unlink()
+
+
+def _evaluate_shared_shard(inputs_spec, outputs_spec, lo: int, hi: int) -> None:
+    inputs = SharedArrays.attach(inputs_spec)
+    outputs = SharedArrays.attach(outputs_spec)
+    try:
+        outputs.arrays["cents"][:, lo:hi] = evaluate_shard(
+            inputs.arrays,
+            lo,
+            hi,
+            inputs.arrays["window_starts"],
+            inputs.arrays["window_ends"],
+        )
+    finally:
+        inputs.close()
+        outputs.close()
+
+
+@dataclass
+class BatchResult:
+    """Component totals in minimum currency units, each an
+    (employees, windows) matrix."""
+
+    employee_ids: List[str]
+    windows: List[Tuple[date, date]]
+    salary: np.ndarray
+    bonuses: np.ndarray
+    stock_grants: np.ndarray
+    signing_bonuses: np.ndarray
+
+    @property
+    def total(self) -> np.ndarray:
+        return self.salary + self.bonuses + self.stock_grants + self.signing_bonuses
+
+    def breakdown(self, employee_id: str, window: int) -> CompensationBreakdown:
+        row = self.employee_ids.index(employee_id)
+        return CompensationBreakdown(
+            **{
+                component: cents_to_decimal(getattr(self, component)[row, window])
+                for component in COMPONENTS
+            }
+        )
+
+
+def evaluate_batch(
+    packages: Sequence[CompensationPackage],
+    windows: Sequence[Tuple[date, date]],
+    max_workers: Optional[int] = None,
+    shard_size: int = 512,
+) -> BatchResult:
+    """Compensation of every package over every window, with the same date
+    semantics as CompensationPackage.calculate_compensation_breakdown.
+
+    Batches of at most `shard_size` employees, or `max_workers=1`, are
+    evaluated in this process.
+    """
+    if shard_size < 1:
+        raise ValueError("Shard size must be positive")
+
+    batch = PackedBatch.from_packages(packages)
+    starts = to_days(start for start, _ in windows)
+    ends = to_days(end for _, end in windows)
+    shards = [
+        (lo, min(lo + shard_size, len(batch)))
+        for lo in range(0, len(batch), shard_size)
+    ]
+    if max_workers is None:
+        max_workers = min(len(shards), os.cpu_count() or 1)
+
+    if max_workers <= 1 or len(shards) <= 1:
+        cents = evaluate_shard(batch.arrays, 0, len(batch), starts, ends)
+    else:
+        inputs = SharedArrays.create(
+            {
+                **{name: array.shape for name, array in batch.arrays.items()},
+                "window_starts": starts.shape,
+                "window_ends": ends.shape,
+            }
+        )
+        outputs = SharedArrays.create(
+            {"cents": (len(COMPONENTS), len(batch), len(windows))}
+        )
+        try:
+            for name, array in batch.arrays.items():
+                inputs.arrays[name][...] = array
+            inputs.arrays["window_starts"][...] = starts
+            inputs.arrays["window_ends"][...] = ends
+
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = [
+                    pool.submit(
+                        _evaluate_shared_shard, inputs.spec, outputs.spec, lo, hi
+                    )
+                    for lo, hi in shards
+                ]
+                for future in futures:
+                    future.result()
+            cents = outputs.arrays["cents"].copy()
+        finally:
+            inputs.unlink()
+            outputs.unlink()
+
+    return BatchResult(
+        employee_ids=batch.employee_ids,
+        windows=list(windows),
+        **dict(zip(COMPONENTS, cents)),
+    )
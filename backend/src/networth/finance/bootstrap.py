@@ -0,0 +1,142 @@
+"""Historical-return bootstrap simulation for scenario investments.
+
+Instead of compounding a constant `expected_return_rate`, every path draws
+its annual returns from a historical dataset in contiguous blocks (a
+circular block bootstrap), which keeps the serial correlation of real
+markets. The dataset is converted once to a `.npy` file in a shared cache
+directory and memory-mapped, so every worker process on a host shares the
+same pages instead of parsing and holding its own copy.
+"""
+
+import csv
+from dataclasses import dataclass, field
+from functools import lru_cache
+import hashlib
+import os
+from pathlib import Path
+import tempfile
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from networth.finance.sweep import ScenarioArrays
+from networth.models.scenario import FinancialScenario
+
+DEFAULT_DATASET = (
+    Path(__file__).resolve().parents[1] / "data" / "sp500_annual_returns.csv"
+)
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def _cache_path(dataset: Path) -> Path:
+    cache_dir = Path(
+        os.environ.get("NETWORTH_CACHE_DIR", Path(tempfile.gettempdir()) / "networth")
+    )
+    digest = hashlib.sha256(dataset.read_bytes()).hexdigest()[:16]
+    return cache_dir / f"{dataset.stem}-{digest}.npy"
+
+
+@lru_cache(maxsize=None)
+def load_returns(dataset: Path = DEFAULT_DATASET) -> np.ndarray:
+    """Annual returns from a `year,total_return` CSV as a read-only memory map.
+
+    The parsed array is written next to other workers' caches under a name
+    derived from the file contents, so an edited dataset is picked up and
+    concurrent workers converge on the same file.
+    """
+    dataset = Path(dataset)
+    cache = _cache_path(dataset)
+    if not cache.exists():
+        with open(dataset, newline="") as f:
+            rows = csv.DictReader(line for line in f if not line.startswith("#"))
+            returns = np.array([float(row["total_return"]) for row in rows])
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a private file first so readers never see a partial array
+        fd, tmp = tempfile.mkstemp(dir=cache.parent, suffix=".npy")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, returns.astype(np.float64))
+        os.replace(tmp, cache)
+    return np.load(cache, mmap_mode="r")
+
+
+def block_bootstrap(
+    returns: np.ndarray,
+    years: int,
+    num_paths: int,
+    block_size: int = 5,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """Sample `num_paths` return paths of length `years` from `returns` using
+    circular blocks of `block_size` consecutive years."""
+    if block_size < 1:
+        raise ValueError("Block size must be positive")
+    if not len(returns):
+        raise ValueError("Cannot bootstrap from an empty return series")
+
+    rng = rng or np.random.default_rng()
+    num_blocks = max(1, -(-years // block_size))
+    starts = rng.integers(0, len(returns), size=(num_paths, num_blocks, 1))
+    index = (starts + np.arange(block_size)) % len(returns)
+    return np.asarray(returns)[index.reshape(num_paths, -1)[:, :years]]
+
+
+@dataclass
+class SimulationResult:
+    """Simulated net worth per path (rows) and year (columns)."""
+
+    net_worth: np.ndarray = field(repr=False)
+
+    @property
+    def years(self) -> int:
+        return self.net_worth.shape[1] - 1
+
+    def percentiles(
+        self, percentiles: Sequence[float] = DEFAULT_PERCENTILES
+    ) -> Dict[float, np.ndarray]:
+        values = np.percentile(self.net_worth, percentiles, axis=0)
+        return dict(zip(percentiles, values))
+
+    def mean(self) -> np.ndarray:
+        return self.net_worth.mean(axis=0)
+
+
+def simulate_net_worth(
+    scenario: FinancialScenario,
+    years: int,
+    num_paths: int = 10_000,
+    block_size: int = 5,
+    recenter: bool = False,
+    seed: Optional[int | np.random.SeedSequence] = None,
+    returns: Optional[np.ndarray] = None,
+) -> SimulationResult:
+    """Bootstrap net worth paths for `scenario`.
+
+    All investments in a path see the same sampled market returns. With
+    `recenter` the sampled returns are shifted so that each investment's mean
+    return is its `expected_return_rate`, keeping only the historical
+    volatility and sequence risk.
+    """
+    returns = load_returns() if returns is None else returns
+    arrays = ScenarioArrays.from_scenario(scenario)
+    rng = np.random.default_rng(seed)
+
+    # (paths, years, 1) so that it broadcasts against the investment axis
+    sampled = block_bootstrap(returns, years, num_paths, block_size, rng)[..., None]
+    if recenter:
+        sampled = sampled - np.mean(returns) + arrays.return_rates
+
+    # Savings are the same on every path
+    savings = np.concatenate(([0.0], np.cumsum(arrays.annual_net_incomes(years))))
+    annual_contributions = arrays.monthly_contributions * 12
+
+    net_worth = np.empty((num_paths, years + 1), dtype=np.float64)
+    values = np.broadcast_to(
+        arrays.initial_amounts, (num_paths, len(arrays.initial_amounts))
+    )
+    for year in range(years + 1):
+        net_worth[:, year] = values.sum(axis=1) + savings[year]
+        if year < years:
+            values = values * (1 + sampled[:, year]) + annual_contributions
+
+    return SimulationResult(net_worth=net_worth)
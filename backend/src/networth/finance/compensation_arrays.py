@@ -0,0 +1,194 @@
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from networth.dates import from_days, to_days
+from networth.models.compensation_package import (
+    CompensationBreakdown,
+    CompensationPackage,
+)
+from networth.models.vesting_events import VestingEventStore
+
+# Sentinel end for the last salary, which runs until the end of any window
+_OPEN_END = np.iinfo(np.int64).max
+
+
+def cents_to_decimal(cents: int) -> Decimal:
+    """Matches the `Decimal(total / 100)` conversion used by CompensationPackage."""
+    return Decimal(int(cents) / 100)
+
+
+def _sorted_events(days: np.ndarray, amounts: np.ndarray):
+    order = np.argsort(days, kind="stable")
+    return days[order], amounts[order]
+
+
+def _window_sums(
+    days: np.ndarray,
+    cumulative: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    inclusive_end: bool,
+) -> np.ndarray:
+    lo = np.searchsorted(days, starts, side="left")
+    hi = np.searchsorted(days, ends, side="right" if inclusive_end else "left")
+    return np.where(hi > lo, cumulative[hi] - cumulative[np.minimum(lo, hi)], 0)
+
+
+@dataclass
+class PackedCompensation:
+    """A CompensationPackage's dated amounts as sorted int64 arrays.
+
+    Days are counted from the Unix epoch and amounts are in minimum currency
+    units, so window totals can be computed for many windows at once with
+    searchsorted over cumulative sums instead of rescanning every item.
+    """
+
+    salary_starts: np.ndarray
+    salary_ends: np.ndarray
+    salary_amounts: np.ndarray
+    bonus_days: np.ndarray
+    bonus_amounts: np.ndarray
+    stock_days: np.ndarray
+    stock_amounts: np.ndarray
+    signing_days: np.ndarray
+    signing_amounts: np.ndarray
+
+    def __post_init__(self):
+        self._bonus_cumulative = np.concatenate(([0], np.cumsum(self.bonus_amounts)))
+        self._stock_cumulative = np.concatenate(([0], np.cumsum(self.stock_amounts)))
+        self._signing_cumulative = np.concatenate(
+            ([0], np.cumsum(self.signing_amounts))
+        )
+
+    @classmethod
+    def from_package(cls, package: CompensationPackage) -> "PackedCompensation":
+        salaries = sorted(package.base_salary_history, key=lambda x: x.effective_date)
+        salary_starts = to_days(s.effective_date for s in salaries)
+        # Each salary runs until the first strictly later effective date
+        next_index = np.searchsorted(salary_starts, salary_starts, side="right")
+        padded_starts = np.append(salary_starts, _OPEN_END)
+        salary_ends = padded_starts[next_index]
+
+        vests = VestingEventStore.concat(
+            [grant.vesting_event_store() for grant in package.stock_grants]
+        )
+        bonus_days, bonus_amounts = _sorted_events(
+            to_days(b.date for b in package.bonus_payments),
+            np.array([b.amount.amount for b in package.bonus_payments], np.int64),
+        )
+        stock_days, stock_amounts = _sorted_events(vests.days, vests.amounts)
+        signing_days, signing_amounts = _sorted_events(
+            to_days(b.payment_date for b in package.signing_bonuses),
+            np.array([b.amount.amount for b in package.signing_bonuses], np.int64),
+        )
+        return cls(
+            salary_starts=salary_starts,
+            salary_ends=salary_ends,
+            salary_amounts=np.array(
+                [s.annual_amount.amount for s in salaries], np.int64
+            ),
+            bonus_days=bonus_days,
+            bonus_amounts=bonus_amounts,
+            stock_days=stock_days,
+            stock_amounts=stock_amounts,
+            signing_days=signing_days,
+            signing_amounts=signing_amounts,
+        )
+
+    @property
+    def first_day(self) -> int | None:
+        days = [
+            a[0]
+            for a in (
+                self.salary_starts,
+                self.bonus_days,
+                self.stock_days,
+                self.signing_days,
+            )
+            if len(a)
+        ]
+        return int(min(days)) if days else None
+
+    @property
+    def last_day(self) -> int | None:
+        days = [
+            a[-1]
+            for a in (
+                self.salary_starts,
+                self.bonus_days,
+                self.stock_days,
+                self.signing_days,
+            )
+            if len(a)
+        ]
+        return int(max(days)) if days else None
+
+    def default_range(
+        self, package: CompensationPackage, start_date: Optional[date] = None
+    ) -> Tuple[date, date]:
+        """The [start, end) range charted and rolled up by default: from the
+        package start (or its earliest item), or `start_date` when given,
+        through the end of the calendar year of its latest item."""
+        if start_date is None:
+            first_day = self.first_day
+            start_date = package.start_date
+            if first_day is not None:
+                start_date = min(start_date, from_days(first_day))
+        last_day = self.last_day
+        last = from_days(last_day) if last_day is not None else start_date
+        return start_date, date(max(last, start_date).year + 1, 1, 1)
+
+    def salary_cents(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Per-window salary matching CompensationPackage.calculate_total_income,
+        including its per-salary day count and rounding."""
+        starts = np.asarray(starts, np.int64)[:, np.newaxis]
+        ends = np.asarray(ends, np.int64)[:, np.newaxis]
+        period_start = np.maximum(starts, self.salary_starts)
+        period_end = np.where(
+            self.salary_ends == _OPEN_END,
+            ends,
+            np.minimum(ends, self.salary_ends - 1),
+        )
+        days = np.maximum(0, period_end - period_start - 1)
+        prorated = np.rint(self.salary_amounts * (days / 365)).astype(np.int64)
+        return np.where(self.salary_starts < ends, prorated, 0).sum(axis=1)
+
+    def bonus_cents(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Bonuses paid in [start, end)."""
+        return _window_sums(
+            self.bonus_days, self._bonus_cumulative, starts, ends, False
+        )
+
+    def stock_cents(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Vested stock in [start, end]; the end date is inclusive."""
+        return _window_sums(self.stock_days, self._stock_cumulative, starts, ends, True)
+
+    def signing_cents(self, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+        """Signing bonuses paid in [start, end)."""
+        return _window_sums(
+            self.signing_days, self._signing_cumulative, starts, ends, False
+        )
+
+    def breakdowns(
+        self, starts: Sequence[date], ends: Sequence[date]
+    ) -> list[CompensationBreakdown]:
+        start_days, end_days = to_days(starts), to_days(ends)
+        columns = zip(
+            self.salary_cents(start_days, end_days),
+            self.bonus_cents(start_days, end_days),
+            self.stock_cents(start_days, end_days),
+            self.signing_cents(start_days, end_days),
+        )
+        return [
+            CompensationBreakdown(
+                salary=cents_to_decimal(salary),
+                bonuses=cents_to_decimal(bonuses),
+                stock_grants=cents_to_decimal(stock),
+                signing_bonuses=cents_to_decimal(signing),
+            )
+            for salary, bonuses, stock, signing in columns
+        ]
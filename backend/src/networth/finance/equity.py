@@ -0,0 +1,127 @@
+"""Value unvested stock on simulated share-price paths.
+
+Instead of valuing every future vest at the grant's `price_per_share`, the
+share price is simulated as a geometric Brownian motion and each vest is
+valued at the price on its own vest date. All grants are assumed to be in
+the same company stock, so they share the simulated paths; prices are only
+drawn on the distinct vest dates, so the cost scales with paths x vest
+dates rather than paths x days.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from networth.finance.bootstrap import DEFAULT_PERCENTILES
+from networth.dates import calendar_years, to_days
+from networth.models.compensation_package import StockGrant
+from networth.models.vesting_events import VestingEventStore
+
+DAYS_PER_YEAR = 365.25
+
+
+def simulate_share_prices(
+    initial_price: float,
+    times: np.ndarray,
+    drift: float,
+    volatility: float,
+    num_paths: int,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """Exact GBM share prices with shape (num_paths, len(times)).
+
+    Args:
+        initial_price: Price at time 0
+        times: Increasing, non-negative times in years
+        drift: Annual expected return of the stock
+        volatility: Annual volatility of log returns
+    """
+    if volatility < 0:
+        raise ValueError("Volatility cannot be negative")
+    times = np.asarray(times, dtype=np.float64)
+    if len(times) and (times[0] < 0 or (np.diff(times) < 0).any()):
+        raise ValueError("Times must be increasing and non-negative")
+
+    rng = rng or np.random.default_rng()
+    steps = np.diff(times, prepend=0.0)
+    shocks = rng.standard_normal((num_paths, len(times))) * np.sqrt(steps)
+    log_prices = (drift - volatility**2 / 2) * times + volatility * np.cumsum(
+        shocks, axis=1
+    )
+    return initial_price * np.exp(log_prices)
+
+
+@dataclass
+class EquitySimulationResult:
+    """Value of the shares vesting in each calendar year, per path (rows) and
+    year (columns)."""
+
+    years: np.ndarray
+    values: np.ndarray = field(repr=False)
+
+    def percentiles(
+        self, percentiles: Sequence[float] = DEFAULT_PERCENTILES
+    ) -> Dict[float, np.ndarray]:
+        values = np.percentile(self.values, percentiles, axis=0)
+        return dict(zip(percentiles, values))
+
+    def mean(self) -> np.ndarray:
+        return self.values.mean(axis=0)
+
+
+def simulate_equity_value(
+    grants: Sequence[StockGrant],
+    valuation_date: date,
+    drift: float,
+    volatility: float,
+    num_paths: int = 10_000,
+    current_price: Optional[float] = None,
+    seed: Optional[int | np.random.SeedSequence] = None,
+) -> EquitySimulationResult:
+    """Simulate the value of every vest after `valuation_date`.
+
+    Args:
+        grants: Grants in the same stock
+        valuation_date: Vests on or before this date are not valued
+        drift: Annual expected return of the stock
+        volatility: Annual volatility of the stock
+        num_paths: Number of simulated price paths
+        current_price: Share price on `valuation_date`, in major units;
+            defaults to the price of the most recent grant
+        seed: Seed for reproducible paths
+    """
+    if current_price is None:
+        if not grants:
+            raise ValueError("A current price is required without grants")
+        latest = max(grants, key=lambda grant: grant.grant_date)
+        current_price = latest.price_per_share.get_base_units()
+
+    events = VestingEventStore.concat([grant.vesting_event_store() for grant in grants])
+    valuation_day = to_days([valuation_date])[0]
+    future = events.days > valuation_day
+    days = events.days[future]
+    shares = events.shares[future].astype(np.float64)
+
+    # Shares vesting on each distinct date, which are all that need prices
+    vest_days, day_index = np.unique(days, return_inverse=True)
+    shares_by_day = np.bincount(day_index, weights=shares, minlength=len(vest_days))
+    times = (vest_days - valuation_day) / DAYS_PER_YEAR
+
+    prices = simulate_share_prices(
+        current_price,
+        times,
+        drift,
+        volatility,
+        num_paths,
+        np.random.default_rng(seed),
+    )
+    values_by_day = prices * shares_by_day
+
+    vest_years, first_day = np.unique(calendar_years(vest_days), return_index=True)
+    if len(vest_years):
+        values = np.add.reduceat(values_by_day, first_day, axis=1)
+    else:
+        values = np.zeros((num_paths, 0))
+    return EquitySimulationResult(years=vest_years, values=values)
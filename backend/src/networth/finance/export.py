@@ -0,0 +1,226 @@
+"""Streaming columnar export of projection, sweep and ledger results.
+
+Results are produced as an iterator of column batches (dicts of equally long
+numpy arrays) so that only one batch is ever held in memory, and are encoded
+incrementally as CSV, Arrow IPC stream or Parquet. pyarrow is an optional
+dependency and is only imported when an Arrow or Parquet export is requested.
+"""
+
+import csv
+from enum import Enum
+import io
+from typing import Dict, Iterator, Optional
+
+import numpy as np
+
+from networth.finance.compensation_arrays import PackedCompensation
+from networth.finance.sweep import ScenarioArrays, SweepResult, project_net_worth
+from networth.models.compensation_package import CompensationPackage
+from networth.models.scenario import FinancialModel
+
+ColumnBatch = Dict[str, np.ndarray]
+
+DEFAULT_BATCH_SIZE = 65_536
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    ARROW = "arrow"
+    PARQUET = "parquet"
+
+    @property
+    def media_type(self) -> str:
+        if self == ExportFormat.CSV:
+            return "text/csv"
+        elif self == ExportFormat.ARROW:
+            return "application/vnd.apache.arrow.stream"
+        else:
+            return "application/vnd.apache.parquet"
+
+    @property
+    def requires_pyarrow(self) -> bool:
+        return self != ExportFormat.CSV
+
+
+def _slices(num_rows: int, batch_size: int) -> Iterator[slice]:
+    if batch_size < 1:
+        raise ValueError("Batch size must be positive")
+    for start in range(0, num_rows, batch_size):
+        yield slice(start, min(start + batch_size, num_rows))
+
+
+def projection_batches(
+    model: FinancialModel, years: int, batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[ColumnBatch]:
+    """Net worth per scenario and year in long format: scenario, year, net_worth."""
+    scenarios = {"base": model.base_scenario, **model.alternative_scenarios}
+    for name, scenario in scenarios.items():
+        net_worth = project_net_worth(ScenarioArrays.from_scenario(scenario), years)
+        year = np.arange(years + 1, dtype=np.int64)
+        for rows in _slices(len(year), batch_size):
+            yield {
+                "scenario": np.full(rows.stop - rows.start, name, dtype=object),
+                "year": year[rows],
+                "net_worth": net_worth[rows],
+            }
+
+
+def sweep_batches(
+    result: SweepResult, batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[ColumnBatch]:
+    """A sweep cube flattened to one row per grid point and year."""
+    flat = result.values.reshape(-1)
+    for rows in _slices(len(flat), batch_size):
+        index = np.unravel_index(np.arange(rows.start, rows.stop), result.values.shape)
+        batch = {
+            dim: result.coords[dim][axis_index]
+            for dim, axis_index in zip(result.dims, index)
+        }
+        batch["net_worth"] = flat[rows]
+        yield batch
+
+
+def ledger_batches(
+    package: CompensationPackage, batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[ColumnBatch]:
+    """Every dated compensation item ordered by date: date, component, amount.
+
+    Salary rows are the annual amount taking effect on that date; all other
+    rows are amounts paid or vested. Amounts are in base currency units.
+    """
+    packed = PackedCompensation.from_package(package)
+    parts = [
+        ("salary", packed.salary_starts, packed.salary_amounts),
+        ("bonus", packed.bonus_days, packed.bonus_amounts),
+        ("stock_vest", packed.stock_days, packed.stock_amounts),
+        ("signing_bonus", packed.signing_days, packed.signing_amounts),
+    ]
+    days = np.concatenate([part_days for _, part_days, _ in parts])
+    amounts = np.concatenate([part_amounts for _, _, part_amounts in parts])
+    components = np.concatenate(
+        [np.full(len(part_days), name, dtype=object) for name, part_days, _ in parts]
+    )
+
+    order = np.argsort(days, kind="stable")
+    for rows in _slices(len(order), batch_size):
+        index = order[rows]
+        yield {
+            "date": days[index].astype("datetime64[D]"),
+            "component": components[index],
+            "amount": amounts[index] / 100,
+        }
+
+
+def iter_csv(batches: Iterator[ColumnBatch]) -> Iterator[bytes]:
+    """Encode batches as CSV, yielding one chunk per batch."""
+    header_written = False
+    for batch in batches:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if not header_written:
+            writer.writerow(batch.keys())
+            header_written = True
+        columns = [
+            column.astype(str) if column.dtype.kind == "M" else column
+            for column in batch.values()
+        ]
+        writer.writerows(zip(*(column.tolist() for column in columns)))
+        yield buffer.getvalue().encode()
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+
+        return pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "Arrow and Parquet exports require pyarrow; install it with "
+            "`poetry install --extras export`"
+        ) from e
+
+
+def _record_batch(pa, batch: ColumnBatch):
+    return pa.record_batch(
+        [
+            pa.array(column, type=pa.string() if column.dtype == object else None)
+            for column in batch.values()
+        ],
+        names=list(batch.keys()),
+    )
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back to a generator."""
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def iter_arrow_ipc(batches: Iterator[ColumnBatch]) -> Iterator[bytes]:
+    """Encode batches as an Arrow IPC stream, yielding bytes as they are written."""
+    pa = _import_pyarrow()
+    sink = _ChunkSink()
+    writer: Optional[object] = None
+    for batch in batches:
+        record_batch = _record_batch(pa, batch)
+        if writer is None:
+            writer = pa.ipc.new_stream(
+                pa.PythonFile(sink, mode="w"), record_batch.schema
+            )
+        writer.write_batch(record_batch)
+        yield sink.drain()
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
+
+
+def iter_parquet(batches: Iterator[ColumnBatch]) -> Iterator[bytes]:
+    """Encode batches as Parquet with one row group per batch."""
+    pa = _import_pyarrow()
+    import pyarrow.parquet as pq
+
+    sink = _ChunkSink()
+    writer: Optional[pq.ParquetWriter] = None
+    for batch in batches:
+        record_batch = _record_batch(pa, batch)
+        if writer is None:
+            writer = pq.ParquetWriter(
+                pa.PythonFile(sink, mode="w"), record_batch.schema
+            )
+        writer.write_batch(record_batch)
+        yield sink.drain()
+    if writer is not None:
+        writer.close()
+        yield sink.drain()
+
+
+def iter_export(
+    batches: Iterator[ColumnBatch], export_format: ExportFormat
+) -> Iterator[bytes]:
+    if export_format == ExportFormat.CSV:
+        return iter_csv(batches)
+    elif export_format == ExportFormat.ARROW:
+        return iter_arrow_ipc(batches)
+    else:
+        return iter_parquet(batches)
+
+
+def write_export(
+    batches: Iterator[ColumnBatch], export_format: ExportFormat, file: io.IOBase
+) -> None:
+    """Stream an export into a binary file object."""
+    for chunk in iter_export(batches, export_format):
+        file.write(chunk)
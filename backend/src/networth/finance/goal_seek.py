@@ -0,0 +1,180 @@
+"""Solve for the scenario parameter value that reaches a net worth target.
+
+Net worth in a given year is monotone in every sweepable parameter over the
+ranges that matter, so each target is bracketed and then refined with the
+Illinois variant of regula falsi. All targets are solved together: every
+step is a single vectorized `project_net_worth` call over one candidate value
+per target. Net worth is linear in contributions, incomes, expenses and tax
+rates, so those converge after the first interpolation. Return rates
+compound, so they are solved on log-compressed net worth, which is close to
+linear in the rate and converges in a few more steps.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from networth.finance.sweep import SWEEP_PARAMETERS, ScenarioArrays, project_net_worth
+from networth.models.scenario import FinancialScenario
+
+# Initial bracket and hard limits per parameter
+DEFAULT_BRACKETS: Dict[str, Tuple[float, float]] = {
+    "expected_return_rate": (-0.1, 0.3),
+    "monthly_contribution": (0.0, 10_000.0),
+    "expense_scale": (0.0, 2.0),
+    "income_scale": (0.0, 2.0),
+    "tax_rate": (0.0, 1.0),
+}
+LIMITS: Dict[str, Tuple[float, float]] = {
+    "expected_return_rate": (-1.0, np.inf),
+    "monthly_contribution": (0.0, np.inf),
+    "expense_scale": (0.0, np.inf),
+    "income_scale": (0.0, np.inf),
+    "tax_rate": (0.0, 1.0),
+}
+
+
+@dataclass
+class GoalSeekResult:
+    """Solved parameter values per target; NaN where no value in the searched
+    range reaches the target."""
+
+    parameter: str
+    year: int
+    targets: np.ndarray
+    values: np.ndarray
+    converged: np.ndarray = field(repr=False)
+    evaluations: int = 0
+
+
+class _Objective:
+    def __init__(self, arrays: ScenarioArrays, parameter: str, year: int):
+        self.arrays = arrays
+        self.parameter = parameter
+        self.year = year
+        self.evaluations = 0
+
+    def __call__(self, values: np.ndarray) -> np.ndarray:
+        self.evaluations += 1
+        net_worth = project_net_worth(
+            self.arrays, self.year, **{self.parameter: values}
+        )[..., self.year]
+        # Parameters that don't influence the projection broadcast away
+        return np.broadcast_to(net_worth, values.shape)
+
+
+def _compress(net_worth: np.ndarray) -> np.ndarray:
+    """A monotone transform that turns compounding growth into roughly linear
+    growth, so interpolating between bracket ends lands close to the root."""
+    return np.sign(net_worth) * np.log1p(np.abs(net_worth))
+
+
+def _identity(net_worth: np.ndarray) -> np.ndarray:
+    return net_worth
+
+
+def solve_for(
+    scenario: FinancialScenario,
+    parameter: str,
+    targets: ArrayLike,
+    year: int,
+    bracket: Optional[Tuple[float, float]] = None,
+    tolerance: float = 0.01,
+    max_iterations: int = 50,
+    max_expansions: int = 10,
+) -> GoalSeekResult:
+    """Find the value of `parameter` at which net worth in `year` equals each
+    of `targets`.
+
+    Args:
+        scenario: The scenario to project; `parameter` overrides it as in
+            `sweep_scenario`
+        parameter: One of SWEEP_PARAMETERS
+        targets: Net worth targets, any shape
+        year: The projection year the target must be reached in
+        bracket: Initial search range, widened outwards (within the parameter's
+            limits) until it brackets the target
+        tolerance: Absolute net worth error that counts as reaching the target
+        max_iterations: Refinement steps after bracketing
+        max_expansions: Times the bracket may be widened
+    """
+    if parameter not in SWEEP_PARAMETERS:
+        raise ValueError(f"Cannot solve for unknown parameter: {parameter}")
+    if year < 0:
+        raise ValueError("Year cannot be negative")
+
+    targets = np.asarray(targets, dtype=np.float64)
+    lower_limit, upper_limit = LIMITS[parameter]
+    low, high = bracket or DEFAULT_BRACKETS[parameter]
+    if not low < high:
+        raise ValueError("Bracket must be an increasing pair")
+
+    objective = _Objective(ScenarioArrays.from_scenario(scenario), parameter, year)
+
+    # Net worth is linear in every parameter except the return rate
+    transform = _compress if parameter == "expected_return_rate" else _identity
+
+    def evaluate(values: np.ndarray):
+        error = objective(values) - targets
+        return error, transform(targets + error) - transform(targets)
+
+    a = np.full(targets.shape, max(low, lower_limit))
+    b = np.full(targets.shape, min(high, upper_limit))
+    (error_a, error_b), (fa, fb) = evaluate(np.stack([a, b]))
+
+    for _ in range(max_expansions):
+        unbracketed = np.sign(fa) * np.sign(fb) > 0
+        if not unbracketed.any():
+            break
+        width = b - a
+        wider_a = np.where(unbracketed, np.maximum(a - width, lower_limit), a)
+        wider_b = np.where(unbracketed, np.minimum(b + width, upper_limit), b)
+        if (wider_a == a).all() and (wider_b == b).all():
+            # Every unbracketed target is already searched up to the limits
+            break
+        a, b = wider_a, wider_b
+        (error_a, error_b), (fa, fb) = evaluate(np.stack([a, b]))
+
+    bracketed = np.sign(fa) * np.sign(fb) <= 0
+    closer_a = np.abs(error_a) <= np.abs(error_b)
+    x = np.where(closer_a, a, b)
+    error = np.where(closer_a, error_a, error_b)
+    done = ~bracketed | (np.abs(error) <= tolerance)
+
+    side = np.zeros(targets.shape, dtype=np.int8)
+    for _ in range(max_iterations):
+        if done.all():
+            break
+        with np.errstate(divide="ignore", invalid="ignore"):
+            c = (a * fb - b * fa) / (fb - fa)
+        c = np.where(done | ~np.isfinite(c), x, c)
+        error_c, fc = evaluate(c)
+
+        active = ~done
+        x = np.where(active, c, x)
+        error = np.where(active, error_c, error)
+
+        # Keep the sign change in [a, b], and halve the residual of an
+        # endpoint that survives two steps in a row (Illinois) so that
+        # interpolation cannot stall against it.
+        replace_b = active & (np.sign(fc) * np.sign(fb) > 0)
+        replace_a = active & ~replace_b
+        fa = np.where(replace_b & (side == 1), fa / 2, fa)
+        fb = np.where(replace_a & (side == -1), fb / 2, fb)
+        a, fa = np.where(replace_a, c, a), np.where(replace_a, fc, fa)
+        b, fb = np.where(replace_b, c, b), np.where(replace_b, fc, fb)
+        side = np.where(replace_b, 1, np.where(replace_a, -1, side)).astype(np.int8)
+
+        done |= active & (np.abs(error_c) <= tolerance)
+
+    converged = bracketed & (np.abs(error) <= tolerance)
+    return GoalSeekResult(
+        parameter=parameter,
+        year=year,
+        targets=targets,
+        values=np.where(converged, x, np.nan),
+        converged=converged,
+        evaluations=objective.evaluations,
+    )
@@ -0,0 +1,101 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Optional
+
+from networth.models.compensation_package import (
+    BaseSalaryChange,
+    BonusPayment,
+    CompensationBreakdown,
+    CompensationPackage,
+    SigningBonus,
+    StockGrant,
+)
+
+
+class IncrementalCompensation:
+    """Calendar-year compensation totals for a package that are only recomputed
+    for the years a mutation can affect.
+
+    Mutations must go through the add_* methods (or be followed by a call to
+    `invalidate`) so that the affected years are marked dirty. Each year is
+    evaluated over [Jan 1, Jan 1 of the next year) with the package's own
+    calculate_* semantics, so cached values always equal a direct calculation.
+    """
+
+    def __init__(self, package: CompensationPackage):
+        self.package = package
+        self.version = 0
+        self._years: Dict[int, CompensationBreakdown] = {}
+
+    def yearly_breakdown(self, year: int) -> CompensationBreakdown:
+        breakdown = self._years.get(year)
+        if breakdown is None:
+            breakdown = self.package.calculate_compensation_breakdown(
+                date(year, 1, 1), date(year + 1, 1, 1)
+            )
+            self._years[year] = breakdown
+        return breakdown
+
+    def yearly_breakdowns(
+        self, start_year: int, end_year: int
+    ) -> Dict[int, CompensationBreakdown]:
+        """Breakdowns for every year in [start_year, end_year]."""
+        return {
+            year: self.yearly_breakdown(year)
+            for year in range(start_year, end_year + 1)
+        }
+
+    def yearly_total(self, year: int) -> Decimal:
+        return self.yearly_breakdown(year).total
+
+    def is_cached(self, year: int) -> bool:
+        return year in self._years
+
+    def invalidate(self, start_date: date, end_date: Optional[date] = None) -> None:
+        """Mark every year overlapping [start_date, end_date] as dirty. Without an
+        end date all years from start_date onwards are invalidated."""
+        self._evict(start_date.year, end_date.year if end_date else None)
+        self.version += 1
+
+    def invalidate_all(self) -> None:
+        self._years.clear()
+        self.version += 1
+
+    def _evict(self, first_year: int, last_year: Optional[int]) -> None:
+        for year in list(self._years):
+            if year >= first_year and (last_year is None or year <= last_year):
+                del self._years[year]
+
+    def add_salary_change(self, change: BaseSalaryChange) -> None:
+        # The previous salary now ends the day before this change and the new
+        # salary runs until the next later change (or indefinitely).
+        next_change = min(
+            (
+                s.effective_date
+                for s in self.package.base_salary_history
+                if s.effective_date > change.effective_date
+            ),
+            default=None,
+        )
+        self.package.base_salary_history.append(change)
+        self.invalidate(
+            change.effective_date - timedelta(days=1),
+            next_change - timedelta(days=1) if next_change else None,
+        )
+
+    def add_bonus_payment(self, bonus: BonusPayment) -> None:
+        self.package.bonus_payments.append(bonus)
+        self.invalidate(bonus.date, bonus.date)
+
+    def add_signing_bonus(self, bonus: SigningBonus) -> None:
+        self.package.signing_bonuses.append(bonus)
+        self.invalidate(bonus.payment_date, bonus.payment_date)
+
+    def add_stock_grant(self, grant: StockGrant) -> None:
+        self.package.stock_grants.append(grant)
+        for vest_date in grant.vesting_event_store().dates():
+            # Stock totals include the end date, so a vest on Jan 1 also counts
+            # towards the previous year's window.
+            first_day = vest_date - timedelta(days=1)
+            self._evict(first_day.year, vest_date.year)
+        self.version += 1
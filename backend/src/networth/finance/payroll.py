@@ -0,0 +1,277 @@
+"""Paycheck-level view of a compensation package.
+
+Regular paychecks carry the salary earned during their pay period, prorated
+by day when a salary change falls inside the period, with federal and state
+income tax withheld using the annualized wage method. Bonuses and signing
+bonuses are paid on their own off-cycle checks at the supplemental rates.
+Stubs are generated lazily, so asking for a window only expands the pay
+periods that overlap it.
+"""
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from enum import Enum
+import heapq
+from itertools import count, takewhile
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from networth.dates import add_months
+from networth.finance.taxes import TaxCalculator
+from networth.finance.withholding import (
+    FEDERAL_MANDATORY_SUPPLEMENTAL_RATE,
+    FEDERAL_MANDATORY_THRESHOLD,
+    FEDERAL_SUPPLEMENTAL_RATE,
+    STATE_SUPPLEMENTAL_RATES,
+)
+from networth.models.compensation_package import CompensationPackage
+from networth.models.currency import Currency, CurrencyCode
+
+
+class PayFrequency(str, Enum):
+    BIWEEKLY = "biweekly"
+    SEMIMONTHLY = "semimonthly"
+    MONTHLY = "monthly"
+
+    @property
+    def periods_per_year(self) -> int:
+        if self == PayFrequency.BIWEEKLY:
+            return 26
+        elif self == PayFrequency.SEMIMONTHLY:
+            return 24
+        elif self == PayFrequency.MONTHLY:
+            return 12
+        else:
+            raise ValueError(f"Invalid pay frequency: {self}")
+
+
+class PayStubType(str, Enum):
+    REGULAR = "regular"
+    BONUS = "bonus"
+    SIGNING_BONUS = "signing_bonus"
+
+
+@dataclass(frozen=True)
+class PayStub:
+    """A single paycheck. `period_end` is non-inclusive; off-cycle checks have
+    a one-day period on their pay date."""
+
+    type: PayStubType
+    pay_date: date
+    period_start: date
+    period_end: date
+    gross: Currency
+    federal_withholding: Currency
+    state_withholding: Currency
+
+    @property
+    def net(self) -> Currency:
+        return Currency(
+            code=self.gross.code,
+            amount=self.gross.amount
+            - self.federal_withholding.amount
+            - self.state_withholding.amount,
+        )
+
+
+def _month_start(day: date, months: int) -> date:
+    """First day of the month `months` after the one containing `day`."""
+    return add_months(day.replace(day=1), months).item()
+
+
+def iter_pay_periods(
+    frequency: PayFrequency, anchor: date, start: Optional[date] = None
+) -> Iterator[Tuple[date, date]]:
+    """Consecutive [start, end) pay periods whose last day is on or after
+    `start`, beginning with the period containing `anchor`. Paychecks are paid
+    on the last day of each period.
+
+    Biweekly periods are counted in 14-day steps from `anchor`; semimonthly
+    periods are the 1st-15th and the 16th-end of each month.
+    """
+    start = max(start or anchor, anchor)
+    if frequency == PayFrequency.BIWEEKLY:
+        first = (start - anchor).days // 14
+        for k in count(first):
+            yield anchor + timedelta(days=14 * k), anchor + timedelta(days=14 * (k + 1))
+    elif frequency == PayFrequency.SEMIMONTHLY:
+        for months in count():
+            month_start = _month_start(start, months)
+            middle = month_start.replace(day=16)
+            if start < middle:
+                yield month_start, middle
+            yield middle, _month_start(start, months + 1)
+    elif frequency == PayFrequency.MONTHLY:
+        for months in count():
+            yield _month_start(start, months), _month_start(start, months + 1)
+    else:
+        raise ValueError(f"Invalid pay frequency: {frequency}")
+
+
+class PayrollSchedule:
+    """Pay stubs for a compensation package.
+
+    Args:
+        package: The package whose salary, bonuses and signing bonuses are paid
+        frequency: How often regular paychecks are paid; biweekly periods are
+            anchored on the package start date
+        filing_status: Filing status understood by TaxCalculator
+        state: State understood by TaxCalculator with a supplemental rate
+        inflation_rate: Indexes tax brackets of years after the last
+            configured year, see `TaxCalculator`
+    """
+
+    def __init__(
+        self,
+        package: CompensationPackage,
+        frequency: PayFrequency,
+        filing_status: str,
+        state: str,
+        inflation_rate: Optional[float] = None,
+    ):
+        if state not in STATE_SUPPLEMENTAL_RATES:
+            raise ValueError(f"Invalid state: {state}")
+        self.package = package
+        self.frequency = PayFrequency(frequency)
+        self.filing_status = filing_status
+        self.state = state
+        self.inflation_rate = inflation_rate
+
+        self.salaries = sorted(
+            package.base_salary_history, key=lambda x: x.effective_date
+        )
+        self.code = (
+            self.salaries[0].annual_amount.code if self.salaries else CurrencyCode.USD
+        )
+        self._calculators: Dict[int, TaxCalculator] = {}
+
+    def _calculator(self, year: int) -> TaxCalculator:
+        calculator = self._calculators.get(year)
+        if calculator is None:
+            calculator = TaxCalculator(
+                year, self.filing_status, self.state, self.inflation_rate
+            )
+            self._calculators[year] = calculator
+        return calculator
+
+    def _currency(self, amount: int) -> Currency:
+        return Currency(code=self.code, amount=amount)
+
+    def period_salary(self, period_start: date, period_end: date) -> int:
+        """Salary earned in [period_start, period_end) in minimum currency units.
+
+        A full period pays the annual amount divided by the number of periods
+        per year; partial coverage is prorated by day.
+        """
+        period_days = (period_end - period_start).days
+        total = 0
+        for i, salary in enumerate(self.salaries):
+            segment_end = (
+                self.salaries[i + 1].effective_date
+                if i + 1 < len(self.salaries)
+                else period_end
+            )
+            overlap = (
+                min(period_end, segment_end) - max(period_start, salary.effective_date)
+            ).days
+            if overlap > 0:
+                total += salary.annual_amount.multiply(
+                    overlap / period_days / self.frequency.periods_per_year
+                ).amount
+        return total
+
+    def _regular_stubs(self, start: Optional[date]) -> Iterator[PayStub]:
+        if not self.salaries:
+            return
+        periods_per_year = self.frequency.periods_per_year
+        for period_start, period_end in iter_pay_periods(
+            self.frequency, self.package.start_date, start
+        ):
+            pay_date = period_end - timedelta(days=1)
+            gross = self.period_salary(period_start, period_end)
+            if period_end <= self.salaries[0].effective_date:
+                continue
+
+            # Annualized wage method: withhold the tax on a year of this pay
+            federal, state = self._calculator(pay_date.year).calculate_taxes(
+                [gross / 100 * periods_per_year]
+            )
+            yield PayStub(
+                type=PayStubType.REGULAR,
+                pay_date=pay_date,
+                period_start=period_start,
+                period_end=period_end,
+                gross=self._currency(gross),
+                federal_withholding=self._currency(
+                    round(federal[0] * 100 / periods_per_year)
+                ),
+                state_withholding=self._currency(
+                    round(state[0] * 100 / periods_per_year)
+                ),
+            )
+
+    def _supplemental_stubs(self, start: Optional[date]) -> Iterator[PayStub]:
+        payments = sorted(
+            [(b.date, PayStubType.BONUS, b.amount) for b in self.package.bonus_payments]
+            + [
+                (b.payment_date, PayStubType.SIGNING_BONUS, b.amount)
+                for b in self.package.signing_bonuses
+            ],
+            key=lambda x: x[0],
+        )
+        # Supplemental wages paid so far in the year, in major units, for the
+        # mandatory withholding rate above the threshold
+        paid_in_year: Dict[int, float] = {}
+        state_rate = STATE_SUPPLEMENTAL_RATES[self.state]
+        for pay_date, stub_type, amount in payments:
+            paid_before = paid_in_year.get(pay_date.year, 0.0)
+            dollars = amount.get_base_units()
+            paid_in_year[pay_date.year] = paid_before + dollars
+            if start is not None and pay_date < start:
+                continue
+
+            over = min(
+                max(paid_before + dollars - FEDERAL_MANDATORY_THRESHOLD, 0), dollars
+            )
+            federal_rate = (
+                (
+                    FEDERAL_SUPPLEMENTAL_RATE * (dollars - over)
+                    + FEDERAL_MANDATORY_SUPPLEMENTAL_RATE * over
+                )
+                / dollars
+                if dollars
+                else 0
+            )
+            yield PayStub(
+                type=stub_type,
+                pay_date=pay_date,
+                period_start=pay_date,
+                period_end=pay_date + timedelta(days=1),
+                gross=amount,
+                federal_withholding=amount.multiply(federal_rate),
+                state_withholding=amount.multiply(state_rate),
+            )
+
+    def iter_pay_stubs(self, start: Optional[date] = None) -> Iterator[PayStub]:
+        """All pay stubs paid on or after `start`, in pay date order.
+
+        The stream of regular paychecks never ends; combine it with a bound
+        (or use `pay_stubs`) when a finite list is needed.
+        """
+        return heapq.merge(
+            self._regular_stubs(start),
+            self._supplemental_stubs(start),
+            key=lambda stub: stub.pay_date,
+        )
+
+    def pay_stubs(self, start_date: date, end_date: date) -> List[PayStub]:
+        """Pay stubs paid in [start_date, end_date)."""
+        return list(
+            takewhile(
+                lambda stub: stub.pay_date < end_date, self.iter_pay_stubs(start_date)
+            )
+        )
+
+    def total_gross(self, start_date: date, end_date: date) -> Decimal:
+        total = sum(stub.gross.amount for stub in self.pay_stubs(start_date, end_date))
+        return Decimal(total / 100)
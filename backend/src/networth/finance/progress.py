@@ -0,0 +1,105 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+import numpy as np
+
+from networth.finance.bootstrap import (
+    DEFAULT_PERCENTILES,
+    SimulationResult,
+    simulate_net_worth,
+)
+from networth.finance.sweep import ScenarioArrays, iter_net_worth
+from networth.models.scenario import FinancialModel, FinancialScenario
+
+
+@dataclass
+class ProgressEvent:
+    """A partial result or status update from a long-running computation."""
+
+    event: str
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+def projection_progress(
+    model: FinancialModel, years: int, chunk_years: int = 10
+) -> Iterator[ProgressEvent]:
+    """Project every scenario in `model`, yielding results as they are computed.
+
+    Emits a `years` event per chunk of completed years of a scenario, a
+    `scenario` event when a scenario is finished and a final `complete` event.
+    Closing the generator stops the computation.
+    """
+    if chunk_years < 1:
+        raise ValueError("Chunk size must be positive")
+
+    scenarios = {"base": model.base_scenario, **model.alternative_scenarios}
+    for completed, (name, scenario) in enumerate(scenarios.items(), start=1):
+        values = []
+        for year, net_worth in enumerate(
+            iter_net_worth(ScenarioArrays.from_scenario(scenario), years)
+        ):
+            values.append(float(net_worth))
+            if len(values) % chunk_years == 0 or year == years:
+                first_year = (len(values) - 1) // chunk_years * chunk_years
+                yield ProgressEvent(
+                    "years",
+                    {
+                        "scenario": name,
+                        "first_year": first_year,
+                        "net_worth": values[first_year:],
+                    },
+                )
+        yield ProgressEvent(
+            "scenario",
+            {
+                "scenario": name,
+                "net_worth": values,
+                "completed_scenarios": completed,
+                "total_scenarios": len(scenarios),
+            },
+        )
+    yield ProgressEvent("complete", {"total_scenarios": len(scenarios)})
+
+
+def simulation_progress(
+    scenario: FinancialScenario,
+    years: int,
+    num_paths: int,
+    batch_paths: int = 10_000,
+    block_size: int = 5,
+    recenter: bool = False,
+    seed: Optional[int] = None,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+) -> Iterator[ProgressEvent]:
+    """Run a bootstrap simulation in batches of paths, yielding the net worth
+    percentiles over all paths completed so far after every batch."""
+    if batch_paths < 1:
+        raise ValueError("Batch size must be positive")
+
+    seeds = np.random.SeedSequence(seed).spawn(-(-num_paths // batch_paths))
+    batches = []
+    for batch_seed in seeds:
+        size = min(batch_paths, num_paths - sum(len(b) for b in batches))
+        result = simulate_net_worth(
+            scenario,
+            years,
+            num_paths=size,
+            block_size=block_size,
+            recenter=recenter,
+            seed=batch_seed,
+        )
+        batches.append(result.net_worth)
+
+        so_far = SimulationResult(net_worth=np.concatenate(batches))
+        yield ProgressEvent(
+            "paths",
+            {
+                "completed_paths": len(so_far.net_worth),
+                "total_paths": num_paths,
+                "percentiles": {
+                    str(p): values.tolist()
+                    for p, values in so_far.percentiles(percentiles).items()
+                },
+            },
+        )
+    yield ProgressEvent("complete", {"total_paths": num_paths})
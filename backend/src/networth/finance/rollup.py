@@ -0,0 +1,207 @@
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from networth.dates import add_months, from_days, to_days
+from networth.finance.compensation_arrays import PackedCompensation, cents_to_decimal
+from networth.models.compensation_package import (
+    CompensationBreakdown,
+    CompensationPackage,
+)
+
+COMPONENTS = ("salary", "bonuses", "stock_grants", "signing_bonuses")
+
+
+@dataclass
+class RollupMismatch:
+    start_date: date
+    end_date: date
+    component: str
+    rollup: Decimal
+    direct: Decimal
+
+
+class CompensationRollup:
+    """Materialized per-month compensation totals for one package.
+
+    Bonus, stock and signing bonus amounts are bucketed by month in a single
+    pass over the packed events, and month-aligned windows are answered from
+    prefix sums over those buckets. Salary is not additive across months (the
+    prorated day count drops a day per salary per period), so aligned salary
+    totals are evaluated from the packed salary history instead. Windows that
+    don't start and end on the first of a month inside the rollup range fall
+    back to the package's exact methods.
+    """
+
+    def __init__(
+        self,
+        package: CompensationPackage,
+        start_month: date,
+        end_month: date,
+        packed: Optional[PackedCompensation] = None,
+    ):
+        if start_month.day != 1 or end_month.day != 1:
+            raise ValueError("Rollup range must start and end on a month boundary")
+        if end_month < start_month:
+            raise ValueError("End month must be after start month")
+
+        self.package = package
+        self.packed = packed or PackedCompensation.from_package(package)
+        self.months = np.arange(
+            np.datetime64(start_month, "M"),
+            np.datetime64(end_month, "M") + 1,
+        )
+        # Month boundaries in epoch days; the last entry is end_month itself
+        self.boundaries = self.months.astype("datetime64[D]").astype(np.int64)
+
+        self.salary = self.packed.salary_cents(
+            self.boundaries[:-1], self.boundaries[1:]
+        )
+        self.bonuses = self._bucket(self.packed.bonus_days, self.packed.bonus_amounts)
+        self.stock_grants = self._bucket(
+            self.packed.stock_days, self.packed.stock_amounts
+        )
+        self.signing_bonuses = self._bucket(
+            self.packed.signing_days, self.packed.signing_amounts
+        )
+        # Stock windows include their end date, so keep what vests on each
+        # month boundary to add to the prefix sum.
+        self.stock_on_boundary = self.packed.stock_cents(
+            self.boundaries, self.boundaries
+        )
+
+        self._prefix = {
+            name: np.concatenate(([0], np.cumsum(getattr(self, name))))
+            for name in ("bonuses", "stock_grants", "signing_bonuses")
+        }
+
+    @classmethod
+    def build(
+        cls,
+        package: CompensationPackage,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> "CompensationRollup":
+        """Build a rollup covering [start_date, end_date), widened to whole
+        months. Defaults come from `PackedCompensation.default_range`."""
+        packed = PackedCompensation.from_package(package)
+        start_date, default_end = packed.default_range(package, start_date)
+        end_date = end_date or default_end
+
+        end_month = end_date.replace(day=1)
+        if end_month < end_date:
+            end_month = add_months(end_month, 1).item()
+        return cls(package, start_date.replace(day=1), end_month, packed)
+
+    @property
+    def start_month(self) -> date:
+        return from_days(int(self.boundaries[0]))
+
+    @property
+    def end_month(self) -> date:
+        return from_days(int(self.boundaries[-1]))
+
+    def _bucket(self, days: np.ndarray, amounts: np.ndarray) -> np.ndarray:
+        index = np.searchsorted(self.boundaries, days, side="right") - 1
+        in_range = (index >= 0) & (index < len(self.boundaries) - 1)
+        totals = np.zeros(len(self.boundaries) - 1, dtype=np.int64)
+        np.add.at(totals, index[in_range], amounts[in_range])
+        return totals
+
+    def _month_index(self, day: date) -> Optional[int]:
+        if day.day != 1:
+            return None
+        days = to_days([day])[0]
+        index = int(np.searchsorted(self.boundaries, days))
+        if index >= len(self.boundaries) or self.boundaries[index] != days:
+            return None
+        return index
+
+    def calculate_compensation_breakdown(
+        self, start_date: date, end_date: date
+    ) -> CompensationBreakdown:
+        start = self._month_index(start_date)
+        end = self._month_index(end_date)
+        if start is None or end is None or end < start:
+            return self.package.calculate_compensation_breakdown(start_date, end_date)
+
+        salary = self.packed.salary_cents(
+            self.boundaries[[start]], self.boundaries[[end]]
+        )[0]
+        stock = (
+            self._prefix["stock_grants"][end]
+            - self._prefix["stock_grants"][start]
+            + self.stock_on_boundary[end]
+        )
+        return CompensationBreakdown(
+            salary=cents_to_decimal(salary),
+            bonuses=cents_to_decimal(
+                self._prefix["bonuses"][end] - self._prefix["bonuses"][start]
+            ),
+            stock_grants=cents_to_decimal(stock),
+            signing_bonuses=cents_to_decimal(
+                self._prefix["signing_bonuses"][end]
+                - self._prefix["signing_bonuses"][start]
+            ),
+        )
+
+    def calculate_total_compensation(self, start_date: date, end_date: date) -> Decimal:
+        return self.calculate_compensation_breakdown(start_date, end_date).total
+
+    def monthly_breakdowns(self) -> Dict[date, CompensationBreakdown]:
+        """Totals for each month [first of month, first of next month)."""
+        stock = self.stock_grants + self.stock_on_boundary[1:]
+        return {
+            from_days(int(day)): CompensationBreakdown(
+                salary=cents_to_decimal(self.salary[i]),
+                bonuses=cents_to_decimal(self.bonuses[i]),
+                stock_grants=cents_to_decimal(stock[i]),
+                signing_bonuses=cents_to_decimal(self.signing_bonuses[i]),
+            )
+            for i, day in enumerate(self.boundaries[:-1])
+        }
+
+    def yearly_breakdowns(self) -> Dict[int, CompensationBreakdown]:
+        """Totals for each calendar year fully covered by the rollup."""
+        first_year = self.start_month.year + (self.start_month.month != 1)
+        return {
+            year: self.calculate_compensation_breakdown(
+                date(year, 1, 1), date(year + 1, 1, 1)
+            )
+            for year in range(first_year, self.end_month.year)
+        }
+
+    def check_consistency(
+        self, windows: Optional[Iterable[Tuple[date, date]]] = None
+    ) -> List[RollupMismatch]:
+        """Compare rollup totals against the package's direct calculation.
+
+        By default every month and every whole year in the rollup is checked.
+        Returns the mismatching components; an empty list means consistent.
+        """
+        if windows is None:
+            months = [from_days(int(day)) for day in self.boundaries]
+            windows = list(zip(months[:-1], months[1:])) + [
+                (date(year, 1, 1), date(year + 1, 1, 1))
+                for year in self.yearly_breakdowns()
+            ]
+
+        mismatches = []
+        for start_date, end_date in windows:
+            rollup = self.calculate_compensation_breakdown(start_date, end_date)
+            direct = self.package.calculate_compensation_breakdown(start_date, end_date)
+            for component in COMPONENTS:
+                if getattr(rollup, component) != getattr(direct, component):
+                    mismatches.append(
+                        RollupMismatch(
+                            start_date=start_date,
+                            end_date=end_date,
+                            component=component,
+                            rollup=getattr(rollup, component),
+                            direct=getattr(direct, component),
+                        )
+                    )
+        return mismatches
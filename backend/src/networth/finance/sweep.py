@@ -0,0 +1,276 @@
+from dataclasses import dataclass, field
+from typing import Iterator, Mapping, Optional, Sequence
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from networth.models.scenario import AmountChange, Expense, FinancialScenario, Income
+
+# Parameters that can be swept. Investment and income overrides apply to every
+# investment/income in the scenario; expenses and incomes are swept as a
+# multiplier on each `amount` so that "expenses +/-20%" is a grid of
+# [0.8, ..., 1.2].
+SWEEP_PARAMETERS = (
+    "expected_return_rate",
+    "monthly_contribution",
+    "expense_scale",
+    "income_scale",
+    "tax_rate",
+)
+
+
+@dataclass
+class ItemSchedules:
+    """Annual amounts of a list of expenses or incomes as step changes.
+
+    Steps are sorted by item and then year; every item has a step at year 0
+    with its base amount. Evaluating the schedules for a horizon yields an
+    (items, years + 1) array in one pass.
+    """
+
+    items: np.ndarray
+    years: np.ndarray
+    amounts: np.ndarray
+    growth_rates: np.ndarray
+
+    @classmethod
+    def from_items(cls, items: Sequence[Expense | Income]) -> "ItemSchedules":
+        steps = [
+            (i, step.year, float(step.amount * 12 if item.is_monthly else step.amount))
+            for i, item in enumerate(items)
+            for step in [AmountChange(year=0, amount=item.amount)]
+            + sorted(item.changes, key=lambda change: change.year)
+        ]
+        columns = list(zip(*steps)) or [(), (), ()]
+        return cls(
+            items=np.array(columns[0], dtype=np.int64),
+            years=np.array(columns[1], dtype=np.int64),
+            amounts=np.array(columns[2], dtype=np.float64),
+            growth_rates=np.array(
+                [float(item.growth_rate) for item in items], dtype=np.float64
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.growth_rates)
+
+    def evaluate(self, years: int) -> np.ndarray:
+        """Annual amounts with shape (items, years + 1), matching
+        `annual_schedule`."""
+        # Index of the step in effect, forward filled along the year axis;
+        # later steps in the same year overwrite earlier ones.
+        step = np.full((len(self), years + 1), -1, dtype=np.int64)
+        in_horizon = self.years <= years
+        step[self.items[in_horizon], self.years[in_horizon]] = np.flatnonzero(
+            in_horizon
+        )
+        step = np.maximum.accumulate(step, axis=1)
+        growth = (1 + self.growth_rates[:, np.newaxis]) ** np.arange(years + 1)
+        return self.amounts[step] * growth
+
+
+@dataclass
+class ScenarioArrays:
+    """A FinancialScenario flattened into float arrays, one entry per item."""
+
+    initial_amounts: np.ndarray
+    monthly_contributions: np.ndarray
+    return_rates: np.ndarray
+    incomes: ItemSchedules
+    tax_rates: np.ndarray
+    expenses: ItemSchedules
+
+    @classmethod
+    def from_scenario(cls, scenario: FinancialScenario) -> "ScenarioArrays":
+        return cls(
+            initial_amounts=np.array(
+                [float(inv.initial_amount) for inv in scenario.investments],
+                dtype=np.float64,
+            ),
+            monthly_contributions=np.array(
+                [float(inv.monthly_contribution) for inv in scenario.investments],
+                dtype=np.float64,
+            ),
+            return_rates=np.array(
+                [float(inv.expected_return_rate) for inv in scenario.investments],
+                dtype=np.float64,
+            ),
+            incomes=ItemSchedules.from_items(scenario.incomes),
+            tax_rates=np.array(
+                [float(income.tax_rate) for income in scenario.incomes],
+                dtype=np.float64,
+            ),
+            expenses=ItemSchedules.from_items(scenario.expenses),
+        )
+
+    def annual_net_incomes(
+        self,
+        years: int,
+        tax_rates: Optional[np.ndarray] = None,
+        income_scale: Optional[ArrayLike] = None,
+        expense_scale: Optional[ArrayLike] = None,
+    ) -> np.ndarray:
+        """Net income per year with a trailing axis of `years + 1`, broadcast
+        over the shapes of the (optional) overrides."""
+        tax_rates = self.tax_rates if tax_rates is None else tax_rates
+        income_scale = np.asarray(
+            1.0 if income_scale is None else income_scale, np.float64
+        )
+        expense_scale = np.asarray(
+            1.0 if expense_scale is None else expense_scale, np.float64
+        )
+        incomes = (1 - tax_rates) @ self.incomes.evaluate(years)
+        expenses = self.expenses.evaluate(years).sum(axis=0)
+        return (
+            income_scale[..., np.newaxis] * incomes
+            - expense_scale[..., np.newaxis] * expenses
+        )
+
+
+def _item_values(default: np.ndarray, override: Optional[ArrayLike]) -> np.ndarray:
+    """Values with a trailing per-item axis, replacing every item by `override`."""
+    if override is None:
+        return default
+    override = np.asarray(override, dtype=np.float64)
+    return np.broadcast_to(override[..., np.newaxis], override.shape + default.shape)
+
+
+def iter_net_worth(
+    arrays: ScenarioArrays,
+    years: int,
+    expected_return_rate: Optional[ArrayLike] = None,
+    monthly_contribution: Optional[ArrayLike] = None,
+    expense_scale: Optional[ArrayLike] = None,
+    income_scale: Optional[ArrayLike] = None,
+    tax_rate: Optional[ArrayLike] = None,
+) -> Iterator[np.ndarray]:
+    """Yield the net worth for each year 0..years, see `project_net_worth`."""
+    rates = _item_values(arrays.return_rates, expected_return_rate)
+    contributions = _item_values(arrays.monthly_contributions, monthly_contribution)
+    tax_rates = _item_values(arrays.tax_rates, tax_rate)
+
+    growth = 1 + rates
+    annual_contributions = contributions * 12
+    values = np.broadcast_to(
+        arrays.initial_amounts, np.broadcast_shapes(growth.shape, contributions.shape)
+    )
+
+    # Income and expense schedules are evaluated once for the whole horizon
+    net_incomes = arrays.annual_net_incomes(
+        years, tax_rates, income_scale=income_scale, expense_scale=expense_scale
+    )
+    shape = np.broadcast_shapes(values.shape[:-1], net_incomes.shape[:-1])
+
+    savings = np.zeros(net_incomes.shape[:-1])
+    for year in range(years + 1):
+        yield np.broadcast_to(values.sum(axis=-1) + savings, shape).copy()
+        values = values * growth + annual_contributions
+        savings = savings + net_incomes[..., year]
+
+
+def project_net_worth(
+    arrays: ScenarioArrays,
+    years: int,
+    expected_return_rate: Optional[ArrayLike] = None,
+    monthly_contribution: Optional[ArrayLike] = None,
+    expense_scale: Optional[ArrayLike] = None,
+    income_scale: Optional[ArrayLike] = None,
+    tax_rate: Optional[ArrayLike] = None,
+) -> np.ndarray:
+    """Vectorized equivalent of `FinancialScenario.project_net_worth`.
+
+    Every override is broadcast against the others, so passing arrays shaped
+    for distinct axes evaluates their full Cartesian product. The result has
+    the broadcast shape of the overrides plus a trailing axis of `years + 1`.
+    """
+    return np.stack(
+        list(
+            iter_net_worth(
+                arrays,
+                years,
+                expected_return_rate=expected_return_rate,
+                monthly_contribution=monthly_contribution,
+                expense_scale=expense_scale,
+                income_scale=income_scale,
+                tax_rate=tax_rate,
+            )
+        ),
+        axis=-1,
+    )
+
+
+@dataclass
+class SweepResult:
+    """Net worth for every grid point, labeled by the swept parameter values."""
+
+    dims: tuple[str, ...]
+    coords: dict[str, np.ndarray]
+    values: np.ndarray = field(repr=False)
+
+    def sel(self, **labels: float) -> np.ndarray:
+        """Select the slice at the given parameter values (exact match)."""
+        index: list = [slice(None)] * len(self.dims)
+        for name, label in labels.items():
+            if name not in self.coords:
+                raise ValueError(f"Unknown sweep dimension: {name}")
+            matches = np.flatnonzero(self.coords[name] == label)
+            if not len(matches):
+                raise KeyError(f"{label} is not a value of {name}")
+            index[self.dims.index(name)] = matches[0]
+        return self.values[tuple(index)]
+
+    def to_frame(self):
+        """Long-form DataFrame with one column per dimension plus `net_worth`."""
+        import pandas as pd
+
+        grids = np.meshgrid(
+            *(self.coords[dim] for dim in self.dims), indexing="ij", sparse=False
+        )
+        data = {dim: grid.ravel() for dim, grid in zip(self.dims, grids)}
+        data["net_worth"] = self.values.ravel()
+        return pd.DataFrame(data)
+
+
+def sweep_scenario(
+    scenario: FinancialScenario,
+    years: int,
+    grids: Mapping[str, Sequence[float]],
+) -> SweepResult:
+    """Project `scenario` over the Cartesian product of the parameter grids.
+
+    Args:
+        scenario: The scenario whose incomes, expenses and investments are swept
+        years: Number of years to project
+        grids: Values per parameter in SWEEP_PARAMETERS; each one becomes an
+            axis of the result, in the order given
+
+    Returns:
+        A SweepResult with dims `(*grids, "year")`
+    """
+    unknown = set(grids) - set(SWEEP_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Cannot sweep unknown parameters: {sorted(unknown)}")
+
+    dims = tuple(grids)
+    coords = {}
+    overrides = {}
+    for axis, name in enumerate(dims):
+        values = np.asarray(grids[name], dtype=np.float64)
+        if values.ndim != 1 or not len(values):
+            raise ValueError(f"Grid for {name} must be a non-empty 1-d sequence")
+        coords[name] = values
+        shape = [1] * len(dims)
+        shape[axis] = len(values)
+        overrides[name] = values.reshape(shape)
+
+    net_worth = project_net_worth(
+        ScenarioArrays.from_scenario(scenario), years, **overrides
+    )
+    # Dimensions that don't influence the result (e.g. sweeping returns with no
+    # investments) collapse to length 1 under broadcasting; restore them.
+    shape = tuple(len(coords[name]) for name in dims) + (years + 1,)
+    if net_worth.shape != shape:
+        net_worth = np.broadcast_to(net_worth, shape).copy()
+
+    coords["year"] = np.arange(years + 1)
+    return SweepResult(dims=dims + ("year",), coords=coords, values=net_worth)
@@ -1,11 +1,21 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from decimal import Decimal
+from functools import lru_cache
 import logging
+from typing import Dict, Optional, Sequence, Tuple, TypeVar
+
+import numpy as np
+from numpy.typing import ArrayLike
 
 from networth.models.taxes import TaxBill
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Annual growth of bracket thresholds after the last configured year
+DEFAULT_INFLATION_RATE = 0.025
+
 
 @dataclass
 class TaxBracket:
@@ -122,49 +132,158 @@ STATE_TAX_BRACKETS = {
     }
 }
 
+
+@dataclass(frozen=True)
+class CompiledBrackets:
+    """Brackets as parallel arrays for evaluating many incomes at once."""
+
+    mins: np.ndarray
+    bases: np.ndarray
+    rates: np.ndarray
+
+    @classmethod
+    def from_brackets(cls, brackets: list[TaxBracket]) -> "CompiledBrackets":
+        return cls(
+            mins=np.array([b.min for b in brackets], dtype=np.float64),
+            bases=np.array(
+                [b.additional_from_previous for b in brackets], dtype=np.float64
+            ),
+            rates=np.array([b.rate for b in brackets], dtype=np.float64),
+        )
+
+    @classmethod
+    def stack(cls, compiled: Sequence["CompiledBrackets"]) -> "CompiledBrackets":
+        """One row per entry, padded with brackets no income reaches."""
+        width = max(len(c.mins) for c in compiled)
+
+        def column(name: str, fill: float) -> np.ndarray:
+            rows = [getattr(c, name) for c in compiled]
+            return np.array(
+                [
+                    np.pad(row, (0, width - len(row)), constant_values=fill)
+                    for row in rows
+                ]
+            )
+
+        return cls(
+            mins=column("mins", np.inf),
+            bases=column("bases", 0.0),
+            rates=column("rates", 0.0),
+        )
+
+    def scaled(self, factor: float) -> "CompiledBrackets":
+        return CompiledBrackets(
+            mins=self.mins * factor, bases=self.bases * factor, rates=self.rates
+        )
+
+    def tax(self, incomes: ArrayLike) -> np.ndarray:
+        incomes = np.asarray(incomes, dtype=np.float64)
+        # Index of the highest bracket whose min is strictly below the income
+        index = np.searchsorted(self.mins, incomes, side="left") - 1
+        safe = np.maximum(index, 0)
+        taxes = self.bases[safe] + (incomes - self.mins[safe]) * self.rates[safe]
+        return np.where(index >= 0, taxes, 0.0)
+
+
 MIN_FEDERAL_YEAR = min(FEDERAL_TAX_BRACKETS.keys())
 MAX_FEDERAL_YEAR = max(FEDERAL_TAX_BRACKETS.keys())
 
 
+def index_brackets(brackets: list[TaxBracket], factor: float) -> list[TaxBracket]:
+    """Brackets with every threshold and base amount scaled by `factor`.
+
+    Scaling the bases along with the thresholds keeps the schedule
+    consistent: the tax on an indexed income is the indexed tax on the
+    original income.
+    """
+    return [
+        replace(
+            bracket,
+            min=bracket.min * factor,
+            max=bracket.max * factor,
+            additional_from_previous=bracket.additional_from_previous * factor,
+        )
+        for bracket in brackets
+    ]
+
+
+def _table_year(
+    tables: Dict[int, T], year: int, inflation_rate: Optional[float]
+) -> Tuple[int, float]:
+    """The configured year to use for `year` and the factor to index it by.
+
+    Years before the first configured year use the first one. Later years
+    use the last one, indexed by `inflation_rate` per year when given.
+    """
+    if year in tables:
+        return year, 1.0
+    if year < min(tables):
+        return min(tables), 1.0
+    latest = max(tables)
+    if inflation_rate is None:
+        return latest, 1.0
+    return latest, (1 + inflation_rate) ** (year - latest)
+
+
 class TaxCalculator:
-    def __init__(self, year: int, filing_status: str, state: str):
-        self.year = year
-        if self.year not in FEDERAL_TAX_BRACKETS:
-            if self.year < MIN_FEDERAL_YEAR:
-                self.year = MIN_FEDERAL_YEAR
-            else:
-                self.year = MAX_FEDERAL_YEAR
+    """Federal and state income tax for one year.
+
+    Years outside the configured range use the nearest configured year. With
+    an `inflation_rate`, years after the last configured year instead index
+    its thresholds forward by that rate per year, and `year` stays the
+    requested year.
+    """
+
+    def __init__(
+        self,
+        year: int,
+        filing_status: str,
+        state: str,
+        inflation_rate: Optional[float] = None,
+    ):
+        federal_year, federal_factor = _table_year(
+            FEDERAL_TAX_BRACKETS, year, inflation_rate
+        )
+        self.year = federal_year
+        if federal_year != year:
+            if inflation_rate is not None and year > federal_year:
+                self.year = year
             logger.info(
-                f"Using {self.year} tax brackets for {filing_status} because {year} has no tax configuration"
+                f"Using {federal_year} tax brackets for {filing_status} because {year} has no tax configuration"
             )
 
         self.filing_status = filing_status
-        if self.filing_status not in FEDERAL_TAX_BRACKETS[self.year]:
+        if self.filing_status not in FEDERAL_TAX_BRACKETS[federal_year]:
             raise ValueError(f"Invalid filing status: {filing_status}")
 
-        self.federal_bracket = FEDERAL_TAX_BRACKETS[self.year][self.filing_status]
+        self.federal_bracket = index_brackets(
+            FEDERAL_TAX_BRACKETS[federal_year][self.filing_status], federal_factor
+        )
 
         self.state = state
-        state_year = self.year
-        if state_year not in STATE_TAX_BRACKETS:
-            if state_year < min(STATE_TAX_BRACKETS.keys()):
-                state_year = min(STATE_TAX_BRACKETS.keys())
-            else:
-                state_year = max(STATE_TAX_BRACKETS.keys())
+        state_year, state_factor = _table_year(STATE_TAX_BRACKETS, year, inflation_rate)
         if self.state not in STATE_TAX_BRACKETS[state_year]:
             raise ValueError(f"Invalid state: {state}")
         if self.filing_status not in STATE_TAX_BRACKETS[state_year][self.state]:
             raise ValueError(f"Invalid filing status: {self.filing_status}")
 
-        self.state_bracket = STATE_TAX_BRACKETS[state_year][self.state][
-            self.filing_status
-        ]
+        self.state_bracket = index_brackets(
+            STATE_TAX_BRACKETS[state_year][self.state][self.filing_status],
+            state_factor,
+        )
+
+        self.federal_compiled = CompiledBrackets.from_brackets(self.federal_bracket)
+        self.state_compiled = CompiledBrackets.from_brackets(self.state_bracket)
 
     def calculate_tax(self, income: Decimal) -> TaxBill:
         federal_tax = self._get_tax_amount(income, self.federal_bracket)
         state_tax = self._get_tax_amount(income, self.state_bracket)
         return TaxBill(federal=federal_tax, state=state_tax)
 
+    def calculate_taxes(self, incomes: ArrayLike) -> tuple[np.ndarray, np.ndarray]:
+        """Federal and state tax for an array of incomes, as float arrays."""
+        return self.federal_compiled.tax(incomes), self.state_compiled.tax(incomes)
+
     def _get_tax_amount(self, income: Decimal, brackets: list[TaxBracket]) -> Decimal:
         for bracket in reversed(brackets):
             if income > bracket.min:
@@ -173,3 +292,90 @@ class TaxCalculator:
                     + (float(income) - bracket.min) * bracket.rate
                 )
         return Decimal(0)
+
+
+@dataclass(frozen=True)
+class ProjectedTaxTable:
+    """Compiled brackets for every year of a horizon.
+
+    `federal` and `state_brackets` hold (years, brackets) arrays whose row i
+    is year `first_year + i`, as `TaxCalculator` with the same inflation rate
+    would build it.
+    """
+
+    first_year: int
+    filing_status: str
+    state: str
+    inflation_rate: Optional[float]
+    federal: CompiledBrackets
+    state_brackets: CompiledBrackets
+
+    @property
+    def last_year(self) -> int:
+        return self.first_year + len(self.federal.mins) - 1
+
+    def calculate_taxes(
+        self, years: ArrayLike, incomes: ArrayLike
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Federal and state tax for each (year, income) pair, broadcast
+        together."""
+        years = np.asarray(years, dtype=np.int64)
+        if ((years < self.first_year) | (years > self.last_year)).any():
+            raise ValueError(f"Years must be within {self.first_year}-{self.last_year}")
+        rows = years - self.first_year
+        return (
+            _tax_by_row(self.federal, rows, incomes),
+            _tax_by_row(self.state_brackets, rows, incomes),
+        )
+
+
+def _tax_by_row(
+    compiled: CompiledBrackets, rows: np.ndarray, incomes: ArrayLike
+) -> np.ndarray:
+    incomes = np.asarray(incomes, dtype=np.float64)
+    rows, incomes = np.broadcast_arrays(rows, incomes)
+    mins = compiled.mins[rows]
+    # Index of the highest bracket whose min is strictly below the income
+    index = (mins < incomes[..., np.newaxis]).sum(axis=-1) - 1
+    safe = np.maximum(index, 0)[..., np.newaxis]
+    taxes = (
+        np.take_along_axis(compiled.bases[rows], safe, -1)[..., 0]
+        + (incomes - np.take_along_axis(mins, safe, -1)[..., 0])
+        * np.take_along_axis(compiled.rates[rows], safe, -1)[..., 0]
+    )
+    return np.where(index >= 0, taxes, 0.0)
+
+
+@lru_cache(maxsize=64)
+def projected_tax_table(
+    filing_status: str,
+    state: str,
+    first_year: int,
+    last_year: int,
+    inflation_rate: Optional[float] = DEFAULT_INFLATION_RATE,
+) -> ProjectedTaxTable:
+    """Build (once per arguments) the tax table for [first_year, last_year].
+
+    An `inflation_rate` of None keeps `TaxCalculator`'s default of reusing
+    the last configured year unchanged. Tables are shared between callers,
+    so their arrays are read-only.
+    """
+    if last_year < first_year:
+        raise ValueError("Last year must not be before the first year")
+    calculators = [
+        TaxCalculator(year, filing_status, state, inflation_rate)
+        for year in range(first_year, last_year + 1)
+    ]
+    federal = CompiledBrackets.stack([c.federal_compiled for c in calculators])
+    state_brackets = CompiledBrackets.stack([c.state_compiled for c in calculators])
+    for compiled in (federal, state_brackets):
+        for array in (compiled.mins, compiled.bases, compiled.rates):
+            array.flags.writeable = False
+    return ProjectedTaxTable(
+        first_year=first_year,
+        filing_status=filing_status,
+        state=state,
+        inflation_rate=inflation_rate,
+        federal=federal,
+        state_brackets=state_brackets,
+    )
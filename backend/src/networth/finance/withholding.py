@@ -0,0 +1,169 @@
+"""Withholding and true-up estimates for RSU vests.
+
+Vested shares are supplemental wages: employers withhold federal income tax
+at a flat 22% up to $1M of supplemental wages in a calendar year and at 37%
+above it, plus a flat state supplemental rate. The tax actually owed is the
+marginal tax the vests add on top of the year's other income, so the
+difference between the two is what is due (or refunded) at filing time.
+Payroll taxes (Social Security and Medicare) are not included.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Mapping, Optional, Sequence
+
+import numpy as np
+
+from networth.dates import calendar_years
+from networth.finance.compensation_arrays import PackedCompensation
+from networth.finance.taxes import projected_tax_table
+from networth.models.compensation_package import CompensationPackage, StockGrant
+from networth.models.taxes import VestTaxYear
+from networth.models.vesting_events import VestingEventStore
+
+FEDERAL_SUPPLEMENTAL_RATE = 0.22
+FEDERAL_MANDATORY_SUPPLEMENTAL_RATE = 0.37
+FEDERAL_MANDATORY_THRESHOLD = 1_000_000
+
+STATE_SUPPLEMENTAL_RATES = {
+    "CA": 0.1023,
+}
+
+
+def _to_decimal(amount: float) -> Decimal:
+    return Decimal(str(round(float(amount), 2)))
+
+
+@dataclass
+class VestWithholdingSchedule:
+    """Per-vest withholding as parallel arrays ordered by vest date, plus the
+    yearly liability and true-up summary."""
+
+    grant_index: np.ndarray
+    dates: np.ndarray
+    amounts: np.ndarray
+    federal_withheld: np.ndarray
+    state_withheld: np.ndarray
+    years: Dict[int, VestTaxYear] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+
+def estimate_vest_withholding(
+    grants: Sequence[StockGrant],
+    filing_status: str,
+    state: str,
+    other_income: Optional[Mapping[int, float | Decimal]] = None,
+    inflation_rate: Optional[float] = None,
+) -> VestWithholdingSchedule:
+    """Estimate withholding on every vest of `grants` and the tax owed per year.
+
+    Args:
+        grants: Grants whose vesting schedules are evaluated together
+        filing_status: Filing status understood by TaxCalculator
+        state: State understood by TaxCalculator with a supplemental rate
+        other_income: Taxable income per year excluding the vests, used to find
+            the marginal brackets the vests fall into
+        inflation_rate: Indexes tax brackets of years after the last
+            configured year, see `projected_tax_table`
+    """
+    if state not in STATE_SUPPLEMENTAL_RATES:
+        raise ValueError(f"Invalid state: {state}")
+    other_income = other_income or {}
+
+    schedules = [grant.vesting_event_store() for grant in grants]
+    grant_index = np.repeat(
+        np.arange(len(grants)), [len(events) for events in schedules]
+    )
+    events = VestingEventStore.concat(schedules)
+    days = events.days
+    amounts = events.amounts / 100
+
+    order = np.argsort(days, kind="stable")
+    grant_index, days, amounts = grant_index[order], days[order], amounts[order]
+    dates = days.astype("datetime64[D]")
+    vest_years = calendar_years(dates)
+
+    # Supplemental wages already paid earlier in the same year decide which
+    # part of each vest crosses the mandatory withholding threshold.
+    years, first_index = np.unique(vest_years, return_index=True)
+    paid_before = np.cumsum(amounts) - amounts
+    year_slot = np.searchsorted(years, vest_years)
+    paid_before_in_year = paid_before - paid_before[first_index][year_slot]
+    over = np.clip(
+        paid_before_in_year + amounts - FEDERAL_MANDATORY_THRESHOLD, 0, amounts
+    )
+    federal_withheld = (
+        FEDERAL_SUPPLEMENTAL_RATE * (amounts - over)
+        + FEDERAL_MANDATORY_SUPPLEMENTAL_RATE * over
+    )
+    state_withheld = STATE_SUPPLEMENTAL_RATES[state] * amounts
+
+    vest_income = np.bincount(year_slot, weights=amounts, minlength=len(years))
+    federal_by_year = np.bincount(
+        year_slot, weights=federal_withheld, minlength=len(years)
+    )
+    state_by_year = np.bincount(year_slot, weights=state_withheld, minlength=len(years))
+
+    summary = {}
+    if len(years):
+        table = projected_tax_table(
+            filing_status, state, int(years[0]), int(years[-1]), inflation_rate
+        )
+        base = np.array([float(other_income.get(year, 0)) for year in years.tolist()])
+        federal, state_tax = table.calculate_taxes(
+            years, np.stack([base, base + vest_income])
+        )
+        for i, year in enumerate(years.tolist()):
+            summary[year] = VestTaxYear(
+                year=year,
+                vest_income=_to_decimal(vest_income[i]),
+                federal_withheld=_to_decimal(federal_by_year[i]),
+                state_withheld=_to_decimal(state_by_year[i]),
+                federal_tax=_to_decimal(federal[1, i] - federal[0, i]),
+                state_tax=_to_decimal(state_tax[1, i] - state_tax[0, i]),
+            )
+
+    return VestWithholdingSchedule(
+        grant_index=grant_index,
+        dates=dates,
+        amounts=amounts,
+        federal_withheld=federal_withheld,
+        state_withheld=state_withheld,
+        years=summary,
+    )
+
+
+def estimate_package_withholding(
+    package: CompensationPackage,
+    filing_status: str,
+    state: str,
+    inflation_rate: Optional[float] = None,
+    packed: Optional[PackedCompensation] = None,
+) -> VestWithholdingSchedule:
+    """Vest withholding for a package, taking each year's salary, bonuses and
+    signing bonuses as the income the vests are stacked on.
+
+    `packed` is the package's PackedCompensation, if already built.
+    """
+    vest_years = sorted(
+        {
+            vest_date.year
+            for grant in package.stock_grants
+            for vest_date in grant.vesting_event_store().dates()
+        }
+    )
+    packed = packed or PackedCompensation.from_package(package)
+    breakdowns = packed.breakdowns(
+        [date(year, 1, 1) for year in vest_years],
+        [date(year + 1, 1, 1) for year in vest_years],
+    )
+    other_income = {
+        year: breakdown.salary + breakdown.bonuses + breakdown.signing_bonuses
+        for year, breakdown in zip(vest_years, breakdowns)
+    }
+    return estimate_vest_withholding(
+        package.stock_grants, filing_status, state, other_income, inflation_rate
+    )
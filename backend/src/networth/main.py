@@ -1,21 +1,9 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from networth.api.job import router as job_router
 from networth.models import Item, ItemList
 
-app = FastAPI()
-
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-app.include_router(job_router, tags=["jobs"])
-
 # Sample data
 items = [
     Item(id=1, name="Task 1", description="Complete the project", status="pending"),
@@ -24,12 +12,60 @@ items = [
 ]
 
 
-@app.get("/api/items", response_model=ItemList)
 async def get_items():
     return ItemList(items=items)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from networth.api.precompute import scheduler
+
+    scheduler.start()
+    try:
+        yield
+    finally:
+        await scheduler.stop()
+
+
+def create_app() -> FastAPI:
+    """Build the API application.
+
+    Routers are imported here rather than at module level so that importing
+    networth.main stays cheap; run with `uvicorn networth.main:create_app --factory`.
+    """
+    from networth.api.dashboard import router as dashboard_router
+    from networth.api.job import router as job_router
+    from networth.api.projection import router as projection_router
+
+    app = FastAPI(lifespan=lifespan)
+
+    # Configure CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:3000"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    app.include_router(job_router, tags=["jobs"])
+    app.include_router(projection_router, tags=["projections"])
+    app.include_router(dashboard_router, tags=["dashboard"])
+    app.add_api_route("/api/items", get_items, methods=["GET"], response_model=ItemList)
+
+    return app
+
+
+def __getattr__(name: str):
+    # Keep `uvicorn networth.main:app` working without building the app on import
+    if name == "app":
+        app = create_app()
+        globals()["app"] = app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(create_app(), host="0.0.0.0", port=8000)
@@ -0,0 +1,201 @@
+"""Append-only history of changes to a compensation package.
+
+Instead of rewriting the whole package on every edit, a `CompensationLog`
+records each change (a salary change, bonus, stock grant or signing bonus
+being added or edited, or an item being removed) as a small `LogEntry`. The
+package at any version, or as it was at any point in time, is rebuilt from
+the nearest binary snapshot (see `networth.models.snapshot`) by replaying
+the entries after it. A snapshot is taken every `snapshot_interval`
+entries, so no rebuild replays more than that many changes.
+
+Version 0 is the package the log was started from and every entry adds one.
+Entries are independent pydantic models, so a store can persist them one at
+a time, e.g. as JSON lines, and rebuild the log with `from_entries`. The
+API's in-memory `JobStore` does not keep a log yet.
+"""
+
+from bisect import bisect_right
+from datetime import datetime
+from typing import Annotated, Iterable, List, Literal, Optional, Union
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from networth.models.compensation_package import (
+    BaseSalaryChange,
+    BonusPayment,
+    CompensationPackage,
+    SigningBonus,
+    StockGrant,
+)
+from networth.models.snapshot import decode_package, encode_package
+
+DEFAULT_SNAPSHOT_INTERVAL = 32
+
+
+class SalaryChanged(BaseModel):
+    type: Literal["salary_changed"] = "salary_changed"
+    change: BaseSalaryChange
+
+
+class BonusPaid(BaseModel):
+    type: Literal["bonus_paid"] = "bonus_paid"
+    payment: BonusPayment
+
+
+class StockGranted(BaseModel):
+    type: Literal["stock_granted"] = "stock_granted"
+    grant: StockGrant
+
+
+class SigningBonusPaid(BaseModel):
+    type: Literal["signing_bonus_paid"] = "signing_bonus_paid"
+    bonus: SigningBonus
+
+
+class ItemRemoved(BaseModel):
+    """Removes the salary change, bonus, grant or signing bonus with this id."""
+
+    type: Literal["item_removed"] = "item_removed"
+    item_id: UUID
+
+
+CompensationChange = Annotated[
+    Union[SalaryChanged, BonusPaid, StockGranted, SigningBonusPaid, ItemRemoved],
+    Field(discriminator="type"),
+]
+
+
+class LogEntry(BaseModel):
+    version: int
+    recorded_at: datetime
+    change: CompensationChange
+
+
+# Package list and change field of each kind of item
+_ITEMS = {
+    SalaryChanged: ("base_salary_history", "change"),
+    BonusPaid: ("bonus_payments", "payment"),
+    StockGranted: ("stock_grants", "grant"),
+    SigningBonusPaid: ("signing_bonuses", "bonus"),
+}
+
+
+def apply_change(
+    package: CompensationPackage, change: CompensationChange, recorded_at: datetime
+) -> None:
+    """Apply `change` to `package` in place.
+
+    Added items replace an existing item with the same id, which is how
+    edits are recorded. Raises ValueError when removing an unknown item.
+    """
+    if isinstance(change, ItemRemoved):
+        for name, _ in _ITEMS.values():
+            items = getattr(package, name)
+            kept = [item for item in items if item.id != change.item_id]
+            if len(kept) != len(items):
+                setattr(package, name, kept)
+                break
+        else:
+            raise ValueError(f"No item with id {change.item_id}")
+    else:
+        name, field = _ITEMS[type(change)]
+        # Copied so that packages never share items with the log
+        item = getattr(change, field).model_copy(deep=True)
+        items = getattr(package, name)
+        ids = [existing.id for existing in items]
+        if item.id in ids:
+            items[ids.index(item.id)] = item
+        else:
+            items.append(item)
+    package.updated_at = recorded_at
+
+
+class CompensationLog:
+    """Versioned history of one compensation package."""
+
+    def __init__(
+        self,
+        package: CompensationPackage,
+        snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL,
+    ):
+        if snapshot_interval < 1:
+            raise ValueError("Snapshot interval must be at least 1")
+        self.snapshot_interval = snapshot_interval
+        self.entries: List[LogEntry] = []
+        self._times: List[datetime] = []
+        self.snapshot_versions: List[int] = [0]
+        self._snapshots: List[bytes] = [encode_package(package)]
+        # The latest state, kept up to date so appends don't rebuild it
+        self._head = decode_package(self._snapshots[0])
+
+    @classmethod
+    def from_entries(
+        cls,
+        package: CompensationPackage,
+        entries: Iterable[LogEntry],
+        snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL,
+    ) -> "CompensationLog":
+        """Rebuild a log from its initial package and stored entries."""
+        log = cls(package, snapshot_interval)
+        for entry in entries:
+            if entry.version != log.version + 1:
+                raise ValueError(
+                    f"Expected version {log.version + 1}, got {entry.version}"
+                )
+            log.append(entry.change, entry.recorded_at)
+        return log
+
+    @property
+    def version(self) -> int:
+        return len(self.entries)
+
+    def append(
+        self, change: CompensationChange, recorded_at: Optional[datetime] = None
+    ) -> LogEntry:
+        """Record a change; returns its entry. Entries must be recorded in
+        time order.
+
+        The change is copied, so later edits to the caller's object don't
+        rewrite history.
+        """
+        recorded_at = recorded_at or datetime.now()
+        if self.entries and recorded_at < self.entries[-1].recorded_at:
+            raise ValueError("Changes must be recorded in time order")
+        change = change.model_copy(deep=True)
+        apply_change(self._head, change, recorded_at)
+        entry = LogEntry(
+            version=self.version + 1, recorded_at=recorded_at, change=change
+        )
+        self.entries.append(entry)
+        self._times.append(recorded_at)
+        if entry.version % self.snapshot_interval == 0:
+            self.snapshot_versions.append(entry.version)
+            self._snapshots.append(encode_package(self._head))
+        return entry
+
+    def state_at(self, version: Optional[int] = None) -> CompensationPackage:
+        """The package after `version` changes (default: all of them).
+
+        Every call returns a new package that can be changed freely.
+        """
+        version = self.version if version is None else version
+        if not 0 <= version <= self.version:
+            raise ValueError(f"Version {version} is not in 0..{self.version}")
+        i = bisect_right(self.snapshot_versions, version) - 1
+        package = decode_package(self._snapshots[i])
+        for entry in self.entries[self.snapshot_versions[i] : version]:
+            apply_change(package, entry.change, entry.recorded_at)
+        return package
+
+    def version_at(self, when: datetime) -> int:
+        """The latest version recorded at or before `when`."""
+        return bisect_right(self._times, when)
+
+    def as_of(self, when: datetime) -> CompensationPackage:
+        """The package as it was at `when`."""
+        return self.state_at(self.version_at(when))
+
+    def entries_since(self, version: int) -> List[LogEntry]:
+        """Entries after `version`, e.g. to sync a replica."""
+        return self.entries[max(version, 0) :]
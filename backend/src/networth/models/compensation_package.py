@@ -1,9 +1,12 @@
-from datetime import date, datetime, timedelta
-from typing import List, Optional
+from datetime import date
+from typing import List, Optional, Sequence, Tuple
 from typing_extensions import override
+import numpy as np
+from networth.dates import add_months, to_days
 from networth.models.base import IncomeProvider, NWBase
 from networth.models.currency import Currency
-from pydantic import BaseModel, Field
+from networth.models.vesting_events import VestingEvent, VestingEventStore
+from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
 from decimal import Decimal
 
@@ -36,13 +39,10 @@ class VestingScheduleType(str, Enum):
             raise ValueError(f"Invalid vesting schedule type: {self}")
 
 
-class VestingEvent(NWBase):
-    date: date
-    num_shares: int
-    amount: Currency
-
-
 class StockGrant(NWBase):
+    # Assigned lists of vesting events are converted to a VestingEventStore
+    model_config = ConfigDict(validate_assignment=True)
+
     grant_date: date
     total_shares: int
     price_per_share: Currency
@@ -50,7 +50,8 @@ class StockGrant(NWBase):
     vesting_start_date: date
     vesting_period_months: int  # Total vesting period in months
     cliff_months: int = 0  # Cliff period in months
-    vesting_events: List[VestingEvent] = Field(default_factory=list)
+    # Only used by CUSTOM grants; accepts and serializes as a list of events
+    vesting_events: VestingEventStore = Field(default_factory=VestingEventStore)
 
     def __str__(self) -> str:
         return f"""
@@ -64,51 +65,48 @@ Stock Grant:
     Cliff Months: {self.cliff_months}
 """
 
-    def calculate_vesting_schedule(self) -> List[VestingEvent]:
-        events = []
+    def vesting_event_store(self) -> VestingEventStore:
+        """The vesting schedule in columnar form."""
         if self.vesting_schedule_type == VestingScheduleType.CUSTOM:
             return self.vesting_events
 
+        months_worked = np.arange(
+            max(self.cliff_months, 1),
+            self.vesting_period_months + 1,
+            self.vesting_schedule_type.months,
+        )
+        if not len(months_worked):
+            return VestingEventStore()
+
         # Skip vesting during cliff period
         months_after_cliff = self.vesting_period_months - max(1, self.cliff_months)
         shares_vested_at_cliff = (
             self.total_shares * max(1, self.cliff_months) / self.vesting_period_months
         )
         shares_vested_after_cliff = self.total_shares - shares_vested_at_cliff
-        shares_per_period = int(
-            shares_vested_after_cliff
-            / self.vesting_schedule_type.num_periods(months_after_cliff)
+        num_periods = self.vesting_schedule_type.num_periods(months_after_cliff)
+        # Without a whole period after the cliff, only the cliff vest remains
+        shares_per_period = (
+            int(shares_vested_after_cliff / num_periods) if num_periods else 0
         )
 
-        # Calculate monthly vesting dates
-        for num_months_worked in range(
-            max(self.cliff_months, 1),
-            self.vesting_period_months + 1,
-            self.vesting_schedule_type.months,
-        ):
-            vest_date = date(
-                self.vesting_start_date.year
-                + (self.vesting_start_date.month + num_months_worked - 1) // 12,
-                ((self.vesting_start_date.month + num_months_worked - 1) % 12) + 1,
-                self.vesting_start_date.day,
-            )
-
-            # For cliff vesting, all accumulated shares vest at once
-            shares = shares_per_period
-            if num_months_worked == self.cliff_months or (
-                num_months_worked == 0 and self.cliff_months == 0
-            ):
-                shares = shares_vested_at_cliff
-
-            events.append(
-                VestingEvent(
-                    date=vest_date,
-                    amount=self.price_per_share.multiply(int(shares)),
-                    num_shares=int(shares),
-                )
-            )
+        # For cliff vesting, all accumulated shares vest at once
+        shares = np.where(
+            months_worked == self.cliff_months,
+            int(shares_vested_at_cliff),
+            shares_per_period,
+        )
+        return VestingEventStore.create(
+            dates=add_months(self.vesting_start_date, months_worked),
+            shares=shares,
+            amounts=self.price_per_share.amount * shares,
+            code=self.price_per_share.code,
+        )
 
-        return events
+    def calculate_vesting_schedule(self) -> Sequence[VestingEvent]:
+        if self.vesting_schedule_type == VestingScheduleType.CUSTOM:
+            return self.vesting_events
+        return self.vesting_event_store().to_events()
 
 
 class BaseSalaryChange(NWBase):
@@ -158,6 +156,24 @@ Signing Bonus:
 """
 
 
+class CompensationBreakdown(BaseModel):
+    salary: Decimal
+    bonuses: Decimal
+    stock_grants: Decimal
+    signing_bonuses: Decimal
+
+    @property
+    def total(self) -> Decimal:
+        # Same summation order as CompensationPackage.calculate_total_compensation
+        return (
+            Decimal(0)
+            + self.salary
+            + self.bonuses
+            + self.stock_grants
+            + self.signing_bonuses
+        )
+
+
 class CompensationPackage(NWBase, IncomeProvider):
     employee_id: str
     start_date: date
@@ -184,30 +200,22 @@ Compensation Package:
     @override
     def calculate_total_income(self, start_date: date, end_date: date) -> Decimal:
         """Total salary is based on a period where end_date is non-inclusive."""
-        total = 0
-        for salary in sorted(self.base_salary_history, key=lambda x: x.effective_date):
-            if salary.effective_date < end_date:
-                # Calculate prorated salary for the period
-                period_start = max(start_date, salary.effective_date)
-                next_salary = next(
-                    (
-                        s
-                        for s in self.base_salary_history
-                        if s.effective_date > salary.effective_date
-                    ),
-                    None,
-                )
-                period_end = min(
-                    end_date,
-                    (
-                        next_salary.effective_date - timedelta(days=1)
-                        if next_salary
-                        else end_date
-                    ),
-                )
-
-                days_in_period = (period_end - period_start).days - 1
-                total += salary.annual_amount.multiply(days_in_period / 365).amount
+        salaries = sorted(self.base_salary_history, key=lambda x: x.effective_date)
+        effective_days = to_days(s.effective_date for s in salaries)
+        annual_amounts = np.array([s.annual_amount.amount for s in salaries], np.int64)
+        start_day, end_day = to_days([start_date, end_date])
+
+        # Each salary runs until the day before the first strictly later one
+        next_index = np.searchsorted(effective_days, effective_days, side="right")
+        has_next = next_index < len(salaries)
+        next_days = np.append(effective_days, 0)[next_index]
+        period_start = np.maximum(start_day, effective_days)
+        period_end = np.where(has_next, np.minimum(end_day, next_days - 1), end_day)
+
+        # Salaries that ended before the period contribute nothing
+        days_in_period = np.maximum(0, period_end - period_start - 1)
+        prorated = np.rint(annual_amounts * (days_in_period / 365))
+        total = int(prorated[effective_days < end_day].sum())
 
         return Decimal(total / 100)
 
@@ -224,12 +232,11 @@ Compensation Package:
         the vesting date for work done prior to the vest date."""
         total = 0
         for grant in self.stock_grants:
-            vesting_schedule = grant.calculate_vesting_schedule()
-            total += sum(
-                event.amount.amount
-                for event in vesting_schedule
-                if start_date <= event.date <= end_date
+            events = grant.vesting_event_store()
+            in_period = (events.ordinals >= start_date.toordinal()) & (
+                events.ordinals <= end_date.toordinal()
             )
+            total += int(events.amounts[in_period].sum())
         return Decimal(total / 100)
 
     def calculate_total_signing_bonuses(
@@ -258,3 +265,34 @@ Compensation Package:
         total += self.calculate_total_signing_bonuses(start_date, end_date)
 
         return total
+
+    def calculate_compensation_breakdown(
+        self, start_date: date, end_date: date
+    ) -> CompensationBreakdown:
+        """Per-component totals using the same date semantics as the individual
+        calculate_total_* methods."""
+        return CompensationBreakdown(
+            salary=self.calculate_total_income(start_date, end_date),
+            bonuses=self.calculate_total_bonuses(start_date, end_date),
+            stock_grants=self.calculate_total_stock_grants(start_date, end_date),
+            signing_bonuses=self.calculate_total_signing_bonuses(start_date, end_date),
+        )
+
+    def calculate_compensation_breakdowns(
+        self, windows: Sequence[Tuple[date, date]]
+    ) -> List[CompensationBreakdown]:
+        """`calculate_compensation_breakdown` for every `(start_date, end_date)`
+        window, with the same date semantics and rounding.
+
+        The events are sorted and summed once, and every window is answered
+        by searching the cumulative sums, so this is much faster than calling
+        the single-window methods in a loop.
+        """
+        # Imported here because the finance package depends on this module
+        from networth.finance.compensation_arrays import PackedCompensation
+
+        windows = list(windows)
+        if not windows:
+            return []
+        starts, ends = zip(*windows)
+        return PackedCompensation.from_package(self).breakdowns(starts, ends)
@@ -2,8 +2,10 @@ from datetime import date, timedelta
 from typing import Optional
 import typing
 from typing_extensions import Self
+import numpy as np
 from pydantic import field_validator, model_validator
 
+from networth.dates import date_range
 from networth.models.base import NWBase
 from networth.models.currency import Currency
 
@@ -43,6 +45,15 @@ class PeriodicIncomeSource(BaseIncomeSource):
     def per_year_amt(self) -> Currency:
         return self.amt.multiply(365 / self.period.days)
 
+    def payment_dates(self, start_date: date, end_date: date) -> np.ndarray:
+        """`datetime64[D]` dates in [start_date, end_date) on which `amt` is
+        paid: every `period` from the income start date through its end date."""
+        stop = end_date
+        if self.income_end_date is not None:
+            stop = min(stop, self.income_end_date + timedelta(days=1))
+        dates = date_range(self.income_start_date, stop, self.period.days)
+        return dates[dates >= np.datetime64(start_date, "D")]
+
 
 class ModifiablePeriodicIncomeSource(BaseIncomeSource):
     """A contiguous period of time with a recurring income. The amount may change over time.
@@ -69,6 +80,12 @@ class ModifiablePeriodicIncomeSource(BaseIncomeSource):
                 raise ValueError("Sources must be contiguous")
         return sources
 
+    def payment_dates(self, start_date: date, end_date: date) -> np.ndarray:
+        return np.concatenate(
+            [np.empty(0, "datetime64[D]")]
+            + [source.payment_dates(start_date, end_date) for source in self.sources]
+        )
+
     def add_source(self, source: PeriodicIncomeSource) -> Self:
         self.sources[-1].income_end_date = source.income_start_date - timedelta(days=1)
         self.sources.append(source)
@@ -4,7 +4,7 @@ from typing_extensions import override
 from typing import Optional
 from networth.models.compensation_package import CompensationPackage
 from typing_extensions import Self
-from pydantic import Field, model_validator
+from pydantic import BaseModel, Field, model_validator
 
 from networth.models.base import IncomeProvider, NWBase
 
@@ -27,3 +27,8 @@ Job:
 
 class Job(JobBase):
     pass
+
+
+class JobCreate(BaseModel):
+    name: str = Field(..., description="Human readable name for this job")
+    comp_package: CompensationPackage
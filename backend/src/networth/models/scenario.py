@@ -1,10 +1,12 @@
 from pydantic import BaseModel, Field, validator
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional
 from datetime import date
 from enum import Enum
-import pandas as pd
 from decimal import Decimal
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class ExpenseCategory(str, Enum):
     HOUSING = "housing"
@@ -16,28 +18,82 @@ class ExpenseCategory(str, Enum):
     OTHER = "other"
 
 
+class AmountChange(BaseModel):
+    """A step change in an expense or income amount, e.g. a mortgage being paid
+    off or a child starting college."""
+
+    year: int = Field(ge=0)  # Projection year the new amount starts in
+    amount: Decimal = Field(ge=0)  # Same period and terms as the item's amount
+
+
+def annual_schedule(
+    amount: Decimal,
+    is_monthly: bool,
+    growth_rate: Decimal,
+    changes: List[AmountChange],
+    years: int,
+) -> List[Decimal]:
+    """Annual amounts for projection years 0..years.
+
+    Each year uses the latest change that has started (or `amount` before
+    any), indexed by `growth_rate` compounded from year 0, so change amounts
+    are in start-year terms.
+    """
+    steps = sorted(changes, key=lambda change: change.year)
+    schedule = []
+    current = amount
+    for year in range(years + 1):
+        while steps and steps[0].year <= year:
+            current = steps.pop(0).amount
+        annual = current * 12 if is_monthly else current
+        if growth_rate:
+            annual *= (1 + growth_rate) ** year
+        schedule.append(annual)
+    return schedule
+
+
 class Expense(BaseModel):
     category: ExpenseCategory
     amount: Decimal = Field(ge=0)
     is_monthly: bool = True
     description: Optional[str] = None
+    growth_rate: Decimal = Field(default=Decimal(0), ge=-1)  # e.g. inflation
+    changes: List[AmountChange] = []
 
     @property
     def annual_amount(self) -> Decimal:
         return self.amount * 12 if self.is_monthly else self.amount
 
+    def annual_amounts(self, years: int) -> List[Decimal]:
+        return annual_schedule(
+            self.amount, self.is_monthly, self.growth_rate, self.changes, years
+        )
+
 
 class Income(BaseModel):
     source: str
     amount: Decimal = Field(ge=0)
     is_monthly: bool = True
     tax_rate: Decimal = Field(ge=0, le=1)
+    growth_rate: Decimal = Field(default=Decimal(0), ge=-1)  # e.g. raises
+    changes: List[AmountChange] = []
 
     @property
     def annual_amount(self) -> Decimal:
         base_amount = self.amount * 12 if self.is_monthly else self.amount
         return base_amount * (1 - self.tax_rate)
 
+    def gross_annual_amounts(self, years: int) -> List[Decimal]:
+        return annual_schedule(
+            self.amount, self.is_monthly, self.growth_rate, self.changes, years
+        )
+
+    def annual_amounts(self, years: int) -> List[Decimal]:
+        """After-tax amounts per year, like `annual_amount`."""
+        return [
+            amount * (1 - self.tax_rate) for amount in self.gross_annual_amounts(years)
+        ]
+
 
 class Investment(BaseModel):
     name: str
@@ -70,18 +126,30 @@ class FinancialScenario(BaseModel):
 
     @property
     def annual_net_income(self) -> Decimal:
-        total_income = sum(income.annual_amount for income in self.incomes)
-        total_expenses = sum(expense.annual_amount for expense in self.expenses)
-        return total_income - total_expenses
+        return self.annual_net_incomes(0)[0]
+
+    def annual_net_incomes(self, years: int) -> List[Decimal]:
+        """Net income for projection years 0..years."""
+        incomes = [income.annual_amounts(years) for income in self.incomes]
+        expenses = [expense.annual_amounts(years) for expense in self.expenses]
+        return [
+            sum(income[year] for income in incomes)
+            - sum(expense[year] for expense in expenses)
+            for year in range(years + 1)
+        ]
 
     def project_net_worth(self, years: int) -> Dict[int, Decimal]:
+        # Every schedule is evaluated once for the whole horizon
+        investment_values = [inv.project_value(years) for inv in self.investments]
+        net_incomes = self.annual_net_incomes(years)
+
         net_worth = {}
+        savings = Decimal(0)
         for year in range(years + 1):
-            investment_values = sum(
-                inv.project_value(year)[year] for inv in self.investments
+            net_worth[year] = (
+                sum(values[year] for values in investment_values) + savings
             )
-            savings = self.annual_net_income * year
-            net_worth[year] = investment_values + savings
+            savings += net_incomes[year]
         return net_worth
 
 
@@ -89,8 +157,11 @@ class FinancialModel(BaseModel):
     base_scenario: FinancialScenario
     alternative_scenarios: Dict[str, FinancialScenario] = {}
 
-    def compare_scenarios(self, years: int) -> pd.DataFrame:
+    def compare_scenarios(self, years: int) -> "pd.DataFrame":
         """Compare net worth projections across all scenarios."""
+        # pandas is slow to import and only needed here
+        import pandas as pd
+
         data = {"base": list(self.base_scenario.project_net_worth(years).values())}
 
         for name, scenario in self.alternative_scenarios.items():
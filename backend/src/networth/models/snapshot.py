@@ -0,0 +1,362 @@
+"""Compact binary snapshots of jobs and compensation packages.
+
+A snapshot starts with a magic number, a format version and the kind of the
+root object, followed by the object tree in a fixed field order:
+
+- UUIDs as their raw 16 bytes
+- datetimes as int64 microseconds of wall-clock time since 1970-01-01 plus an
+  int32 UTC offset in seconds (or a marker for naive and missing values)
+- dates as int32 proleptic Gregorian ordinals
+- Decimals and strings as length-prefixed UTF-8, so values round-trip exactly
+- Currency as a one-byte code index and an int64 amount
+- vesting events as packed per-field arrays rather than one record each, with
+  a single UTC offset per timestamp column when every event shares it
+
+Decoding rebuilds the models with `model_construct`: the values were
+validated when the models were created, so they are not validated again.
+Vesting event columns are read straight into a `VestingEventStore`. All
+integers are little-endian.
+"""
+
+from datetime import date
+from decimal import Decimal, InvalidOperation
+import struct
+from typing import Callable, Optional, Sequence, TypeVar
+from uuid import UUID
+
+import numpy as np
+
+from networth.models.compensation_package import (
+    BaseSalaryChange,
+    BonusPayment,
+    CompensationPackage,
+    SigningBonus,
+    StockGrant,
+    VestingScheduleType,
+)
+from networth.models.currency import Currency
+from networth.models.job import Job
+from networth.models.vesting_events import (
+    CURRENCY_CODES,
+    TIMESTAMP_FIELDS,
+    VestingEventStore,
+    datetime_from_parts,
+    datetime_to_parts,
+)
+
+MAGIC = b"NWSN"
+SNAPSHOT_VERSION = 1
+
+KIND_JOB = 1
+KIND_PACKAGE = 2
+
+# Stored by position like CURRENCY_CODES, so new types must only be appended
+SCHEDULE_TYPES = tuple(VestingScheduleType)
+
+_HEADER = struct.Struct("<4sBB")
+_NO_STRING = 0xFFFFFFFF
+
+
+class _Writer:
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def pack(self, fmt: str, *values) -> None:
+        self.buffer += struct.pack("<" + fmt, *values)
+
+    def string(self, value: Optional[str]) -> None:
+        if value is None:
+            self.pack("I", _NO_STRING)
+            return
+        encoded = value.encode()
+        self.pack("I", len(encoded))
+        self.buffer += encoded
+
+    def decimal(self, value: Optional[Decimal]) -> None:
+        self.string(None if value is None else str(value))
+
+    def date(self, value: date) -> None:
+        self.pack("i", value.toordinal())
+
+    def currency(self, value: Currency) -> None:
+        self.pack("Bq", CURRENCY_CODES.index(value.code), value.amount)
+
+    def base(self, model) -> None:
+        self.buffer += model.id.bytes
+        self.pack(
+            "qiqiqi",
+            *datetime_to_parts(model.created_at),
+            *datetime_to_parts(model.updated_at),
+            *datetime_to_parts(model.deleted_at),
+        )
+
+    def items(self, items: list, write: Callable) -> None:
+        self.pack("I", len(items))
+        for item in items:
+            write(item)
+
+
+T = TypeVar("T")
+
+
+def _lookup(table: Sequence[T], index: int, name: str) -> T:
+    if index >= len(table):
+        raise ValueError(f"Unknown {name} index {index} in snapshot")
+    return table[index]
+
+
+class _Reader:
+    def __init__(self, data: bytes, offset: int = 0):
+        self.data = memoryview(data)
+        self.offset = offset
+
+    def unpack(self, fmt: str) -> tuple:
+        fmt = "<" + fmt
+        try:
+            values = struct.unpack_from(fmt, self.data, self.offset)
+        except struct.error as e:
+            raise ValueError("Truncated snapshot") from e
+        self.offset += struct.calcsize(fmt)
+        return values
+
+    def bytes(self, size: int) -> bytes:
+        value = bytes(self.data[self.offset : self.offset + size])
+        if len(value) != size:
+            raise ValueError("Truncated snapshot")
+        self.offset += size
+        return value
+
+    def end(self) -> None:
+        if self.offset != len(self.data):
+            raise ValueError(
+                f"Snapshot has {len(self.data) - self.offset} trailing bytes"
+            )
+
+    def string(self) -> Optional[str]:
+        (size,) = self.unpack("I")
+        if size == _NO_STRING:
+            return None
+        return self.bytes(size).decode()
+
+    def decimal(self) -> Optional[Decimal]:
+        value = self.string()
+        if value is None:
+            return None
+        try:
+            return Decimal(value)
+        except InvalidOperation as e:
+            raise ValueError(f"Invalid decimal in snapshot: {value!r}") from e
+
+    def date(self) -> date:
+        return date.fromordinal(self.unpack("i")[0])
+
+    def currency(self) -> Currency:
+        code, amount = self.unpack("Bq")
+        return Currency.model_construct(
+            code=_lookup(CURRENCY_CODES, code, "currency"), amount=amount
+        )
+
+    def base(self) -> dict:
+        id = UUID(bytes=self.bytes(16))
+        parts = self.unpack("qiqiqi")
+        return dict(
+            id=id,
+            created_at=datetime_from_parts(*parts[0:2]),
+            updated_at=datetime_from_parts(*parts[2:4]),
+            deleted_at=datetime_from_parts(*parts[4:6]),
+        )
+
+    def items(self, read: Callable) -> list:
+        (count,) = self.unpack("I")
+        return [read() for _ in range(count)]
+
+
+def _write_vesting_events(writer: _Writer, events: VestingEventStore) -> None:
+    count = len(events)
+    writer.pack("I", count)
+    if not count:
+        return
+    writer.buffer += events.ids.tobytes()
+    for micros, offsets in zip(events.timestamps, events.offsets):
+        writer.buffer += micros.astype("<i8").tobytes()
+        if (offsets == offsets[0]).all():
+            writer.pack("Bi", 1, offsets[0])
+        else:
+            writer.pack("B", 0)
+            writer.buffer += offsets.astype("<i4").tobytes()
+    writer.buffer += events.ordinals.astype("<i4").tobytes()
+    writer.buffer += events.shares.astype("<i8").tobytes()
+    writer.buffer += events.amounts.astype("<i8").tobytes()
+    writer.buffer += events.codes.tobytes()
+
+
+def _read_vesting_events(reader: _Reader) -> VestingEventStore:
+    (count,) = reader.unpack("I")
+
+    def column(dtype: str) -> np.ndarray:
+        return np.frombuffer(reader.bytes(count * np.dtype(dtype).itemsize), dtype)
+
+    if not count:
+        return VestingEventStore()
+    ids = np.frombuffer(reader.bytes(16 * count), np.uint8)
+    timestamps, offsets = [], []
+    for _ in TIMESTAMP_FIELDS:
+        timestamps.append(column("<i8"))
+        (shared,) = reader.unpack("B")
+        if shared:
+            offsets.append(np.full(count, reader.unpack("i")[0]))
+        else:
+            offsets.append(column("<i4"))
+    events = VestingEventStore(
+        ids=ids,
+        timestamps=timestamps,
+        offsets=offsets,
+        ordinals=column("<i4"),
+        shares=column("<i8"),
+        amounts=column("<i8"),
+        codes=column("u1"),
+    )
+    # Events are only built on access, so check their currencies up front
+    _lookup(CURRENCY_CODES, int(events.codes.max()), "currency")
+    return events
+
+
+def _write_package(writer: _Writer, package: CompensationPackage) -> None:
+    writer.base(package)
+    writer.string(package.employee_id)
+    writer.date(package.start_date)
+
+    def salary(change: BaseSalaryChange):
+        writer.base(change)
+        writer.date(change.effective_date)
+        writer.currency(change.annual_amount)
+        writer.decimal(change.bonus_percentage)
+        writer.string(change.reason)
+
+    def bonus(payment: BonusPayment):
+        writer.base(payment)
+        writer.date(payment.date)
+        writer.currency(payment.amount)
+        writer.string(payment.type)
+        writer.string(payment.description)
+
+    def grant(grant: StockGrant):
+        writer.base(grant)
+        writer.date(grant.grant_date)
+        writer.pack("q", grant.total_shares)
+        writer.currency(grant.price_per_share)
+        writer.pack("B", SCHEDULE_TYPES.index(grant.vesting_schedule_type))
+        writer.date(grant.vesting_start_date)
+        writer.pack("qq", grant.vesting_period_months, grant.cliff_months)
+        _write_vesting_events(writer, grant.vesting_events)
+
+    def signing(bonus: SigningBonus):
+        writer.base(bonus)
+        writer.date(bonus.payment_date)
+        writer.currency(bonus.amount)
+        writer.string(bonus.conditions)
+
+    writer.items(package.base_salary_history, salary)
+    writer.items(package.bonus_payments, bonus)
+    writer.items(package.stock_grants, grant)
+    writer.items(package.signing_bonuses, signing)
+
+
+def _read_package(reader: _Reader) -> CompensationPackage:
+    base = reader.base()
+    employee_id = reader.string()
+    start_date = reader.date()
+
+    def salary() -> BaseSalaryChange:
+        return BaseSalaryChange.model_construct(
+            **reader.base(),
+            effective_date=reader.date(),
+            annual_amount=reader.currency(),
+            bonus_percentage=reader.decimal(),
+            reason=reader.string(),
+        )
+
+    def bonus() -> BonusPayment:
+        return BonusPayment.model_construct(
+            **reader.base(),
+            date=reader.date(),
+            amount=reader.currency(),
+            type=reader.string(),
+            description=reader.string(),
+        )
+
+    def grant() -> StockGrant:
+        fields = reader.base()
+        fields["grant_date"] = reader.date()
+        (fields["total_shares"],) = reader.unpack("q")
+        fields["price_per_share"] = reader.currency()
+        fields["vesting_schedule_type"] = _lookup(
+            SCHEDULE_TYPES, reader.unpack("B")[0], "vesting schedule type"
+        )
+        fields["vesting_start_date"] = reader.date()
+        fields["vesting_period_months"], fields["cliff_months"] = reader.unpack("qq")
+        fields["vesting_events"] = _read_vesting_events(reader)
+        return StockGrant.model_construct(**fields)
+
+    def signing() -> SigningBonus:
+        return SigningBonus.model_construct(
+            **reader.base(),
+            payment_date=reader.date(),
+            amount=reader.currency(),
+            conditions=reader.string(),
+        )
+
+    return CompensationPackage.model_construct(
+        **base,
+        employee_id=employee_id,
+        start_date=start_date,
+        base_salary_history=reader.items(salary),
+        bonus_payments=reader.items(bonus),
+        stock_grants=reader.items(grant),
+        signing_bonuses=reader.items(signing),
+    )
+
+
+def _read_header(data: bytes, kind: int) -> _Reader:
+    if len(data) < _HEADER.size:
+        raise ValueError("Truncated snapshot")
+    magic, version, actual_kind = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {version}")
+    if actual_kind != kind:
+        raise ValueError(f"Snapshot holds kind {actual_kind}, expected {kind}")
+    return _Reader(data, _HEADER.size)
+
+
+def encode_package(package: CompensationPackage) -> bytes:
+    writer = _Writer()
+    writer.buffer += _HEADER.pack(MAGIC, SNAPSHOT_VERSION, KIND_PACKAGE)
+    _write_package(writer, package)
+    return bytes(writer.buffer)
+
+
+def decode_package(data: bytes) -> CompensationPackage:
+    reader = _read_header(data, KIND_PACKAGE)
+    package = _read_package(reader)
+    reader.end()
+    return package
+
+
+def encode_job(job: Job) -> bytes:
+    writer = _Writer()
+    writer.buffer += _HEADER.pack(MAGIC, SNAPSHOT_VERSION, KIND_JOB)
+    writer.base(job)
+    writer.string(job.name)
+    _write_package(writer, job.comp_package)
+    return bytes(writer.buffer)
+
+
+def decode_job(data: bytes) -> Job:
+    reader = _read_header(data, KIND_JOB)
+    base = reader.base()
+    name = reader.string()
+    comp_package = _read_package(reader)
+    reader.end()
+    return Job.model_construct(**base, name=name, comp_package=comp_package)
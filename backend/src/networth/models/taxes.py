@@ -12,3 +12,23 @@ class TaxBill(BaseModel):
         if self.federal < 0 or self.state < 0:
             raise ValueError("Taxes cannot be negative")
         return self
+
+
+class VestTaxYear(BaseModel):
+    """Estimated withholding and tax owed on stock vests in one tax year."""
+
+    year: int
+    vest_income: Decimal
+    federal_withheld: Decimal
+    state_withheld: Decimal
+    federal_tax: Decimal
+    state_tax: Decimal
+
+    @property
+    def total_withheld(self) -> Decimal:
+        return self.federal_withheld + self.state_withheld
+
+    @property
+    def true_up(self) -> Decimal:
+        """Tax still owed on the vests (negative when over-withheld)."""
+        return self.federal_tax + self.state_tax - self.total_withheld
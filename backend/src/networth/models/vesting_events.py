@@ -0,0 +1,329 @@
+"""Columnar storage for vesting events.
+
+A `VestingEvent` model costs well over a kilobyte once its UUID, datetimes and
+nested `Currency` are counted, and custom grants (ESPPs, long tenures) can
+carry thousands of them. `VestingEventStore` keeps the same information as
+one numpy array per field, about 70 bytes per event, and only builds
+`VestingEvent` objects when they are accessed, e.g. when a grant is
+serialized for the API. Generated vesting schedules are built in the same
+form, and finance code reads the columns directly.
+
+The store otherwise behaves like the list of events it replaced: events can
+be appended, inserted, assigned and deleted, and each write rebuilds the
+columns.
+
+Datetimes are stored as int64 microseconds of wall-clock time since
+1970-01-01 plus an int32 UTC offset in seconds, or a marker for naive and
+missing values.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+import os
+from typing import Iterable, Iterator, List, MutableSequence, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+from numpy.typing import ArrayLike
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema
+
+from networth.dates import EPOCH_ORDINAL, as_dates
+from networth.models.base import NWBase
+from networth.models.currency import Currency, CurrencyCode
+
+# Codes are stored by position, so new codes must only ever be appended
+CURRENCY_CODES = tuple(CurrencyCode)
+
+# UTC offsets are within +/-24h, so these can't collide with a real offset
+NAIVE_OFFSET = -(2**31)
+MISSING_OFFSET = NAIVE_OFFSET + 1
+
+TIMESTAMP_FIELDS = ("created_at", "updated_at", "deleted_at")
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def datetime_to_parts(value: Optional[datetime]) -> Tuple[int, int]:
+    """Wall-clock microseconds since the epoch and UTC offset in seconds."""
+    if value is None:
+        return 0, MISSING_OFFSET
+    micros = (value.replace(tzinfo=None) - _EPOCH) // _MICROSECOND
+    offset = value.utcoffset()
+    return micros, NAIVE_OFFSET if offset is None else int(offset.total_seconds())
+
+
+def datetime_from_parts(micros: int, offset: int) -> Optional[datetime]:
+    if offset == MISSING_OFFSET:
+        return None
+    value = _EPOCH + timedelta(microseconds=micros)
+    if offset == NAIVE_OFFSET:
+        return value
+    return value.replace(tzinfo=timezone(timedelta(seconds=offset)))
+
+
+class VestingEvent(NWBase):
+    date: date
+    num_shares: int
+    amount: Currency
+
+
+def _frozen(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+class VestingEventStore(MutableSequence[VestingEvent]):
+    """A list of vesting events stored column-wise.
+
+    Indexing and iteration build new `VestingEvent` objects, so changes made
+    to an event in place are not stored; assign the changed event back
+    instead. Writes replace the (read-only) column arrays rather than
+    modifying them, so stores sharing columns never see each other's changes.
+
+    Attributes:
+        ids: uint8 array with shape (n, 16) of raw UUID bytes
+        timestamps: int64 array with shape (3, n) of microseconds for
+            TIMESTAMP_FIELDS
+        offsets: int32 array with shape (3, n) of UTC offsets for
+            TIMESTAMP_FIELDS
+        ordinals: int32 proleptic Gregorian ordinals of the vest dates
+        shares: int64 number of shares vesting
+        amounts: int64 value of the vest in minimum currency units
+        codes: uint8 index of the value's currency in CURRENCY_CODES
+    """
+
+    __slots__ = (
+        "ids",
+        "timestamps",
+        "offsets",
+        "ordinals",
+        "shares",
+        "amounts",
+        "codes",
+    )
+
+    def __init__(
+        self,
+        ids: Optional[np.ndarray] = None,
+        timestamps: Optional[np.ndarray] = None,
+        offsets: Optional[np.ndarray] = None,
+        ordinals: Optional[np.ndarray] = None,
+        shares: Optional[np.ndarray] = None,
+        amounts: Optional[np.ndarray] = None,
+        codes: Optional[np.ndarray] = None,
+    ):
+        size = 0 if ordinals is None else len(ordinals)
+
+        def column(values, dtype, shape):
+            if values is None:
+                values = np.zeros(shape, dtype)
+            values = np.asarray(values, dtype).reshape(shape)
+            return _frozen(values)
+
+        self.ids = column(ids, np.uint8, (size, 16))
+        self.timestamps = column(timestamps, np.int64, (len(TIMESTAMP_FIELDS), size))
+        self.offsets = column(offsets, np.int32, (len(TIMESTAMP_FIELDS), size))
+        self.ordinals = column(ordinals, np.int32, (size,))
+        self.shares = column(shares, np.int64, (size,))
+        self.amounts = column(amounts, np.int64, (size,))
+        self.codes = column(codes, np.uint8, (size,))
+
+    @classmethod
+    def from_events(cls, events: Iterable[VestingEvent]) -> "VestingEventStore":
+        if isinstance(events, cls):
+            return events
+        events = list(events)
+        timestamps = [
+            [datetime_to_parts(getattr(event, name)) for event in events]
+            for name in TIMESTAMP_FIELDS
+        ]
+        return cls(
+            ids=np.frombuffer(b"".join(event.id.bytes for event in events), np.uint8),
+            timestamps=[[micros for micros, _ in parts] for parts in timestamps],
+            offsets=[[offset for _, offset in parts] for parts in timestamps],
+            ordinals=[event.date.toordinal() for event in events],
+            shares=[event.num_shares for event in events],
+            amounts=[event.amount.amount for event in events],
+            codes=[CURRENCY_CODES.index(event.amount.code) for event in events],
+        )
+
+    @classmethod
+    def create(
+        cls,
+        dates: ArrayLike,
+        shares: ArrayLike,
+        amounts: ArrayLike,
+        code: CurrencyCode,
+    ) -> "VestingEventStore":
+        """New events in one currency, with random (version 4) ids and the
+        current time as creation and update time, like `NWBase` defaults."""
+        ordinals = as_dates(dates).astype(np.int64) + EPOCH_ORDINAL
+        size = len(ordinals)
+        ids = np.frombuffer(os.urandom(16 * size), np.uint8).reshape(size, 16).copy()
+        ids[:, 6] = ids[:, 6] & 0x0F | 0x40
+        ids[:, 8] = ids[:, 8] & 0x3F | 0x80
+        micros, offset = datetime_to_parts(datetime.now())
+        return cls(
+            ids=ids,
+            timestamps=np.repeat([[micros], [micros], [0]], size, axis=1),
+            offsets=np.repeat([[offset], [offset], [MISSING_OFFSET]], size, axis=1),
+            ordinals=ordinals,
+            shares=shares,
+            amounts=amounts,
+            codes=np.full(size, CURRENCY_CODES.index(code)),
+        )
+
+    @classmethod
+    def concat(cls, stores: Sequence["VestingEventStore"]) -> "VestingEventStore":
+        if not stores:
+            return cls()
+        return cls(
+            ids=np.concatenate([store.ids for store in stores]),
+            timestamps=np.concatenate([store.timestamps for store in stores], axis=1),
+            offsets=np.concatenate([store.offsets for store in stores], axis=1),
+            ordinals=np.concatenate([store.ordinals for store in stores]),
+            shares=np.concatenate([store.shares for store in stores]),
+            amounts=np.concatenate([store.amounts for store in stores]),
+            codes=np.concatenate([store.codes for store in stores]),
+        )
+
+    @property
+    def days(self) -> np.ndarray:
+        """Vest dates as int64 days since the Unix epoch."""
+        return self.ordinals.astype(np.int64) - EPOCH_ORDINAL
+
+    def dates(self) -> List[date]:
+        return list(map(date.fromordinal, self.ordinals.tolist()))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.__slots__)
+
+    def _event(self, i: int) -> VestingEvent:
+        return VestingEvent.model_construct(
+            id=UUID(bytes=self.ids[i].tobytes()),
+            **{
+                name: datetime_from_parts(
+                    int(self.timestamps[field, i]), int(self.offsets[field, i])
+                )
+                for field, name in enumerate(TIMESTAMP_FIELDS)
+            },
+            date=date.fromordinal(int(self.ordinals[i])),
+            num_shares=int(self.shares[i]),
+            amount=Currency.model_construct(
+                code=CURRENCY_CODES[self.codes[i]], amount=int(self.amounts[i])
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return VestingEventStore(
+                ids=self.ids[index],
+                timestamps=self.timestamps[:, index],
+                offsets=self.offsets[:, index],
+                ordinals=self.ordinals[index],
+                shares=self.shares[index],
+                amounts=self.amounts[index],
+                codes=self.codes[index],
+            )
+        return self._event(range(len(self))[index])
+
+    def __iter__(self) -> Iterator[VestingEvent]:
+        return map(self._event, range(len(self)))
+
+    def _replace(self, store: "VestingEventStore") -> None:
+        for name in self.__slots__:
+            setattr(self, name, getattr(store, name))
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(index, slice):
+            events = self.to_events()
+            events[index] = value
+            self._replace(VestingEventStore.from_events(events))
+            return
+        i = range(len(self))[index]
+        self._replace(
+            VestingEventStore.concat(
+                [self[:i], VestingEventStore.from_events([value]), self[i + 1 :]]
+            )
+        )
+
+    def __delitem__(self, index) -> None:
+        keep = np.ones(len(self), bool)
+        keep[index] = False
+        self._replace(
+            VestingEventStore(
+                ids=self.ids[keep],
+                timestamps=self.timestamps[:, keep],
+                offsets=self.offsets[:, keep],
+                ordinals=self.ordinals[keep],
+                shares=self.shares[keep],
+                amounts=self.amounts[keep],
+                codes=self.codes[keep],
+            )
+        )
+
+    def insert(self, index: int, value: VestingEvent) -> None:
+        # Like list.insert, out of range indexes insert at either end
+        i = slice(index).indices(len(self))[1]
+        self._replace(
+            VestingEventStore.concat(
+                [self[:i], VestingEventStore.from_events([value]), self[i:]]
+            )
+        )
+
+    def extend(self, values: Iterable[VestingEvent]) -> None:
+        self._replace(
+            VestingEventStore.concat([self, VestingEventStore.from_events(values)])
+        )
+
+    def copy(self) -> "VestingEventStore":
+        # Columns are never written to, so copies can share them
+        return self[:]
+
+    def to_events(self) -> List[VestingEvent]:
+        return list(self)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, VestingEventStore):
+            return all(
+                np.array_equal(getattr(self, name), getattr(other, name))
+                for name in self.__slots__
+            )
+        if isinstance(other, (list, tuple)):
+            return self.to_events() == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"VestingEventStore({len(self)} events)"
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        # Validated and serialized as a list of VestingEvent
+        events_schema = handler.generate_schema(List[VestingEvent])
+        from_events = core_schema.no_info_after_validator_function(
+            cls.from_events, events_schema
+        )
+        return core_schema.json_or_python_schema(
+            json_schema=from_events,
+            python_schema=core_schema.union_schema(
+                [
+                    # Copied like a list would be, so models don't share stores
+                    core_schema.no_info_after_validator_function(
+                        cls.copy, core_schema.is_instance_schema(cls)
+                    ),
+                    from_events,
+                ]
+            ),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                cls.to_events, return_schema=events_schema
+            ),
+        )
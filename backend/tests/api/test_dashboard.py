@@ -0,0 +1,109 @@
+from datetime import date
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+import pytest
+
+from networth.finance.withholding import estimate_package_withholding
+from networth.main import create_app
+from networth.models.scenario import FinancialScenario, Investment
+
+from ..test_util.factories import JobFactory, RegularStockGrantFactory
+
+
+@pytest.fixture
+def job():
+    job = JobFactory.build()
+    job.comp_package.stock_grants = RegularStockGrantFactory.build_batch(2)
+    return job
+
+
+@pytest.fixture
+def scenario():
+    return FinancialScenario(
+        name="Base",
+        start_date=date(2024, 1, 1),
+        incomes=[],
+        expenses=[],
+        investments=[
+            Investment(
+                name="Index fund",
+                initial_amount=Decimal("1000"),
+                monthly_contribution=Decimal("100"),
+                expected_return_rate=Decimal("0"),
+            )
+        ],
+    )
+
+
+def test_dashboard_answers_every_query_in_order(job, scenario):
+    client = TestClient(create_app())
+    year = job.comp_package.start_date.year
+
+    response = client.post(
+        "/dashboard",
+        json={
+            "jobs": {"current": job.model_dump(mode="json")},
+            "scenarios": {"base": scenario.model_dump(mode="json")},
+            "queries": [
+                {"type": "projection", "scenario": "base", "years": 10},
+                {
+                    "type": "totals",
+                    "job": "current",
+                    "windows": [
+                        {"start_date": f"{year}-01-01", "end_date": f"{year + 1}-01-01"}
+                    ],
+                },
+                {
+                    "type": "withholding",
+                    "job": "current",
+                    "filing_status": "married_jointly",
+                    "state": "CA",
+                },
+                {"type": "series", "job": "current", "resolution": "monthly"},
+                {"type": "projection", "scenario": "base", "years": 2},
+                {"type": "series", "job": "current", "resolution": "auto"},
+            ],
+        },
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["type"] for result in results] == [
+        "projection",
+        "totals",
+        "withholding",
+        "series",
+        "projection",
+        "error",
+    ]
+
+    assert results[0]["net_worth"] == pytest.approx(
+        [1000 + 1200 * i for i in range(11)]
+    )
+    assert results[4]["net_worth"] == results[0]["net_worth"][:3]
+
+    breakdown = job.comp_package.calculate_compensation_breakdown(
+        date(year, 1, 1), date(year + 1, 1, 1)
+    )
+    assert Decimal(results[1]["totals"][0]) == breakdown.total
+
+    schedule = estimate_package_withholding(job.comp_package, "married_jointly", "CA")
+    assert len(results[2]["years"]) == len(schedule.years)
+    assert results[3]["series"]["resolution"] == "monthly"
+    assert "points" in results[5]["detail"]
+
+
+def test_dashboard_rejects_unknown_references(job):
+    client = TestClient(create_app())
+
+    response = client.post(
+        "/dashboard",
+        json={
+            "jobs": {"current": job.model_dump(mode="json")},
+            "queries": [{"type": "projection", "scenario": "missing", "years": 1}],
+        },
+    )
+
+    assert response.status_code == 422
+    assert "missing" in response.text
@@ -0,0 +1,40 @@
+from fastapi.testclient import TestClient
+import pytest
+
+from networth.main import create_app
+
+from ..test_util.factories import JobFactory, RegularStockGrantFactory
+
+
+def test_compensation_series_endpoint():
+    job = JobFactory.build()
+    job.comp_package.stock_grants = RegularStockGrantFactory.build_batch(2)
+    client = TestClient(create_app())
+
+    response = client.post(
+        "/jobs/series",
+        json={
+            "job": job.model_dump(mode="json"),
+            "resolution": "auto",
+            "num_points": 50,
+        },
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["resolution"] == "auto"
+    assert len(body["period_starts"]) == len(body["cumulative"]) == 50
+    assert body["period_starts"][1:] == body["period_ends"][:-1]
+    assert body["cumulative"][-1] == pytest.approx(sum(body["total"]))
+
+
+def test_compensation_series_rejects_auto_without_points():
+    job = JobFactory.build()
+    client = TestClient(create_app())
+
+    response = client.post(
+        "/jobs/series",
+        json={"job": job.model_dump(mode="json"), "resolution": "auto"},
+    )
+
+    assert response.status_code == 422
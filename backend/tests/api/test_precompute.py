@@ -0,0 +1,166 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from networth.api.precompute import (
+    CHANGED,
+    READ,
+    ArtifactCache,
+    PrecomputeScheduler,
+    artifact_cache,
+)
+from networth.api.store import JobStore
+from networth.main import create_app
+from networth.models.job import Job, JobCreate
+
+from ..test_util.factories import JobFactory, RegularStockGrantFactory
+
+
+def stored_jobs(count):
+    store = JobStore()
+    jobs = []
+    for _ in range(count):
+        job = JobFactory.build()
+        job.comp_package.stock_grants = RegularStockGrantFactory.build_batch(1)
+        jobs.append(store.add(job))
+    return store, jobs
+
+
+def test_changed_jobs_are_built_before_frequently_read_ones():
+    store, (read_often, read_once, changed) = stored_jobs(3)
+    cache = ArtifactCache()
+    scheduler = PrecomputeScheduler(store, cache, hot_reads=1)
+    for _ in range(3):
+        scheduler.job_read(read_often)
+    scheduler.job_read(read_once)
+    scheduler.job_changed(changed)
+    # Already queued; the change moves it up, ahead of the unread change
+    scheduler.job_changed(read_once)
+
+    async def run():
+        scheduler.start()
+        await scheduler.drain()
+        await scheduler.stop()
+
+    asyncio.run(run())
+
+    assert list(cache._artifacts) == [read_once.id, changed.id, read_often.id]
+    assert scheduler.built == 3
+    assert cache.packed(changed).stock_days.size > 0
+
+
+def test_waits_while_foreground_is_busy():
+    store, (job,) = stored_jobs(1)
+    cache = ArtifactCache()
+    busy = [True]
+    scheduler = PrecomputeScheduler(
+        store, cache, busy=lambda: busy[0], idle_delay=0.001, max_delay=0.004
+    )
+    scheduler.job_changed(job)
+
+    async def run():
+        scheduler.start()
+        await asyncio.sleep(0.05)
+        assert len(cache) == 0
+        busy[0] = False
+        await scheduler.drain()
+        await scheduler.stop()
+
+    asyncio.run(run())
+
+    assert scheduler.deferrals > 3
+    assert cache.is_current(job)
+
+
+def test_artifacts_only_match_the_version_they_were_built_from():
+    store, (job,) = stored_jobs(1)
+    cache = ArtifactCache(max_jobs=1)
+    scheduler = PrecomputeScheduler(store, cache)
+
+    async def build():
+        scheduler.start()
+        await scheduler.drain()
+        await scheduler.stop()
+
+    scheduler.job_changed(job)
+    asyncio.run(build())
+    package = job.comp_package.model_copy(update={"stock_grants": []})
+    updated = store.update(job.id, JobCreate(name="New", comp_package=package))
+    assert cache.get(updated) is None
+    # A client can send an edited job with the stored id and updated_at
+    assert cache.get(job.model_copy(update={"comp_package": package})) is None
+    assert cache.get(job.model_copy(update={"name": "Renamed"})) is not None
+
+    scheduler.job_changed(updated)
+    asyncio.run(build())
+    assert cache.get(job) is None
+    assert cache.get(updated) is not None
+
+    scheduler.job_deleted(job.id)
+    assert len(cache) == 0
+
+
+def test_read_jobs_are_dropped_when_the_queue_is_full():
+    store, jobs = stored_jobs(3)
+    scheduler = PrecomputeScheduler(store, ArtifactCache(), max_pending=1)
+
+    assert scheduler.schedule(jobs[0].id, READ)
+    assert not scheduler.schedule(jobs[1].id, READ)
+    assert scheduler.schedule(jobs[2].id, CHANGED)
+    assert len(scheduler) == 2
+
+
+def test_job_endpoints_store_and_precompute_jobs():
+    job = JobFactory.build()
+    body = {
+        "name": "Engineer",
+        "comp_package": job.comp_package.model_dump(mode="json"),
+    }
+
+    with TestClient(create_app()) as client:
+        created = client.post("/jobs/", json=body).json()
+        job_id = created["id"]
+        assert client.get(f"/jobs/{job_id}").json() == created
+        assert job_id in [job["id"] for job in client.get("/jobs/").json()]
+
+        updated = client.put(f"/jobs/{job_id}", json={**body, "name": "Manager"})
+        assert updated.json()["name"] == "Manager"
+        assert updated.json()["updated_at"] > created["updated_at"]
+
+        stored = Job.model_validate(updated.json())
+        deadline = time.monotonic() + 5
+        while artifact_cache.get(stored) is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert artifact_cache.get(stored) is not None
+
+        assert client.delete(f"/jobs/{job_id}").status_code == 204
+        assert client.get(f"/jobs/{job_id}").status_code == 404
+        assert client.delete(f"/jobs/{job_id}").status_code == 404
+
+
+def test_edited_jobs_are_not_served_stored_artifacts():
+    job = JobFactory.build()
+    job.comp_package.stock_grants = RegularStockGrantFactory.build_batch(1)
+    body = {
+        "name": "Engineer",
+        "comp_package": job.comp_package.model_dump(mode="json"),
+    }
+
+    with TestClient(create_app()) as client:
+        stored = Job.model_validate(client.post("/jobs/", json=body).json())
+        deadline = time.monotonic() + 5
+        while artifact_cache.get(stored) is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert artifact_cache.get(stored) is not None
+
+        # Same id and updated_at as the stored job, different package
+        edited = stored.model_copy(deep=True)
+        edited.comp_package.stock_grants = []
+        series = {"resolution": "monthly", "num_points": 12}
+        response = client.post(
+            "/jobs/series", json={"job": edited.model_dump(mode="json"), **series}
+        )
+
+    assert response.status_code == 200
+    assert not any(response.json()["stock_grants"])
@@ -0,0 +1,204 @@
+import asyncio
+import json
+from datetime import date
+from decimal import Decimal
+import threading
+
+from fastapi.testclient import TestClient
+
+from networth.api.progress import RunRegistry, sse_event
+from networth.finance.progress import ProgressEvent
+from networth.main import create_app
+from networth.models.scenario import FinancialModel, FinancialScenario, Investment
+
+
+def parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class FakeRequest:
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnected
+
+
+def test_sse_event_format():
+    assert sse_event("years", {"a": 1}, 3) == 'event: years\nid: 3\ndata: {"a": 1}\n\n'
+
+
+def test_stream_projection_endpoint():
+    scenario = FinancialScenario(
+        name="Base",
+        start_date=date(2024, 1, 1),
+        incomes=[],
+        expenses=[],
+        investments=[
+            Investment(
+                name="Index fund",
+                initial_amount=Decimal("1000"),
+                monthly_contribution=Decimal("10"),
+                expected_return_rate=Decimal("0.05"),
+            )
+        ],
+    )
+    model = FinancialModel(base_scenario=scenario)
+    client = TestClient(create_app())
+
+    response = client.post(
+        "/projections/stream?chunk_years=5",
+        json={"model": model.model_dump(mode="json"), "years": 9},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_sse(response.text)
+    assert [name for name, _ in events] == [
+        "started",
+        "years",
+        "years",
+        "scenario",
+        "complete",
+    ]
+    assert events[0][1]["run_id"] == response.headers["x-run-id"]
+
+    assert client.delete("/projections/runs/unknown").status_code == 404
+
+
+def run_stream(registry: RunRegistry, steps, request, cancel_after: int):
+    async def consume():
+        run = registry.start(steps)
+        received = []
+        async for chunk in run.stream(request, registry):
+            received.append(chunk)
+            if len(received) == cancel_after:
+                registry.cancel(run.id)
+        return received
+
+    return asyncio.run(consume())
+
+
+def test_cancelled_run_releases_computation():
+    closed = []
+
+    def steps():
+        try:
+            for i in range(1000):
+                yield ProgressEvent("step", {"i": i})
+        finally:
+            closed.append(True)
+
+    registry = RunRegistry()
+    received = run_stream(registry, steps(), FakeRequest(), cancel_after=3)
+
+    assert len(received) == 4
+    assert received[-1].startswith("event: cancelled")
+    assert closed == [True]
+    assert len(registry) == 0
+
+
+def test_disconnected_client_stops_run():
+    closed = []
+
+    def steps():
+        try:
+            while True:
+                yield ProgressEvent("step")
+        finally:
+            closed.append(True)
+
+    request = FakeRequest()
+    registry = RunRegistry()
+
+    async def consume():
+        run = registry.start(steps())
+        count = 0
+        async for _ in run.stream(request, registry):
+            count += 1
+            if count == 2:
+                request.disconnected = True
+        return count
+
+    assert asyncio.run(consume()) == 2
+    assert closed == [True]
+    assert len(registry) == 0
+
+
+async def drain(chunks):
+    async for _ in chunks:
+        pass
+
+
+def test_run_cancelled_mid_step_is_removed_and_closed():
+    started, release = threading.Event(), threading.Event()
+    closed = []
+
+    def steps():
+        try:
+            yield ProgressEvent("step")
+            started.set()
+            release.wait(5)
+            yield ProgressEvent("step")
+        finally:
+            closed.append(True)
+
+    registry = RunRegistry()
+
+    async def consume():
+        run = registry.start(steps())
+        task = asyncio.ensure_future(drain(run.stream(FakeRequest(), registry)))
+        while not started.is_set():
+            await asyncio.sleep(0.001)
+        # The client goes away while the second step runs in the thread pool
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        assert len(registry) == 0
+        assert closed == []
+
+        release.set()
+        for _ in range(500):
+            if closed:
+                break
+            await asyncio.sleep(0.01)
+
+    asyncio.run(consume())
+    assert closed == [True]
+
+
+def test_simulation_endpoints():
+    scenario = FinancialScenario(
+        name="Base",
+        start_date=date(2024, 1, 1),
+        incomes=[],
+        expenses=[],
+        investments=[
+            Investment(
+                name="Index fund",
+                initial_amount=Decimal("1000"),
+                monthly_contribution=Decimal("10"),
+                expected_return_rate=Decimal("0.05"),
+            )
+        ],
+    )
+    client = TestClient(create_app())
+    body = {
+        "scenario": scenario.model_dump(mode="json"),
+        "years": 5,
+        "num_paths": 300,
+        "seed": 1,
+    }
+
+    response = client.post("/projections/simulate", json=body)
+    assert response.status_code == 200
+    assert set(response.json()["percentiles"]) == {"5", "25", "50", "75", "95"}
+    assert len(response.json()["mean"]) == 6
+
+    response = client.post("/projections/simulate/stream?batch_paths=100", json=body)
+    events = parse_sse(response.text)
+    assert [name for name, _ in events] == ["started"] + ["paths"] * 3 + ["complete"]
+    assert events[-2][1]["completed_paths"] == 300
@@ -0,0 +1,52 @@
+from datetime import date
+from decimal import Decimal
+
+from fastapi.testclient import TestClient
+import pytest
+
+from networth.main import create_app
+from networth.models.scenario import FinancialScenario, Investment
+
+
+def test_goal_seek_endpoint():
+    scenario = FinancialScenario(
+        name="Base",
+        start_date=date(2024, 1, 1),
+        incomes=[],
+        expenses=[],
+        investments=[
+            Investment(
+                name="Index fund",
+                initial_amount=Decimal("0"),
+                monthly_contribution=Decimal("100"),
+                expected_return_rate=Decimal("0"),
+            )
+        ],
+    )
+    client = TestClient(create_app())
+
+    response = client.post(
+        "/projections/goal-seek",
+        json={
+            "scenario": scenario.model_dump(mode="json"),
+            "parameter": "monthly_contribution",
+            "targets": [12_000, -1],
+            "year": 10,
+        },
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["values"][0] == pytest.approx(100)
+    assert body["values"][1] is None
+
+    response = client.post(
+        "/projections/goal-seek",
+        json={
+            "scenario": scenario.model_dump(mode="json"),
+            "parameter": "salary",
+            "targets": [1],
+            "year": 1,
+        },
+    )
+    assert response.status_code == 422
@@ -0,0 +1,183 @@
+import asyncio
+from datetime import datetime
+import threading
+import time
+
+from networth.api.singleflight import SingleFlight, flight_key
+from networth.cache import SharedCache, model_codec
+from networth.models.job import Job
+from networth.models.scenario import FinancialModel
+
+from ..test_util.factories import JobFactory
+
+
+class SlowComputation:
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, value):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if value is None:
+            raise ValueError("No value")
+        return [value]
+
+
+def test_concurrent_identical_calls_share_one_computation():
+    flights = SingleFlight()
+    compute = SlowComputation()
+
+    async def burst():
+        return await asyncio.gather(
+            *(flights.run("key", compute, 1) for _ in range(10)),
+            flights.run("other", compute, 2),
+        )
+
+    results = asyncio.run(burst())
+
+    assert compute.calls == 2
+    assert results[:10] == [[1]] * 10
+    # Every waiter gets the same object
+    assert all(result is results[0] for result in results[:10])
+    assert results[10] == [2]
+    assert (flights.started, flights.coalesced) == (2, 9)
+    assert len(flights) == 0
+
+
+def test_sequential_calls_are_not_cached():
+    flights = SingleFlight()
+    compute = SlowComputation(delay=0)
+
+    async def twice():
+        await flights.run("key", compute, 1)
+        await flights.run("key", compute, 1)
+
+    asyncio.run(twice())
+    assert compute.calls == 2
+
+
+def test_workers_share_results_through_the_cache(tmp_path):
+    cache_path = tmp_path / "cache.sqlite3"
+    # One SingleFlight per worker process, all on the host's cache file
+    workers = [SingleFlight(cache=SharedCache(cache_path)) for _ in range(3)]
+    compute = SlowComputation(delay=0)
+    codec = model_codec(list)
+
+    async def ask_each_worker():
+        for flights in workers:
+            assert await flights.run(("op", 1), compute, 1, codec=codec) == [1]
+        # Without a codec the cache is not used
+        await workers[0].run(("op", 1), compute, 1)
+
+    asyncio.run(ask_each_worker())
+    assert compute.calls == 2
+
+
+def test_cached_results_follow_entity_contents(tmp_path):
+    cache_path = tmp_path / "cache.sqlite3"
+    first, second = (SingleFlight(cache=SharedCache(cache_path)) for _ in range(2))
+    job = JobFactory.build(name="Original")
+    # Same id and updated_at, as a client can send them
+    edited = job.model_copy(update={"name": "Edited"})
+    codec = model_codec(list)
+
+    async def ask(flights, entity):
+        return await flights.run(
+            flight_key("op", entity), lambda: [entity.name], codec=codec
+        )
+
+    assert asyncio.run(ask(first, job)) == ["Original"]
+    assert asyncio.run(ask(second, edited)) == ["Edited"]
+    assert asyncio.run(ask(second, job)) == ["Original"]
+
+
+def test_errors_reach_every_waiter():
+    flights = SingleFlight()
+    compute = SlowComputation()
+
+    async def burst():
+        return await asyncio.gather(
+            *(flights.run("key", compute, None) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    errors = asyncio.run(burst())
+
+    assert compute.calls == 1
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert len(flights) == 0
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    flights = SingleFlight()
+    compute = SlowComputation(delay=0.1)
+
+    async def cancel_first():
+        first = asyncio.ensure_future(flights.run("key", compute, 1))
+        second = asyncio.ensure_future(flights.run("key", compute, 1))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(cancel_first()) == [1]
+    assert compute.calls == 1
+
+
+def test_flight_key_uses_entity_contents():
+    job = JobFactory.build()
+    renamed = job.model_copy(update={"name": "Renamed"})
+    touched = job.model_copy(
+        update={"created_at": datetime.now(), "updated_at": datetime.now()}
+    )
+
+    assert flight_key("op", job, years=3) != flight_key("op", renamed, years=3)
+    assert flight_key("op", job, years=3) == flight_key("op", touched, years=3)
+    assert flight_key("op", job, years=3) != flight_key("op", job, years=4)
+
+
+def without_identity(value):
+    """A dumped body with every id and audit timestamp left out."""
+    if isinstance(value, dict):
+        return {
+            key: without_identity(item)
+            for key, item in value.items()
+            if key not in ("id", "created_at", "updated_at")
+        }
+    if isinstance(value, list):
+        return [without_identity(item) for item in value]
+    return value
+
+
+def test_flight_key_ignores_parse_time_defaults():
+    body = without_identity(JobFactory.build().model_dump(mode="json"))
+    first = Job.model_validate(body)
+    time.sleep(0.001)
+    second = Job.model_validate(body)
+
+    assert first.id != second.id
+    assert first.comp_package.id != second.comp_package.id
+    assert first.updated_at != second.updated_at
+    assert flight_key("op", first) == flight_key("op", second)
+    assert flight_key("op", first.comp_package) == flight_key("op", second.comp_package)
+
+
+def test_flight_key_hashes_models_without_ids():
+    model = FinancialModel.model_validate(
+        {
+            "base_scenario": {
+                "name": "Base",
+                "start_date": "2024-01-01",
+                "incomes": [],
+                "expenses": [],
+                "investments": [],
+            }
+        }
+    )
+    other = model.model_copy(deep=True)
+    other.base_scenario.name = "Other"
+
+    assert flight_key("op", model) == flight_key("op", model.model_copy(deep=True))
+    assert flight_key("op", model) != flight_key("op", other)
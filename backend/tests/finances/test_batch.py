@@ -0,0 +1,82 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from networth.finance.batch import PackedBatch, evaluate_batch
+from networth.models.compensation_package import CompensationPackage
+
+from ..test_util.factories import (
+    CompensationPackageFactory,
+    RegularStockGrantFactory,
+)
+
+WINDOWS = [
+    (date(2022, 1, 1), date(2023, 1, 1)),
+    (date(2023, 1, 1), date(2024, 1, 1)),
+    (date(2023, 6, 15), date(2024, 2, 29)),
+    (date(2024, 1, 1), date(2025, 1, 1)),
+    (date(2021, 1, 1), date(2026, 1, 1)),
+]
+
+
+@pytest.fixture
+def packages():
+    packages = [
+        CompensationPackageFactory.build(
+            stock_grants=RegularStockGrantFactory.build_batch(2)
+        )
+        for _ in range(9)
+    ]
+    # An employee without any compensation items
+    packages.insert(
+        4,
+        CompensationPackage(
+            employee_id="EMPTY",
+            start_date=date(2022, 1, 1),
+            base_salary_history=[],
+            bonus_payments=[],
+            stock_grants=[],
+            signing_bonuses=[],
+        ),
+    )
+    return packages
+
+
+def assert_matches_packages(result, packages):
+    assert result.salary.shape == (len(packages), len(WINDOWS))
+    for row, package in enumerate(packages):
+        for column, (start, end) in enumerate(WINDOWS):
+            assert result.breakdown(package.employee_id, column) == (
+                package.calculate_compensation_breakdown(start, end)
+            )
+            assert result.total[row, column] / 100 == pytest.approx(
+                float(package.calculate_total_compensation(start, end))
+            )
+
+
+def test_batch_matches_packages(packages):
+    result = evaluate_batch(packages, WINDOWS, max_workers=1)
+
+    assert result.employee_ids == [p.employee_id for p in packages]
+    assert not result.total[4].any()
+    assert_matches_packages(result, packages)
+
+
+def test_process_pool_matches_in_process(packages):
+    in_process = evaluate_batch(packages, WINDOWS, max_workers=1)
+    pooled = evaluate_batch(packages, WINDOWS, max_workers=2, shard_size=3)
+
+    for component in ("salary", "bonuses", "stock_grants", "signing_bonuses"):
+        np.testing.assert_array_equal(
+            getattr(pooled, component), getattr(in_process, component)
+        )
+
+
+def test_event_keys_are_sorted(packages):
+    batch = PackedBatch.from_packages(packages)
+
+    for kind in ("bonus", "stock", "signing"):
+        keys = batch.arrays[f"{kind}_keys"]
+        assert (np.diff(keys) >= 0).all()
+    assert batch.arrays["salary_offsets"][-1] == len(batch.arrays["salary_starts"])
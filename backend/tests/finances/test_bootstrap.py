@@ -0,0 +1,102 @@
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from networth.finance.bootstrap import block_bootstrap, load_returns, simulate_net_worth
+from networth.finance.progress import simulation_progress
+from networth.models.scenario import (
+    Expense,
+    ExpenseCategory,
+    FinancialScenario,
+    Income,
+    Investment,
+)
+
+
+@pytest.fixture
+def scenario() -> FinancialScenario:
+    return FinancialScenario(
+        name="Base",
+        start_date=date(2024, 1, 1),
+        incomes=[
+            Income(source="Salary", amount=Decimal("9000"), tax_rate=Decimal("0.3"))
+        ],
+        expenses=[Expense(category=ExpenseCategory.HOUSING, amount=Decimal("3000"))],
+        investments=[
+            Investment(
+                name="401k",
+                initial_amount=Decimal("40000"),
+                monthly_contribution=Decimal("1500"),
+                expected_return_rate=Decimal("0.07"),
+            ),
+            Investment(
+                name="Brokerage",
+                initial_amount=Decimal("5000"),
+                monthly_contribution=Decimal("250"),
+                expected_return_rate=Decimal("0.05"),
+            ),
+        ],
+    )
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("NETWORTH_CACHE_DIR", str(tmp_path))
+    load_returns.cache_clear()
+    yield tmp_path
+    load_returns.cache_clear()
+
+
+def test_load_returns_memory_maps_bundled_dataset(cache_dir):
+    returns = load_returns()
+
+    assert isinstance(returns, np.memmap)
+    assert len(returns) == 96
+    assert returns[0] == pytest.approx(0.4381)
+    assert len(list(cache_dir.glob("*.npy"))) == 1
+    assert load_returns() is returns
+
+
+def test_block_bootstrap_samples_contiguous_blocks():
+    returns = np.arange(10, dtype=np.float64)
+    paths = block_bootstrap(returns, 12, 50, block_size=4, rng=np.random.default_rng(1))
+
+    assert paths.shape == (50, 12)
+    steps = np.diff(paths.reshape(50, 3, 4), axis=2)
+    assert np.all((steps == 1) | (steps == -9))
+
+    with pytest.raises(ValueError):
+        block_bootstrap(returns, 12, 50, block_size=0)
+
+
+def test_constant_returns_match_deterministic_projection(scenario):
+    scenario.investments[1].expected_return_rate = Decimal("0.07")
+    result = simulate_net_worth(
+        scenario, 30, num_paths=20, returns=np.array([0.07, 0.07]), seed=3
+    )
+
+    expected = [float(v) for v in scenario.project_net_worth(30).values()]
+    for path in result.net_worth:
+        assert path == pytest.approx(expected)
+
+
+def test_recentered_simulation_uses_expected_returns(scenario, cache_dir):
+    result = simulate_net_worth(scenario, 40, num_paths=100_000, recenter=True, seed=7)
+
+    percentiles = result.percentiles()
+    assert result.years == 40
+    assert np.all(percentiles[5] <= percentiles[50])
+    assert np.all(percentiles[50] <= percentiles[95])
+    deterministic = float(scenario.project_net_worth(40)[40])
+    # Volatility drag puts the median a little below the constant-rate path
+    assert 0.6 * deterministic < percentiles[50][-1] < 1.1 * deterministic
+
+
+def test_simulation_progress_reports_percentiles(scenario, cache_dir):
+    events = list(simulation_progress(scenario, 10, 2_500, batch_paths=1_000, seed=1))
+
+    assert [e.event for e in events] == ["paths", "paths", "paths", "complete"]
+    assert [e.data["completed_paths"] for e in events[:3]] == [1_000, 2_000, 2_500]
+    assert len(events[0].data["percentiles"]["50"]) == 11
@@ -0,0 +1,80 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from networth.finance.equity import simulate_equity_value, simulate_share_prices
+from networth.models.compensation_package import StockGrant, VestingScheduleType
+from networth.models.currency import Currency, CurrencyCode
+
+
+def quarterly_grant(grant_date: date, price: int) -> StockGrant:
+    return StockGrant(
+        grant_date=grant_date,
+        total_shares=4800,
+        price_per_share=Currency(amount=price * 100, code=CurrencyCode.USD),
+        vesting_schedule_type=VestingScheduleType.QUARTERLY,
+        vesting_start_date=grant_date,
+        vesting_period_months=48,
+        cliff_months=12,
+    )
+
+
+@pytest.fixture
+def grants():
+    return [
+        quarterly_grant(date(2023, 2, 15), 80),
+        quarterly_grant(date(2024, 2, 15), 100),
+    ]
+
+
+def test_flat_prices_value_vests_at_current_price(grants):
+    result = simulate_equity_value(
+        grants, date(2024, 6, 1), drift=0, volatility=0, num_paths=3
+    )
+
+    assert result.years.tolist() == [2024, 2025, 2026, 2027, 2028]
+    for i, year in enumerate(result.years):
+        shares = sum(
+            event.num_shares
+            for grant in grants
+            for event in grant.calculate_vesting_schedule()
+            if event.date > date(2024, 6, 1) and event.date.year == year
+        )
+        np.testing.assert_allclose(result.values[:, i], shares * 100)
+
+
+def test_mean_value_grows_with_drift(grants):
+    result = simulate_equity_value(
+        grants, date(2024, 6, 1), drift=0.08, volatility=0.4, num_paths=40_000, seed=1
+    )
+    flat = simulate_equity_value(
+        grants, date(2024, 6, 1), drift=0.08, volatility=0, num_paths=1
+    )
+
+    # GBM prices have mean S0 * exp(drift * t) whatever the volatility
+    assert result.mean() == pytest.approx(flat.values[0], rel=0.03)
+    percentiles = result.percentiles((5, 50, 95))
+    assert (percentiles[5] < percentiles[50]).all()
+    assert (percentiles[50] < percentiles[95]).all()
+
+
+def test_seed_reproduces_paths(grants):
+    first = simulate_equity_value(
+        grants, date(2024, 6, 1), 0.05, 0.3, num_paths=100, seed=7
+    )
+    second = simulate_equity_value(
+        grants, date(2024, 6, 1), 0.05, 0.3, num_paths=100, seed=7
+    )
+    np.testing.assert_array_equal(first.values, second.values)
+
+
+def test_no_future_vests(grants):
+    result = simulate_equity_value(grants, date(2030, 1, 1), 0.05, 0.3, num_paths=10)
+
+    assert result.values.shape == (10, 0)
+
+
+def test_share_prices_validate_times():
+    with pytest.raises(ValueError, match="increasing"):
+        simulate_share_prices(100, np.array([1.0, 0.5]), 0.05, 0.2, 10)
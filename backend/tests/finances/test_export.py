@@ -0,0 +1,151 @@
+from datetime import date
+from decimal import Decimal
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from networth.finance.export import (
+    ExportFormat,
+    iter_csv,
+    ledger_batches,
+    projection_batches,
+    sweep_batches,
+    write_export,
+)
+from networth.finance.sweep import sweep_scenario
+from networth.main import create_app
+from networth.models.job import Job
+from networth.models.scenario import (
+    Expense,
+    ExpenseCategory,
+    FinancialModel,
+    FinancialScenario,
+    Income,
+    Investment,
+)
+
+from ..test_util.factories import (
+    CompensationPackageFactory,
+    RegularStockGrantFactory,
+)
+
+
+def make_scenario(name: str, contribution: str) -> FinancialScenario:
+    return FinancialScenario(
+        name=name,
+        start_date=date(2024, 1, 1),
+        incomes=[
+            Income(source="Salary", amount=Decimal("8000"), tax_rate=Decimal("0.25"))
+        ],
+        expenses=[Expense(category=ExpenseCategory.HOUSING, amount=Decimal("2500"))],
+        investments=[
+            Investment(
+                name="Index fund",
+                initial_amount=Decimal("20000"),
+                monthly_contribution=Decimal(contribution),
+                expected_return_rate=Decimal("0.06"),
+            )
+        ],
+    )
+
+
+@pytest.fixture
+def model() -> FinancialModel:
+    return FinancialModel(
+        base_scenario=make_scenario("Base", "500"),
+        alternative_scenarios={"aggressive": make_scenario("Aggressive", "2000")},
+    )
+
+
+def test_projection_csv_matches_compare_scenarios(model):
+    csv = b"".join(iter_csv(projection_batches(model, 10, batch_size=4)))
+    frame = pd.read_csv(io.BytesIO(csv))
+
+    assert list(frame.columns) == ["scenario", "year", "net_worth"]
+    assert frame["net_worth"].dtype == np.float64
+    wide = frame.pivot(index="year", columns="scenario", values="net_worth")
+    expected = model.compare_scenarios(10).astype(float)
+    np.testing.assert_allclose(wide["base"], expected["base"])
+    np.testing.assert_allclose(wide["aggressive"], expected["aggressive"])
+
+
+def test_sweep_batches_cover_every_grid_point(model):
+    result = sweep_scenario(
+        model.base_scenario, 3, {"tax_rate": [0.1, 0.2, 0.3], "expense_scale": [1, 2]}
+    )
+    batches = list(sweep_batches(result, batch_size=5))
+
+    assert len(batches) == 5
+    frame = pd.concat(pd.DataFrame(batch) for batch in batches)
+    assert len(frame) == result.values.size
+    row = frame[
+        (frame.tax_rate == 0.2) & (frame.expense_scale == 2) & (frame.year == 3)
+    ]
+    assert row["net_worth"].item() == result.sel(tax_rate=0.2, expense_scale=2)[3]
+
+
+def test_ledger_batches_are_ordered_by_date():
+    package = CompensationPackageFactory(
+        stock_grants=RegularStockGrantFactory.build_batch(3)
+    )
+    frame = pd.concat(
+        pd.DataFrame(batch) for batch in ledger_batches(package, batch_size=3)
+    )
+
+    assert frame["date"].is_monotonic_increasing
+    assert set(frame["component"]) <= {"salary", "bonus", "stock_vest", "signing_bonus"}
+    bonuses = frame[frame.component == "bonus"]["amount"].sum()
+    assert bonuses == pytest.approx(
+        sum(b.amount.amount for b in package.bonus_payments) / 100
+    )
+
+
+@pytest.mark.parametrize("export_format", [ExportFormat.ARROW, ExportFormat.PARQUET])
+def test_arrow_and_parquet_exports(model, export_format):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    file = io.BytesIO()
+    write_export(projection_batches(model, 20, batch_size=8), export_format, file)
+    file.seek(0)
+
+    if export_format == ExportFormat.ARROW:
+        table = pa.ipc.open_stream(file).read_all()
+    else:
+        table = pq.read_table(file)
+        assert pq.ParquetFile(io.BytesIO(file.getvalue())).num_row_groups == 6
+
+    assert table.num_rows == 42
+    assert table.schema.field("net_worth").type == pa.float64()
+    assert table.schema.field("year").type == pa.int64()
+
+
+def test_export_endpoints(model):
+    client = TestClient(create_app())
+    body = {"model": model.model_dump(mode="json"), "years": 5}
+
+    response = client.post("/projections/", json=body)
+    assert response.status_code == 200
+    assert response.json()["years"] == [0, 1, 2, 3, 4, 5]
+    assert (
+        response.json()["net_worth"]["aggressive"][5]
+        > response.json()["net_worth"]["base"][5]
+    )
+
+    response = client.post("/projections/export?format=csv", json=body)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert len(pd.read_csv(io.BytesIO(response.content))) == 12
+
+    job = Job(
+        name="Engineer",
+        comp_package=CompensationPackageFactory(
+            stock_grants=RegularStockGrantFactory.build_batch(3)
+        ),
+    )
+    response = client.post("/jobs/ledger/export", json=job.model_dump(mode="json"))
+    assert response.status_code == 200
+    assert response.content.startswith(b"date,component,amount")
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from networth.finance.goal_seek import solve_for
+from networth.finance.sweep import ScenarioArrays, project_net_worth
+
+from .test_sweep import scenario  # noqa: F401
+
+
+def net_worth_at(scenario, parameter, value, year):
+    arrays = ScenarioArrays.from_scenario(scenario)
+    return project_net_worth(arrays, year, **{parameter: value})[year]
+
+
+@pytest.mark.parametrize(
+    "parameter, values",
+    [
+        ("monthly_contribution", [250, 1_500, 15_000]),
+        ("income_scale", [0.5, 1.2, 3.0]),
+        ("expense_scale", [0.1, 0.9, 1.7]),
+        ("tax_rate", [0.0, 0.25, 0.6]),
+    ],
+)
+def test_linear_parameters_converge_after_one_interpolation(
+    scenario, parameter, values
+):
+    targets = [net_worth_at(scenario, parameter, v, 20) for v in values]
+    result = solve_for(scenario, parameter, targets, year=20)
+
+    assert result.converged.all()
+    assert result.values == pytest.approx(values)
+    # The initial bracket, at most one widening and one interpolation
+    assert result.evaluations <= 3
+
+
+def test_return_rate_for_many_targets(scenario):
+    targets = np.linspace(1_500_000, 5_000_000, 50)
+    result = solve_for(scenario, "expected_return_rate", targets, year=25)
+
+    assert result.converged.all()
+    assert (np.diff(result.values) > 0).all()
+    assert result.evaluations <= 12
+    assert net_worth_at(
+        scenario, "expected_return_rate", result.values[17], 25
+    ) == pytest.approx(targets[17], abs=0.01)
+
+
+def test_bracket_is_widened(scenario):
+    target = net_worth_at(scenario, "monthly_contribution", 50_000, 10)
+    result = solve_for(
+        scenario, "monthly_contribution", [target], year=10, bracket=(0, 100)
+    )
+
+    assert result.values[0] == pytest.approx(50_000)
+
+
+def test_unreachable_targets_are_nan(scenario):
+    # Even a 100% tax rate leaves more than -1e9
+    result = solve_for(scenario, "tax_rate", [-1e9, 1_000_000], year=10)
+
+    assert np.isnan(result.values[0])
+    assert not result.converged[0]
+    assert result.converged[1]
+
+
+def test_unknown_parameter(scenario):
+    with pytest.raises(ValueError, match="unknown parameter"):
+        solve_for(scenario, "salary", [1], year=1)
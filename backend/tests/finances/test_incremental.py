@@ -0,0 +1,150 @@
+from datetime import date
+
+import pytest
+
+from networth.finance.incremental import IncrementalCompensation
+from networth.models.compensation_package import (
+    BaseSalaryChange,
+    BonusPayment,
+    CompensationPackage,
+    SigningBonus,
+    StockGrant,
+    VestingScheduleType,
+)
+from networth.models.currency import Currency, CurrencyCode
+
+
+def usd(dollars: int) -> Currency:
+    return Currency(amount=dollars * 100, code=CurrencyCode.USD)
+
+
+@pytest.fixture
+def package() -> CompensationPackage:
+    return CompensationPackage(
+        employee_id="EMP123",
+        start_date=date(2015, 1, 1),
+        base_salary_history=[
+            BaseSalaryChange(
+                effective_date=date(2015, 1, 1), annual_amount=usd(100_000)
+            ),
+            BaseSalaryChange(
+                effective_date=date(2018, 4, 1), annual_amount=usd(120_000)
+            ),
+            BaseSalaryChange(
+                effective_date=date(2022, 7, 1), annual_amount=usd(150_000)
+            ),
+        ],
+        bonus_payments=[
+            BonusPayment(date=date(2016, 12, 15), amount=usd(5_000), type="holiday")
+        ],
+        stock_grants=[],
+        signing_bonuses=[],
+    )
+
+
+def assert_matches_direct(incremental: IncrementalCompensation, years: range):
+    for year in years:
+        assert incremental.yearly_breakdown(year) == (
+            incremental.package.calculate_compensation_breakdown(
+                date(year, 1, 1), date(year + 1, 1, 1)
+            )
+        )
+
+
+def test_yearly_breakdowns_are_cached(package):
+    incremental = IncrementalCompensation(package)
+    totals = incremental.yearly_breakdowns(2015, 2024)
+
+    assert list(totals) == list(range(2015, 2025))
+    assert all(incremental.is_cached(year) for year in range(2015, 2025))
+    assert incremental.yearly_total(2016) == totals[2016].total
+    assert_matches_direct(incremental, range(2015, 2025))
+
+
+def test_bonus_only_invalidates_its_year(package):
+    incremental = IncrementalCompensation(package)
+    incremental.yearly_breakdowns(2015, 2024)
+
+    incremental.add_bonus_payment(
+        BonusPayment(date=date(2020, 3, 1), amount=usd(10_000), type="performance")
+    )
+
+    assert not incremental.is_cached(2020)
+    assert all(incremental.is_cached(y) for y in range(2015, 2025) if y != 2020)
+    assert incremental.version == 1
+    assert_matches_direct(incremental, range(2015, 2025))
+
+
+def test_salary_change_invalidates_until_next_change(package):
+    incremental = IncrementalCompensation(package)
+    incremental.yearly_breakdowns(2015, 2024)
+
+    incremental.add_salary_change(
+        BaseSalaryChange(effective_date=date(2020, 1, 1), annual_amount=usd(130_000))
+    )
+
+    assert [y for y in range(2015, 2025) if not incremental.is_cached(y)] == [
+        2019,
+        2020,
+        2021,
+        2022,
+    ]
+    assert_matches_direct(incremental, range(2015, 2025))
+
+
+def test_last_salary_change_invalidates_all_later_years(package):
+    incremental = IncrementalCompensation(package)
+    incremental.yearly_breakdowns(2015, 2030)
+
+    incremental.add_salary_change(
+        BaseSalaryChange(effective_date=date(2025, 6, 1), annual_amount=usd(170_000))
+    )
+
+    assert incremental.is_cached(2024)
+    assert not any(incremental.is_cached(y) for y in range(2025, 2031))
+    assert_matches_direct(incremental, range(2015, 2031))
+
+
+def test_stock_grant_and_signing_bonus(package):
+    incremental = IncrementalCompensation(package)
+    incremental.yearly_breakdowns(2015, 2024)
+
+    incremental.add_signing_bonus(
+        SigningBonus(payment_date=date(2015, 1, 1), amount=usd(20_000))
+    )
+    incremental.add_stock_grant(
+        StockGrant(
+            grant_date=date(2021, 1, 1),
+            total_shares=4000,
+            price_per_share=usd(10),
+            vesting_schedule_type=VestingScheduleType.ANNUAL,
+            vesting_start_date=date(2021, 1, 1),
+            vesting_period_months=48,
+            cliff_months=12,
+        )
+    )
+
+    # Vests fall on Jan 1 2022-2025, so the preceding years are affected too
+    assert [y for y in range(2015, 2025) if not incremental.is_cached(y)] == [
+        2015,
+        2021,
+        2022,
+        2023,
+        2024,
+    ]
+    assert_matches_direct(incremental, range(2015, 2025))
+
+
+def test_invalidate_after_direct_mutation(package):
+    incremental = IncrementalCompensation(package)
+    incremental.yearly_breakdowns(2015, 2024)
+
+    package.bonus_payments[0].amount = usd(7_500)
+    incremental.invalidate(
+        package.bonus_payments[0].date, package.bonus_payments[0].date
+    )
+
+    assert_matches_direct(incremental, range(2015, 2025))
+
+    incremental.invalidate_all()
+    assert not any(incremental.is_cached(y) for y in range(2015, 2025))
@@ -0,0 +1,132 @@
+from datetime import date
+from decimal import Decimal
+from itertools import islice
+
+import pytest
+
+from networth.finance.payroll import (
+    PayFrequency,
+    PayrollSchedule,
+    PayStubType,
+    iter_pay_periods,
+)
+from networth.finance.taxes import TaxCalculator
+from networth.models.compensation_package import (
+    BaseSalaryChange,
+    BonusPayment,
+    CompensationPackage,
+    SigningBonus,
+)
+from networth.models.currency import Currency, CurrencyCode
+
+
+def usd(dollars: int) -> Currency:
+    return Currency(amount=dollars * 100, code=CurrencyCode.USD)
+
+
+@pytest.fixture
+def package() -> CompensationPackage:
+    return CompensationPackage(
+        employee_id="EMP123",
+        start_date=date(2024, 1, 1),
+        base_salary_history=[
+            BaseSalaryChange(
+                effective_date=date(2024, 1, 1), annual_amount=usd(120_000)
+            ),
+            BaseSalaryChange(
+                effective_date=date(2025, 1, 16), annual_amount=usd(144_000)
+            ),
+        ],
+        bonus_payments=[
+            BonusPayment(date=date(2024, 12, 20), amount=usd(10_000), type="annual")
+        ],
+        signing_bonuses=[
+            SigningBonus(payment_date=date(2024, 1, 15), amount=usd(20_000))
+        ],
+        stock_grants=[],
+    )
+
+
+def test_pay_periods():
+    assert list(
+        islice(iter_pay_periods(PayFrequency.SEMIMONTHLY, date(2024, 1, 1)), 3)
+    ) == [
+        (date(2024, 1, 1), date(2024, 1, 16)),
+        (date(2024, 1, 16), date(2024, 2, 1)),
+        (date(2024, 2, 1), date(2024, 2, 16)),
+    ]
+    assert next(
+        iter_pay_periods(PayFrequency.BIWEEKLY, date(2024, 1, 1), date(2024, 3, 1))
+    ) == (date(2024, 2, 26), date(2024, 3, 11))
+    assert next(
+        iter_pay_periods(PayFrequency.MONTHLY, date(2024, 1, 1), date(2024, 12, 31))
+    ) == (date(2024, 12, 1), date(2025, 1, 1))
+
+
+def test_monthly_paychecks(package):
+    payroll = PayrollSchedule(package, PayFrequency.MONTHLY, "married_jointly", "CA")
+    stubs = payroll.pay_stubs(date(2024, 1, 1), date(2025, 1, 1))
+
+    regular = [s for s in stubs if s.type == PayStubType.REGULAR]
+    assert len(regular) == 12
+    assert all(s.gross == usd(10_000) for s in regular)
+    assert [s.type for s in stubs if s.type != PayStubType.REGULAR] == [
+        PayStubType.SIGNING_BONUS,
+        PayStubType.BONUS,
+    ]
+    assert [s.pay_date for s in stubs] == sorted(s.pay_date for s in stubs)
+    assert payroll.total_gross(date(2024, 1, 1), date(2025, 1, 1)) == Decimal(150_000)
+
+    federal, state = TaxCalculator(2024, "married_jointly", "CA").calculate_taxes(
+        [120_000]
+    )
+    assert regular[0].federal_withholding.amount == round(federal[0] * 100 / 12)
+    assert regular[0].state_withholding.amount == round(state[0] * 100 / 12)
+    assert regular[0].net.amount == (
+        regular[0].gross.amount
+        - regular[0].federal_withholding.amount
+        - regular[0].state_withholding.amount
+    )
+
+
+def test_supplemental_withholding(package):
+    payroll = PayrollSchedule(package, PayFrequency.BIWEEKLY, "married_jointly", "CA")
+    (signing,) = [
+        s
+        for s in payroll.pay_stubs(date(2024, 1, 1), date(2024, 2, 1))
+        if s.type == PayStubType.SIGNING_BONUS
+    ]
+    assert signing.federal_withholding == usd(4_400)
+    assert signing.state_withholding == Currency(amount=204_600, code=CurrencyCode.USD)
+
+
+def test_salary_change_is_prorated_within_period(package):
+    payroll = PayrollSchedule(
+        package, PayFrequency.SEMIMONTHLY, "married_jointly", "CA"
+    )
+    stubs = payroll.pay_stubs(date(2025, 1, 1), date(2025, 2, 1))
+
+    # The raise lands exactly on the second period of the month
+    assert [s.gross for s in stubs] == [usd(5_000), usd(6_000)]
+
+    payroll = PayrollSchedule(package, PayFrequency.MONTHLY, "married_jointly", "CA")
+    (january,) = payroll.pay_stubs(date(2025, 1, 1), date(2025, 2, 1))
+    assert january.gross.amount == round(1_000_000 * 15 / 31) + round(
+        1_200_000 * 16 / 31
+    )
+
+
+def test_window_does_not_expand_earlier_periods(package):
+    payroll = PayrollSchedule(package, PayFrequency.BIWEEKLY, "married_jointly", "CA")
+    stubs = payroll.pay_stubs(date(2064, 1, 1), date(2064, 2, 1))
+
+    assert len(stubs) in (2, 3)
+    assert all(date(2064, 1, 1) <= s.pay_date < date(2064, 2, 1) for s in stubs)
+    assert all(
+        s.gross == usd(144_000 // 26) or s.gross.amount == 553_846 for s in stubs
+    )
+
+
+def test_invalid_state(package):
+    with pytest.raises(ValueError, match="Invalid state"):
+        PayrollSchedule(package, PayFrequency.MONTHLY, "married_jointly", "XX")
@@ -0,0 +1,60 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from networth.finance.progress import projection_progress
+from networth.models.scenario import FinancialModel, FinancialScenario, Investment
+
+
+def make_scenario(name: str, rate: str) -> FinancialScenario:
+    return FinancialScenario(
+        name=name,
+        start_date=date(2024, 1, 1),
+        incomes=[],
+        expenses=[],
+        investments=[
+            Investment(
+                name="Index fund",
+                initial_amount=Decimal("10000"),
+                monthly_contribution=Decimal("100"),
+                expected_return_rate=Decimal(rate),
+            )
+        ],
+    )
+
+
+@pytest.fixture
+def model() -> FinancialModel:
+    return FinancialModel(
+        base_scenario=make_scenario("Base", "0.05"),
+        alternative_scenarios={"high": make_scenario("High", "0.08")},
+    )
+
+
+def test_projection_progress_events(model):
+    events = list(projection_progress(model, 24, chunk_years=10))
+
+    assert [e.event for e in events] == (["years"] * 3 + ["scenario"]) * 2 + [
+        "complete"
+    ]
+    assert [e.data["first_year"] for e in events[:3]] == [0, 10, 20]
+    assert len(events[2].data["net_worth"]) == 5
+
+    expected = model.base_scenario.project_net_worth(24)
+    chunks = [v for e in events[:3] for v in e.data["net_worth"]]
+    assert chunks == pytest.approx([float(v) for v in expected.values()])
+    assert events[3].data["net_worth"] == chunks
+    assert events[7].data["completed_scenarios"] == 2
+
+
+def test_projection_progress_can_be_stopped(model):
+    progress = projection_progress(model, 100, chunk_years=1)
+    assert next(progress).event == "years"
+    progress.close()
+
+    with pytest.raises(StopIteration):
+        next(progress)
+
+    with pytest.raises(ValueError):
+        next(projection_progress(model, 10, chunk_years=0))
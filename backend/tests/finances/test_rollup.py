@@ -0,0 +1,152 @@
+from datetime import date
+
+import pytest
+
+from networth.finance.compensation_arrays import PackedCompensation
+from networth.finance.rollup import CompensationRollup
+from networth.models.compensation_package import (
+    BaseSalaryChange,
+    BonusPayment,
+    CompensationPackage,
+    SigningBonus,
+    StockGrant,
+    VestingScheduleType,
+)
+from networth.models.currency import Currency, CurrencyCode
+
+from ..test_util.factories import (
+    CompensationPackageFactory,
+    RegularStockGrantFactory,
+)
+
+
+def usd(dollars: float) -> Currency:
+    return Currency.from_base_units(CurrencyCode.USD, dollars)
+
+
+@pytest.fixture
+def package() -> CompensationPackage:
+    return CompensationPackage(
+        employee_id="EMP123",
+        start_date=date(2022, 3, 14),
+        base_salary_history=[
+            BaseSalaryChange(
+                effective_date=date(2022, 3, 14), annual_amount=usd(95_000)
+            ),
+            BaseSalaryChange(
+                effective_date=date(2023, 7, 1), annual_amount=usd(104_500)
+            ),
+            BaseSalaryChange(
+                effective_date=date(2024, 4, 15), annual_amount=usd(123_456.78)
+            ),
+        ],
+        bonus_payments=[
+            BonusPayment(date=date(2022, 12, 15), amount=usd(4_000), type="holiday"),
+            BonusPayment(
+                date=date(2023, 3, 1), amount=usd(9_500.50), type="performance"
+            ),
+            BonusPayment(date=date(2024, 3, 1), amount=usd(11_000), type="performance"),
+        ],
+        stock_grants=[
+            StockGrant(
+                grant_date=date(2022, 3, 14),
+                total_shares=4800,
+                price_per_share=usd(25.5),
+                vesting_schedule_type=VestingScheduleType.QUARTERLY,
+                vesting_start_date=date(2022, 3, 1),
+                vesting_period_months=48,
+                cliff_months=12,
+            )
+        ],
+        signing_bonuses=[
+            SigningBonus(payment_date=date(2022, 4, 1), amount=usd(15_000))
+        ],
+    )
+
+
+def test_rollup_is_consistent_with_direct_calculation(package):
+    rollup = CompensationRollup.build(package)
+
+    assert rollup.start_month == date(2022, 3, 1)
+    assert rollup.end_month == date(2027, 1, 1)
+    assert rollup.check_consistency() == []
+
+
+def test_rollup_aligned_windows(package):
+    rollup = CompensationRollup.build(package)
+    windows = [
+        (date(2022, 3, 1), date(2026, 3, 1)),
+        (date(2023, 3, 1), date(2023, 3, 1)),
+        (date(2023, 4, 1), date(2024, 4, 1)),
+        (date(2024, 1, 1), date(2024, 7, 1)),
+    ]
+
+    assert rollup.check_consistency(windows) == []
+
+
+def test_rollup_unaligned_windows_fall_back(package, monkeypatch):
+    rollup = CompensationRollup.build(package)
+    calls = []
+    original = CompensationPackage.calculate_compensation_breakdown
+
+    def spy(self, start_date, end_date):
+        calls.append((start_date, end_date))
+        return original(self, start_date, end_date)
+
+    monkeypatch.setattr(CompensationPackage, "calculate_compensation_breakdown", spy)
+
+    rollup.calculate_compensation_breakdown(date(2023, 1, 1), date(2024, 1, 1))
+    assert calls == []
+
+    breakdown = rollup.calculate_compensation_breakdown(
+        date(2023, 1, 15), date(2024, 1, 1)
+    )
+    # Outside the rollup range also falls back
+    rollup.calculate_compensation_breakdown(date(2020, 1, 1), date(2021, 1, 1))
+    assert calls == [
+        (date(2023, 1, 15), date(2024, 1, 1)),
+        (date(2020, 1, 1), date(2021, 1, 1)),
+    ]
+    assert breakdown == original(package, date(2023, 1, 15), date(2024, 1, 1))
+
+
+def test_rollup_monthly_and_yearly_breakdowns(package):
+    rollup = CompensationRollup.build(package)
+
+    monthly = rollup.monthly_breakdowns()
+    assert len(monthly) == 58
+    assert monthly[date(2022, 4, 1)] == package.calculate_compensation_breakdown(
+        date(2022, 4, 1), date(2022, 5, 1)
+    )
+
+    yearly = rollup.yearly_breakdowns()
+    assert list(yearly) == [2023, 2024, 2025, 2026]
+    assert yearly[2024].total == package.calculate_total_compensation(
+        date(2024, 1, 1), date(2025, 1, 1)
+    )
+
+
+def test_rollup_invalid_range(package):
+    with pytest.raises(ValueError, match="month boundary"):
+        CompensationRollup(package, date(2022, 3, 2), date(2023, 1, 1))
+
+    with pytest.raises(ValueError, match="after start month"):
+        CompensationRollup(package, date(2023, 3, 1), date(2023, 1, 1))
+
+
+def test_packed_breakdowns_match_factory_packages():
+    for _ in range(5):
+        package = CompensationPackageFactory(
+            stock_grants=RegularStockGrantFactory.build_batch(3)
+        )
+        packed = PackedCompensation.from_package(package)
+        windows = [
+            (date(2021, 1, 1), date(2022, 1, 1)),
+            (date(2022, 2, 3), date(2024, 8, 19)),
+            (date(2023, 6, 1), date(2023, 6, 1)),
+            (date(2024, 1, 1), date(2023, 1, 1)),
+        ]
+
+        breakdowns = packed.breakdowns(*zip(*windows))
+        for (start, end), breakdown in zip(windows, breakdowns):
+            assert breakdown == package.calculate_compensation_breakdown(start, end)
@@ -0,0 +1,122 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from networth.dates import from_days
+from networth.finance.series import (
+    SeriesResolution,
+    compensation_series,
+    period_boundaries,
+)
+from networth.models.compensation_package import BaseSalaryChange, CompensationPackage
+from networth.models.currency import Currency, CurrencyCode
+
+from ..test_util.factories import (
+    CompensationPackageFactory,
+    RegularStockGrantFactory,
+)
+
+
+@pytest.fixture
+def package() -> CompensationPackage:
+    return CompensationPackageFactory.build(
+        stock_grants=RegularStockGrantFactory.build_batch(2)
+    )
+
+
+def test_monthly_series_matches_package(package):
+    series = compensation_series(package, SeriesResolution.MONTHLY)
+
+    for i in range(len(series)):
+        start, end = from_days(int(series.starts[i])), from_days(int(series.ends[i]))
+        if i:
+            assert start.day == 1
+        assert series.bonuses[i] / 100 == float(
+            package.calculate_total_bonuses(start, end)
+        )
+        assert series.signing_bonuses[i] / 100 == float(
+            package.calculate_total_signing_bonuses(start, end)
+        )
+        # Package stock windows include their end date
+        assert series.stock_grants[i] / 100 == float(
+            package.calculate_total_stock_grants(start, end - timedelta(days=1))
+        )
+
+
+@pytest.mark.parametrize(
+    "resolution,num_points",
+    [
+        (SeriesResolution.DAILY, None),
+        (SeriesResolution.WEEKLY, None),
+        (SeriesResolution.AUTO, 100),
+    ],
+)
+def test_series_add_up_at_any_resolution(package, resolution, num_points):
+    monthly = compensation_series(package, SeriesResolution.MONTHLY)
+    series = compensation_series(package, resolution, num_points=num_points)
+
+    assert series.boundaries[[0, -1]].tolist() == monthly.boundaries[[0, -1]].tolist()
+    for component in ("bonuses", "stock_grants", "signing_bonuses"):
+        assert getattr(series, component).sum() == getattr(monthly, component).sum()
+    # Salary is rounded per boundary, so totals agree to the cent
+    assert series.salary.sum() == monthly.salary.sum()
+    assert series.cumulative[-1] == series.total.sum()
+    if num_points:
+        assert len(series) == num_points
+
+
+def test_salary_accrues_daily():
+    package = CompensationPackage(
+        employee_id="E1",
+        start_date=date(2023, 1, 1),
+        base_salary_history=[
+            BaseSalaryChange(
+                effective_date=date(2023, 1, 1),
+                annual_amount=Currency(amount=365_000_00, code=CurrencyCode.USD),
+            ),
+            BaseSalaryChange(
+                effective_date=date(2024, 1, 1),
+                annual_amount=Currency(amount=730_000_00, code=CurrencyCode.USD),
+            ),
+        ],
+        bonus_payments=[],
+        stock_grants=[],
+        signing_bonuses=[],
+    )
+
+    series = compensation_series(
+        package,
+        SeriesResolution.DAILY,
+        start_date=date(2022, 12, 31),
+        end_date=date(2024, 1, 3),
+    )
+
+    assert series.salary[0] == 0
+    assert series.salary[1] == 1_000_00
+    assert series.salary[-1] == 2_000_00
+    assert series.cumulative[-1] == 365_000_00 + 2 * 2_000_00
+
+
+def test_period_boundaries():
+    start, end = date(2024, 1, 15), date(2024, 4, 1)
+    monthly = period_boundaries(start, end, SeriesResolution.MONTHLY)
+    assert [from_days(int(day)) for day in monthly] == [
+        start,
+        date(2024, 2, 1),
+        date(2024, 3, 1),
+        end,
+    ]
+
+    weekly = period_boundaries(start, end, SeriesResolution.WEEKLY)
+    assert (np.diff(weekly)[:-1] == 7).all()
+
+    auto = period_boundaries(start, date(2024, 1, 20), SeriesResolution.AUTO, 100)
+    assert len(auto) == 6
+
+    with pytest.raises(ValueError, match="positive number of points"):
+        period_boundaries(start, end, SeriesResolution.AUTO)
+    with pytest.raises(ValueError, match="after start"):
+        period_boundaries(end, start, SeriesResolution.DAILY)
+    with pytest.raises(ValueError, match="more than"):
+        period_boundaries(date(1900, 1, 1), end, SeriesResolution.DAILY)
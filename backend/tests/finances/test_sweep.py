@@ -0,0 +1,187 @@
+from datetime import date
+from decimal import Decimal
+import itertools
+
+import numpy as np
+import pytest
+
+from networth.finance.sweep import ScenarioArrays, project_net_worth, sweep_scenario
+from networth.models.scenario import (
+    AmountChange,
+    Expense,
+    ExpenseCategory,
+    FinancialScenario,
+    Income,
+    Investment,
+)
+
+
+@pytest.fixture
+def scenario() -> FinancialScenario:
+    return FinancialScenario(
+        name="Base",
+        start_date=date(2024, 1, 1),
+        incomes=[
+            Income(source="Salary", amount=Decimal("10000"), tax_rate=Decimal("0.3")),
+            Income(
+                source="Rental",
+                amount=Decimal("12000"),
+                is_monthly=False,
+                tax_rate=Decimal("0.2"),
+            ),
+        ],
+        expenses=[
+            Expense(category=ExpenseCategory.HOUSING, amount=Decimal("3000")),
+            Expense(
+                category=ExpenseCategory.OTHER, amount=Decimal("5000"), is_monthly=False
+            ),
+        ],
+        investments=[
+            Investment(
+                name="401k",
+                initial_amount=Decimal("50000"),
+                monthly_contribution=Decimal("1000"),
+                expected_return_rate=Decimal("0.07"),
+            ),
+            Investment(
+                name="Brokerage",
+                initial_amount=Decimal("10000"),
+                monthly_contribution=Decimal("500"),
+                expected_return_rate=Decimal("0.05"),
+            ),
+        ],
+    )
+
+
+def _with_overrides(
+    scenario: FinancialScenario, rate, contribution, scale, tax_rate
+) -> FinancialScenario:
+    return scenario.model_copy(
+        update={
+            "investments": [
+                inv.model_copy(
+                    update={
+                        "expected_return_rate": Decimal(str(rate)),
+                        "monthly_contribution": Decimal(str(contribution)),
+                    }
+                )
+                for inv in scenario.investments
+            ],
+            "expenses": [
+                exp.model_copy(update={"amount": exp.amount * Decimal(str(scale))})
+                for exp in scenario.expenses
+            ],
+            "incomes": [
+                inc.model_copy(update={"tax_rate": Decimal(str(tax_rate))})
+                for inc in scenario.incomes
+            ],
+        }
+    )
+
+
+def test_project_net_worth_without_overrides_matches_model(scenario):
+    result = project_net_worth(ScenarioArrays.from_scenario(scenario), 10)
+    expected = scenario.project_net_worth(10)
+
+    assert result.shape == (11,)
+    assert result == pytest.approx([float(v) for v in expected.values()])
+
+
+def test_sweep_matches_individual_projections(scenario):
+    grids = {
+        "expected_return_rate": [0.04, 0.09],
+        "monthly_contribution": [500, 3000],
+        "expense_scale": [0.8, 1.0, 1.2],
+        "tax_rate": [0.25, 0.35],
+    }
+    result = sweep_scenario(scenario, 5, grids)
+
+    assert result.dims == (*grids, "year")
+    assert result.values.shape == (2, 2, 3, 2, 6)
+
+    for point in itertools.product(*grids.values()):
+        expected = _with_overrides(scenario, *point).project_net_worth(5)
+        labels = dict(zip(grids, point))
+        assert result.sel(**labels) == pytest.approx(
+            [float(v) for v in expected.values()]
+        )
+
+
+def test_sweep_keeps_axes_that_do_not_affect_result(scenario):
+    scenario = scenario.model_copy(update={"investments": []})
+    result = sweep_scenario(scenario, 3, {"expected_return_rate": [0.01, 0.02, 0.03]})
+
+    assert result.values.shape == (3, 4)
+    np.testing.assert_allclose(result.values[0], result.values[2])
+
+
+def test_sweep_to_frame(scenario):
+    result = sweep_scenario(scenario, 2, {"tax_rate": [0.1, 0.2]})
+    frame = result.to_frame()
+
+    assert list(frame.columns) == ["tax_rate", "year", "net_worth"]
+    assert len(frame) == 6
+
+
+def test_sweep_invalid_parameters(scenario):
+    with pytest.raises(ValueError, match="unknown parameters"):
+        sweep_scenario(scenario, 5, {"inflation": [0.02]})
+
+    with pytest.raises(ValueError, match="non-empty"):
+        sweep_scenario(scenario, 5, {"tax_rate": []})
+
+
+def test_income_scale_matches_scaled_incomes(scenario):
+    scaled = scenario.model_copy(
+        update={
+            "incomes": [
+                inc.model_copy(update={"amount": inc.amount * Decimal("1.5")})
+                for inc in scenario.incomes
+            ]
+        }
+    )
+    result = sweep_scenario(scenario, 5, {"income_scale": [1.0, 1.5]})
+
+    assert result.sel(income_scale=1.5) == pytest.approx(
+        [float(v) for v in scaled.project_net_worth(5).values()]
+    )
+
+
+def test_schedules_match_model(scenario):
+    scenario = scenario.model_copy(
+        update={
+            "incomes": [
+                scenario.incomes[0].model_copy(
+                    update={
+                        "growth_rate": Decimal("0.03"),
+                        "changes": [AmountChange(year=8, amount=Decimal("4000"))],
+                    }
+                ),
+                scenario.incomes[1],
+            ],
+            "expenses": [
+                scenario.expenses[0].model_copy(
+                    update={
+                        "changes": [
+                            AmountChange(year=5, amount=Decimal("0")),
+                            AmountChange(year=30, amount=Decimal("100")),
+                        ]
+                    }
+                ),
+                scenario.expenses[1].model_copy(
+                    update={"growth_rate": Decimal("0.025")}
+                ),
+            ],
+        }
+    )
+    arrays = ScenarioArrays.from_scenario(scenario)
+
+    assert arrays.expenses.evaluate(10) == pytest.approx(
+        np.array([[float(v) for v in e.annual_amounts(10)] for e in scenario.expenses])
+    )
+    assert project_net_worth(arrays, 12) == pytest.approx(
+        [float(v) for v in scenario.project_net_worth(12).values()]
+    )
+
+    result = sweep_scenario(scenario, 12, {"income_scale": [1.0, 2.0]})
+    assert result.sel(income_scale=1.0) == pytest.approx(project_net_worth(arrays, 12))
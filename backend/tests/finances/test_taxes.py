@@ -1,7 +1,9 @@
 from decimal import Decimal
+
+import numpy as np
 import pytest
 
-from networth.finance.taxes import TaxCalculator, TaxBracket
+from networth.finance.taxes import TaxCalculator, TaxBracket, projected_tax_table
 from networth.models.taxes import TaxBill
 
 
@@ -68,3 +70,65 @@ def test_tax_bracket_dataclass():
     assert bracket.max == 100
     assert bracket.rate == 0.1
     assert bracket.additional_from_previous == 0
+
+
+def test_calculate_taxes_matches_scalar_calculation():
+    calculator = TaxCalculator(2024, "married_jointly", "CA")
+    incomes = [0, 1, 20_000, 23_201, 250_000, 731_201, 1_000_000, 5_000_000]
+
+    federal, state = calculator.calculate_taxes(incomes)
+
+    for income, fed, st in zip(incomes, federal, state):
+        bill = calculator.calculate_tax(Decimal(income))
+        assert fed == pytest.approx(float(bill.federal))
+        assert st == pytest.approx(float(bill.state))
+
+
+def test_inflation_indexes_future_years():
+    clamped = TaxCalculator(2027, "married_jointly", "CA")
+    indexed = TaxCalculator(2027, "married_jointly", "CA", inflation_rate=0.03)
+
+    assert clamped.year == 2025
+    assert indexed.year == 2027
+    np.testing.assert_allclose(
+        indexed.federal_compiled.mins, clamped.federal_compiled.mins * 1.03**2
+    )
+    # State brackets are indexed from their own last configured year
+    np.testing.assert_allclose(
+        indexed.state_compiled.mins, clamped.state_compiled.mins * 1.03**3
+    )
+    # Indexing scales the whole schedule, so indexed incomes pay indexed tax
+    incomes = np.array([10_000, 150_000, 900_000, 3_000_000])
+    for new, old in zip(
+        indexed.calculate_taxes(incomes * 1.03**2), clamped.calculate_taxes(incomes)
+    ):
+        assert new[0] == pytest.approx(old[0] * 1.03**2)
+    assert indexed.calculate_tax(Decimal(200_000)).federal < (
+        clamped.calculate_tax(Decimal(200_000)).federal
+    )
+
+
+def test_projected_tax_table_matches_calculators():
+    table = projected_tax_table("married_jointly", "CA", 2023, 2060, 0.025)
+    assert projected_tax_table("married_jointly", "CA", 2023, 2060, 0.025) is table
+    assert not table.federal.mins.flags.writeable
+
+    years = np.arange(2023, 2061)
+    incomes = np.array([0, 50_000, 250_000, 2_000_000])
+    federal, state = table.calculate_taxes(years[:, np.newaxis], incomes[np.newaxis, :])
+
+    assert federal.shape == state.shape == (len(years), len(incomes))
+    for row, year in enumerate(years):
+        calculator = TaxCalculator(int(year), "married_jointly", "CA", 0.025)
+        expected_federal, expected_state = calculator.calculate_taxes(incomes)
+        np.testing.assert_allclose(federal[row], expected_federal)
+        np.testing.assert_allclose(state[row], expected_state)
+
+    with pytest.raises(ValueError, match="within"):
+        table.calculate_taxes([2061], [1_000])
+
+
+def test_projected_tax_table_without_inflation_reuses_last_year():
+    table = projected_tax_table("married_jointly", "CA", 2025, 2040, None)
+    federal, _ = table.calculate_taxes([2025, 2040], [300_000, 300_000])
+    assert federal[0] == federal[1]
@@ -0,0 +1,120 @@
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from networth.finance.taxes import TaxCalculator
+from networth.finance.withholding import (
+    estimate_package_withholding,
+    estimate_vest_withholding,
+)
+from networth.models.compensation_package import (
+    BaseSalaryChange,
+    CompensationPackage,
+    StockGrant,
+    VestingScheduleType,
+)
+from networth.models.currency import Currency, CurrencyCode
+
+
+def usd(dollars: int) -> Currency:
+    return Currency(amount=dollars * 100, code=CurrencyCode.USD)
+
+
+def annual_grant(total_shares: int, price: int) -> StockGrant:
+    return StockGrant(
+        grant_date=date(2024, 1, 1),
+        total_shares=total_shares,
+        price_per_share=usd(price),
+        vesting_schedule_type=VestingScheduleType.ANNUAL,
+        vesting_start_date=date(2024, 1, 1),
+        vesting_period_months=48,
+        cliff_months=12,
+    )
+
+
+def test_withholding_at_flat_supplemental_rates():
+    schedule = estimate_vest_withholding(
+        [annual_grant(4000, 50)], "married_jointly", "CA", {2025: 200_000}
+    )
+
+    assert len(schedule) == 4
+    np.testing.assert_allclose(schedule.amounts, 50_000)
+    np.testing.assert_allclose(schedule.federal_withheld, 11_000)
+    np.testing.assert_allclose(schedule.state_withheld, 5_115)
+
+    year = schedule.years[2025]
+    assert year.vest_income == Decimal("50000.0")
+    assert year.total_withheld == Decimal("16115.0")
+
+    calculator = TaxCalculator(2025, "married_jointly", "CA")
+    with_vest = calculator.calculate_tax(Decimal(250_000))
+    without = calculator.calculate_tax(Decimal(200_000))
+    assert float(year.federal_tax) == pytest.approx(
+        float(with_vest.federal - without.federal), abs=0.01
+    )
+    assert float(year.true_up) == pytest.approx(
+        float(year.federal_tax + year.state_tax) - 16_115, abs=0.01
+    )
+
+
+def test_mandatory_rate_above_one_million_per_year():
+    # Two grants vesting $800k each on the same days cross the threshold on
+    # the second vest of every year.
+    grants = [annual_grant(4000, 800), annual_grant(4000, 800)]
+    schedule = estimate_vest_withholding(grants, "married_jointly", "CA")
+
+    assert schedule.grant_index.tolist() == [0, 1] * 4
+    np.testing.assert_allclose(
+        schedule.federal_withheld[:2],
+        [0.22 * 800_000, 0.22 * 200_000 + 0.37 * 600_000],
+    )
+    for year in schedule.years.values():
+        assert year.federal_withheld == Decimal(str(0.22 * 1_000_000 + 0.37 * 600_000))
+
+
+def test_invalid_state():
+    with pytest.raises(ValueError, match="Invalid state"):
+        estimate_vest_withholding([annual_grant(4000, 50)], "married_jointly", "XX")
+
+
+def test_package_withholding_stacks_vests_on_salary():
+    package = CompensationPackage(
+        employee_id="EMP123",
+        start_date=date(2024, 1, 1),
+        base_salary_history=[
+            BaseSalaryChange(
+                effective_date=date(2024, 1, 1), annual_amount=usd(300_000)
+            )
+        ],
+        bonus_payments=[],
+        stock_grants=[annual_grant(4000, 50)],
+        signing_bonuses=[],
+    )
+
+    from_package = estimate_package_withholding(package, "married_jointly", "CA")
+    without_salary = estimate_vest_withholding(
+        package.stock_grants, "married_jointly", "CA"
+    )
+
+    # The same withholding, but a higher marginal rate on top of the salary
+    assert from_package.years[2026].total_withheld == (
+        without_salary.years[2026].total_withheld
+    )
+    assert from_package.years[2026].true_up > without_salary.years[2026].true_up
+
+
+def test_inflation_indexes_future_tax_years():
+    grants = [annual_grant(4000, 50)]
+    other_income = {year: 200_000 for year in range(2025, 2029)}
+
+    clamped = estimate_vest_withholding(grants, "married_jointly", "CA", other_income)
+    indexed = estimate_vest_withholding(
+        grants, "married_jointly", "CA", other_income, inflation_rate=0.05
+    )
+
+    # 2025 federal brackets are configured; later years reuse or index them
+    assert indexed.years[2025].federal_tax == clamped.years[2025].federal_tax
+    assert indexed.years[2028].federal_tax < clamped.years[2028].federal_tax
+    assert indexed.years[2028].federal_withheld == clamped.years[2028].federal_withheld
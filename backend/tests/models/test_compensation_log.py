@@ -0,0 +1,147 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from networth.models.compensation_log import (
+    BonusPaid,
+    CompensationLog,
+    ItemRemoved,
+    LogEntry,
+    SalaryChanged,
+    SigningBonusPaid,
+    StockGranted,
+)
+from networth.models.compensation_package import BaseSalaryChange
+from networth.models.currency import Currency, CurrencyCode
+
+from ..test_util.factories import (
+    BonusPaymentFactory,
+    CompensationPackageFactory,
+    RegularStockGrantFactory,
+    SigningBonusFactory,
+)
+
+START = datetime(2024, 1, 1)
+
+
+def salary(amount: int, effective_date: date) -> BaseSalaryChange:
+    return BaseSalaryChange(
+        effective_date=effective_date,
+        annual_amount=Currency(amount=amount, code=CurrencyCode.USD),
+        bonus_percentage=Decimal("0.1"),
+    )
+
+
+def history(num_changes: int, snapshot_interval: int = 4):
+    """A log with a mix of changes, one day apart, and the package dumped
+    after each one."""
+    package = CompensationPackageFactory.build(
+        base_salary_history=[], bonus_payments=[], stock_grants=[], signing_bonuses=[]
+    )
+    log = CompensationLog(package, snapshot_interval=snapshot_interval)
+    states = [log.state_at().model_dump()]
+    raise_ = salary(100_000_00, date(2024, 1, 1))
+    for i in range(num_changes):
+        change = [
+            lambda: SalaryChanged(change=raise_),
+            lambda: BonusPaid(payment=BonusPaymentFactory.build()),
+            lambda: StockGranted(grant=RegularStockGrantFactory.build()),
+            lambda: SigningBonusPaid(bonus=SigningBonusFactory.build()),
+        ][i % 4]()
+        if i % 5 == 4:
+            # Edit the same salary change rather than adding one
+            raise_ = raise_.model_copy(
+                update={"annual_amount": Currency(amount=i, code=CurrencyCode.USD)}
+            )
+            change = SalaryChanged(change=raise_)
+        log.append(change, START + timedelta(days=i))
+        states.append(log.state_at().model_dump())
+    return log, states
+
+
+def test_every_version_can_be_rebuilt():
+    log, states = history(13)
+
+    assert log.version == 13
+    assert log.snapshot_versions == [0, 4, 8, 12]
+    for version, state in enumerate(states):
+        assert log.state_at(version).model_dump() == state
+
+
+def test_edits_replace_items_and_removals_drop_them():
+    log, _ = history(10)
+    package = log.state_at()
+
+    assert len(package.base_salary_history) == 1
+    assert package.base_salary_history[0].annual_amount.amount == 9
+    assert len(package.bonus_payments) == 2
+
+    grant = package.stock_grants[0]
+    log.append(ItemRemoved(item_id=grant.id))
+    assert [g.id for g in log.state_at().stock_grants] == [
+        g.id for g in package.stock_grants[1:]
+    ]
+    with pytest.raises(ValueError):
+        log.append(ItemRemoved(item_id=grant.id))
+    assert log.version == 11
+
+
+def test_as_of_returns_the_package_at_a_point_in_time():
+    log, states = history(6)
+
+    assert log.as_of(START - timedelta(days=1)).model_dump() == states[0]
+    assert log.as_of(START + timedelta(days=2, hours=12)).model_dump() == states[3]
+    assert log.as_of(START + timedelta(days=30)).model_dump() == states[-1]
+    assert log.state_at(3).updated_at == START + timedelta(days=2)
+
+    with pytest.raises(ValueError):
+        log.append(BonusPaid(payment=BonusPaymentFactory.build()), START)
+
+
+def test_rebuilt_packages_are_independent():
+    log, _ = history(3)
+    package = log.state_at()
+    package.bonus_payments.clear()
+    package.stock_grants[0].total_shares = -1
+
+    assert len(log.state_at().bonus_payments) == 1
+    assert log.state_at().stock_grants[0].total_shares > 0
+
+
+def test_entries_do_not_follow_later_edits_to_the_change():
+    log, _ = history(0)
+    raise_ = salary(100_000_00, date(2024, 1, 1))
+    change = SalaryChanged(change=raise_)
+    log.append(change, START)
+
+    raise_.annual_amount = Currency(amount=1, code=CurrencyCode.USD)
+    change.change = salary(5, date(2024, 2, 1))
+
+    assert log.entries[0].change.change.annual_amount.amount == 100_000_00
+    replayed = CompensationLog.from_entries(log.state_at(0), log.entries)
+    assert replayed.state_at().base_salary_history[0].annual_amount.amount == (
+        100_000_00
+    )
+
+
+def test_log_round_trips_through_stored_entries():
+    log, states = history(9)
+    stored = [entry.model_dump_json() for entry in log.entries]
+    initial = log.state_at(0)
+
+    restored = CompensationLog.from_entries(
+        initial, [LogEntry.model_validate_json(line) for line in stored]
+    )
+
+    assert restored.state_at().model_dump() == states[-1]
+    assert restored.state_at(5).model_dump() == states[5]
+    assert [e.version for e in log.entries_since(7)] == [8, 9]
+    with pytest.raises(ValueError):
+        CompensationLog.from_entries(initial, log.entries[1:])
+
+
+def test_state_at_rejects_unknown_versions():
+    log, _ = history(2)
+    with pytest.raises(ValueError):
+        log.state_at(3)
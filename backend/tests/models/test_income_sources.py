@@ -136,3 +136,24 @@ def test_modifiable_periodic_income_source():
             description="Invalid sources",
             sources=[source1, gap_source],
         )
+
+
+def test_periodic_income_payment_dates():
+    income = PeriodicIncomeSource(
+        amt=sample_currency,
+        name="Salary",
+        description="Biweekly salary",
+        period=timedelta(days=14),
+        income_start_date=date(2024, 1, 5),
+        income_end_date=date(2024, 3, 1),
+    )
+
+    dates = income.payment_dates(date(2024, 1, 10), date(2025, 1, 1))
+
+    assert dates.tolist() == [
+        date(2024, 1, 19),
+        date(2024, 2, 2),
+        date(2024, 2, 16),
+        date(2024, 3, 1),
+    ]
+    assert not len(income.payment_dates(date(2023, 1, 1), date(2024, 1, 5)))
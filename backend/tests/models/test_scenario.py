@@ -0,0 +1,103 @@
+from datetime import date
+from decimal import Decimal
+
+from networth.models.scenario import (
+    AmountChange,
+    Expense,
+    ExpenseCategory,
+    FinancialScenario,
+    Income,
+    Investment,
+)
+
+
+def test_expense_schedule_with_growth_and_step_changes():
+    mortgage = Expense(
+        category=ExpenseCategory.HOUSING,
+        amount=Decimal("2000"),
+        changes=[AmountChange(year=3, amount=Decimal("0"))],
+    )
+    college = Expense(
+        category=ExpenseCategory.OTHER,
+        amount=Decimal("0"),
+        is_monthly=False,
+        growth_rate=Decimal("0.05"),
+        changes=[
+            AmountChange(year=4, amount=Decimal("30000")),
+            AmountChange(year=2, amount=Decimal("0")),
+            AmountChange(year=6, amount=Decimal("0")),
+        ],
+    )
+
+    assert mortgage.annual_amounts(4) == [24000, 24000, 24000, 0, 0]
+    assert college.annual_amounts(6) == [
+        0,
+        0,
+        0,
+        0,
+        Decimal("30000") * Decimal("1.05") ** 4,
+        Decimal("30000") * Decimal("1.05") ** 5,
+        0,
+    ]
+
+
+def test_income_schedule_is_after_tax():
+    income = Income(
+        source="Salary",
+        amount=Decimal("10000"),
+        tax_rate=Decimal("0.25"),
+        growth_rate=Decimal("0.03"),
+    )
+
+    assert income.gross_annual_amounts(2) == [
+        Decimal("120000"),
+        Decimal("120000") * Decimal("1.03"),
+        Decimal("120000") * Decimal("1.03") ** 2,
+    ]
+    assert income.annual_amounts(0) == [income.annual_amount]
+
+
+def test_project_net_worth_accumulates_yearly_savings():
+    scenario = FinancialScenario(
+        name="Base",
+        start_date=date(2024, 1, 1),
+        incomes=[
+            Income(
+                source="Salary",
+                amount=Decimal("100000"),
+                is_monthly=False,
+                tax_rate=Decimal("0"),
+                changes=[AmountChange(year=2, amount=Decimal("50000"))],
+            )
+        ],
+        expenses=[
+            Expense(
+                category=ExpenseCategory.FOOD,
+                amount=Decimal("10000"),
+                is_monthly=False,
+                growth_rate=Decimal("0.1"),
+            )
+        ],
+        investments=[
+            Investment(
+                name="Savings",
+                initial_amount=Decimal("1000"),
+                monthly_contribution=Decimal("0"),
+                expected_return_rate=Decimal("0"),
+            )
+        ],
+    )
+
+    assert scenario.annual_net_incomes(3) == [
+        Decimal("90000"),
+        Decimal("89000.0"),
+        Decimal("37900.00"),
+        Decimal("36690.000"),
+    ]
+    assert scenario.annual_net_income == Decimal("90000")
+    assert scenario.project_net_worth(3) == {
+        0: Decimal("1000"),
+        1: Decimal("91000"),
+        2: Decimal("180000"),
+        3: Decimal("217900"),
+    }
@@ -0,0 +1,153 @@
+from datetime import date, datetime, timedelta, timezone
+import struct
+
+import pytest
+
+from networth.models.compensation_package import (
+    StockGrant,
+    VestingEvent,
+    VestingScheduleType,
+)
+from networth.models.currency import Currency, CurrencyCode
+from networth.models.job import Job
+from networth.models.vesting_events import VestingEventStore
+from networth.models.snapshot import (
+    SNAPSHOT_VERSION,
+    decode_job,
+    decode_package,
+    encode_job,
+    encode_package,
+)
+
+from ..test_util.factories import JobFactory
+
+
+def custom_grant(num_events: int) -> StockGrant:
+    return StockGrant(
+        grant_date=date(2020, 1, 1),
+        total_shares=num_events * 10,
+        price_per_share=Currency(amount=12_345, code=CurrencyCode.EUR),
+        vesting_schedule_type=VestingScheduleType.CUSTOM,
+        vesting_start_date=date(2020, 1, 1),
+        vesting_period_months=num_events,
+        vesting_events=[
+            VestingEvent(
+                date=date(2020, 1, 1) + timedelta(days=30 * i),
+                num_shares=10,
+                amount=Currency(amount=123_450, code=CurrencyCode.EUR),
+            )
+            for i in range(num_events)
+        ],
+    )
+
+
+@pytest.fixture
+def job() -> Job:
+    job = JobFactory.build()
+    job.comp_package.stock_grants.append(custom_grant(240))
+    # Optional and timezone-aware values must survive as well
+    job.comp_package.base_salary_history[0].bonus_percentage = None
+    job.comp_package.base_salary_history[1].reason = None
+    job.comp_package.bonus_payments[0].deleted_at = datetime(
+        2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone(timedelta(hours=-7))
+    )
+    return job
+
+
+def test_job_round_trip(job):
+    data = encode_job(job)
+    decoded = decode_job(data)
+
+    assert decoded == job
+    assert decoded.model_dump() == job.model_dump()
+    assert decoded.comp_package.bonus_payments[0].deleted_at.utcoffset() == (
+        timedelta(hours=-7)
+    )
+    assert decoded.comp_package.stock_grants[-1].calculate_vesting_schedule() == (
+        job.comp_package.stock_grants[-1].calculate_vesting_schedule()
+    )
+
+
+def test_package_round_trip(job):
+    package = job.comp_package
+    assert decode_package(encode_package(package)) == package
+
+
+def test_snapshot_is_much_smaller_than_json(job):
+    assert len(encode_job(job)) * 3 < len(job.model_dump_json())
+
+
+def test_rejects_other_snapshots(job):
+    data = encode_job(job)
+
+    with pytest.raises(ValueError, match="expected"):
+        decode_package(data)
+    with pytest.raises(ValueError, match="version"):
+        decode_job(data[:4] + bytes([SNAPSHOT_VERSION + 1]) + data[5:])
+    with pytest.raises(ValueError, match="Not a snapshot"):
+        decode_job(b"{}" + data)
+
+
+def test_rejects_truncated_and_padded_snapshots(job):
+    data = encode_job(job)
+
+    # Cut inside the header and at a few points of the body
+    for size in (3, 40, len(data) // 2, len(data) - 1):
+        with pytest.raises(ValueError, match="Truncated"):
+            decode_job(data[:size])
+    with pytest.raises(ValueError, match="trailing"):
+        decode_job(data + b"\0")
+    with pytest.raises(ValueError, match="trailing"):
+        decode_package(encode_package(job.comp_package) + b"\0")
+
+
+def corrupt(data: bytes, changed: bytes, value: int) -> bytes:
+    """`data` with `value` in every byte where the encoding of a changed
+    model differs from it."""
+    assert len(data) == len(changed)
+    return bytes(value if byte != other else byte for byte, other in zip(data, changed))
+
+
+def test_rejects_unknown_codes(job):
+    data = encode_job(job)
+
+    other = job.model_copy(deep=True)
+    bonus = other.comp_package.bonus_payments[0]
+    code = (
+        CurrencyCode.EUR if bonus.amount.code != CurrencyCode.EUR else CurrencyCode.USD
+    )
+    bonus.amount = Currency(amount=bonus.amount.amount, code=code)
+    with pytest.raises(ValueError, match="currency"):
+        decode_job(corrupt(data, encode_job(other), 255))
+
+    other = job.model_copy(deep=True)
+    grant = other.comp_package.stock_grants[-1]
+    events = grant.vesting_events
+    grant.vesting_events = VestingEventStore(
+        ids=events.ids,
+        timestamps=events.timestamps,
+        offsets=events.offsets,
+        ordinals=events.ordinals,
+        shares=events.shares,
+        amounts=events.amounts,
+        codes=events.codes + 1,
+    )
+    with pytest.raises(ValueError, match="currency"):
+        decode_job(corrupt(data, encode_job(other), 255))
+
+    other = job.model_copy(deep=True)
+    grant = other.comp_package.stock_grants[-1]
+    grant.vesting_schedule_type = VestingScheduleType.MONTHLY
+    with pytest.raises(ValueError, match="schedule type"):
+        decode_job(corrupt(data, encode_job(other), 255))
+
+
+def test_rejects_invalid_decimals(job):
+    data = encode_job(job)
+    percentage = str(job.comp_package.base_salary_history[1].bonus_percentage)
+    encoded = struct.pack("<I", len(percentage)) + percentage.encode()
+    assert data.count(encoded) == 1
+
+    broken = data.replace(encoded, encoded[:4] + b"x" * len(percentage))
+    with pytest.raises(ValueError, match="decimal"):
+        decode_job(broken)
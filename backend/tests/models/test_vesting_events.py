@@ -0,0 +1,108 @@
+from datetime import date, datetime, timedelta, timezone
+import tracemalloc
+
+import numpy as np
+
+from networth.models.compensation_package import StockGrant
+from networth.models.vesting_events import VestingEventStore
+
+from .test_snapshot import custom_grant
+
+
+def test_store_round_trips_events():
+    events = list(custom_grant(5).vesting_events)
+    events[1] = events[1].model_copy(
+        update={
+            "created_at": datetime(2024, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc),
+            "deleted_at": datetime(
+                2024, 2, 1, tzinfo=timezone(timedelta(hours=5, minutes=30))
+            ),
+        }
+    )
+
+    store = VestingEventStore.from_events(events)
+
+    assert len(store) == 5
+    assert store.to_events() == events
+    assert store[1] == events[1]
+    assert store[-1] == events[-1]
+    assert store[1:3] == events[1:3]
+    assert store.dates() == [event.date for event in events]
+
+
+def test_store_columns():
+    first, second = custom_grant(3).vesting_events, custom_grant(2).vesting_events
+    store = VestingEventStore.concat([first, second])
+
+    assert store == list(first) + list(second)
+    np.testing.assert_array_equal(
+        store.days,
+        np.array([event.date for event in store], "datetime64[D]").astype(np.int64),
+    )
+    assert store.amounts.sum() == 5 * 123_450
+    assert not store.amounts.flags.writeable
+
+
+def test_grant_validates_and_serializes_events_as_list():
+    grant = custom_grant(3)
+    assert isinstance(grant.vesting_events, VestingEventStore)
+
+    dumped = grant.model_dump()
+    assert isinstance(dumped["vesting_events"], list)
+    assert dumped["vesting_events"][0]["date"] == date(2020, 1, 1)
+
+    assert StockGrant.model_validate(dumped) == grant
+    assert StockGrant.model_validate_json(grant.model_dump_json()) == grant
+    schema = StockGrant.model_json_schema()["properties"]["vesting_events"]
+    assert schema["type"] == "array"
+
+
+def test_store_can_be_changed_like_a_list():
+    grant = custom_grant(4)
+    events = list(grant.vesting_events)
+    extra = custom_grant(2).vesting_events.to_events()
+    changed = events[0].model_copy(update={"num_shares": 7})
+
+    grant.vesting_events.append(extra[0])
+    grant.vesting_events[0] = changed
+    grant.vesting_events.insert(1, extra[1])
+    del grant.vesting_events[-2]
+    grant.vesting_events += extra
+
+    expected = [changed, extra[1]] + events[1:3] + [extra[0]] + extra
+    assert grant.vesting_events == expected
+    assert grant.vesting_events.shares[0] == 7
+    assert grant.vesting_events.pop() == extra[-1]
+
+    grant.vesting_events[1:3] = []
+    assert grant.vesting_events == [changed, events[2], extra[0], extra[0]]
+
+
+def test_grant_copies_assigned_events():
+    grant = custom_grant(3)
+    store = VestingEventStore.from_events(custom_grant(2).vesting_events)
+
+    grant.vesting_events = list(store)
+    assert isinstance(grant.vesting_events, VestingEventStore)
+    assert grant.vesting_events == store
+
+    other = StockGrant.model_validate(grant.model_dump() | {"vesting_events": store})
+    other.vesting_events.clear()
+    assert len(store) == 2
+
+
+def test_store_is_an_order_of_magnitude_smaller():
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        events = list(custom_grant(2_000).vesting_events)
+        as_models = tracemalloc.get_traced_memory()[0] - before
+
+        before = tracemalloc.get_traced_memory()[0]
+        store = VestingEventStore.from_events(events)
+        as_store = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    assert as_store * 10 < as_models
+    assert store.nbytes < 100 * len(store)
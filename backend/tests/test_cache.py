@@ -0,0 +1,119 @@
+import sqlite3
+import time
+from typing import List
+
+import numpy as np
+import pytest
+
+from networth.cache import ARRAY_CODEC, SharedCache, model_codec
+from networth.models.currency import Currency
+
+
+class Counter:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def test_instances_on_one_file_share_entries(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    # Separate instances stand in for separate worker processes
+    first, second = SharedCache(path), SharedCache(path)
+    codec = model_codec(List[Currency])
+    compute = Counter([Currency(code="USD", amount=100)])
+
+    assert first.get_or_compute(("rates", 1), compute, codec) == compute.value
+    assert second.get_or_compute(("rates", 1), compute, codec) == compute.value
+    assert compute.calls == 1
+    assert (second.hits, first.misses) == (1, 1)
+
+
+def test_array_codec_round_trips(tmp_path):
+    cache = SharedCache(tmp_path / "cache.sqlite3")
+    array = np.arange(12, dtype=np.int64).reshape(3, 4)
+    cache.set(("table",), ARRAY_CODEC.encode(array))
+    np.testing.assert_array_equal(ARRAY_CODEC.decode(cache.get(("table",))), array)
+
+
+def test_other_versions_miss(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    SharedCache(path, version="1").set(("op", 1), b"old")
+    assert SharedCache(path, version="2").get(("op", 1)) is None
+    assert SharedCache(path, version="1").get(("op", 1)) == b"old"
+
+
+def test_invalidate_drops_one_namespace_for_everyone(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    cache = SharedCache(path)
+    cache.set(("projection", 1), b"a")
+    cache.set(("projection", 2), b"b")
+    cache.set(("withholding", 1), b"c")
+
+    SharedCache(path).invalidate("projection")
+    assert cache.get(("projection", 1)) is None
+    assert cache.get(("withholding", 1)) == b"c"
+
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_oldest_entries_are_evicted(tmp_path):
+    cache = SharedCache(tmp_path / "cache.sqlite3", max_entries=3)
+    for i in range(5):
+        cache.set(("op", i), bytes([i]))
+
+    assert len(cache) == 3
+    assert cache.get(("op", 0)) is None
+    assert cache.get(("op", 4)) == bytes([4])
+
+
+def test_expired_entries_miss(tmp_path, monkeypatch):
+    cache = SharedCache(tmp_path / "cache.sqlite3", ttl=60)
+    cache.set(("op",), b"value")
+    now = time.time()
+    monkeypatch.setattr("networth.cache.time.time", lambda: now + 61)
+    assert cache.get(("op",)) is None
+
+
+def test_database_errors_are_misses(tmp_path):
+    cache = SharedCache(tmp_path / "cache.sqlite3")
+    cache.set(("op",), b"value")
+    cache._connection().close()
+    compute = Counter(np.zeros(2))
+
+    # A closed connection fails every query; the value is still computed
+    assert cache.get(("op",)) is None
+    assert cache.get_or_compute(("op",), compute, ARRAY_CODEC) is compute.value
+
+
+def test_undecodable_entries_are_recomputed(tmp_path):
+    cache = SharedCache(tmp_path / "cache.sqlite3")
+    cache.set(("op",), b"not an array")
+    compute = Counter(np.ones(2))
+
+    np.testing.assert_array_equal(
+        cache.get_or_compute(("op",), compute, ARRAY_CODEC), compute.value
+    )
+    assert compute.calls == 1
+
+
+def test_from_env_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.setenv("NETWORTH_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("NETWORTH_SHARED_CACHE", raising=False)
+    assert SharedCache.from_env() is None
+
+    monkeypatch.setenv("NETWORTH_SHARED_CACHE", "1")
+    monkeypatch.setenv("NETWORTH_SHARED_CACHE_VERSION", "deploy-7")
+    cache = SharedCache.from_env()
+    assert cache.path.parent == tmp_path
+    assert cache.version == "deploy-7"
+    assert sqlite3.connect(cache.path).execute("SELECT 1 FROM entries").fetchall() == []
+
+
+def test_needs_room_for_an_entry(tmp_path):
+    with pytest.raises(ValueError):
+        SharedCache(tmp_path / "cache.sqlite3", max_entries=0)
@@ -11,6 +11,8 @@ from networth.models.compensation_package import (
 )
 from networth.models.currency import Currency, CurrencyCode
 
+from .test_util.factories import CompensationPackageFactory, RegularStockGrantFactory
+
 
 def test_vesting_schedule_type_months():
     assert VestingScheduleType.MONTHLY.months == 1
@@ -188,3 +190,121 @@ def test_compensation_package_salary_change():
 
     # Expected: ~50000 (first half) + ~60000 (second half) = 110000
     assert round(total, 2) == Decimal("109150.69")
+
+
+def test_compensation_package_salary_history_before_period():
+    package = CompensationPackage(
+        employee_id="EMP123",
+        start_date=date(2020, 1, 1),
+        base_salary_history=[
+            BaseSalaryChange(
+                effective_date=date(2022, 1, 1),
+                annual_amount=Currency(amount=110_000_00, code=CurrencyCode.USD),
+            ),
+            BaseSalaryChange(
+                effective_date=date(2020, 1, 1),
+                annual_amount=Currency(amount=100_000_00, code=CurrencyCode.USD),
+            ),
+            BaseSalaryChange(
+                effective_date=date(2024, 1, 1),
+                annual_amount=Currency(amount=120_000_00, code=CurrencyCode.USD),
+            ),
+        ],
+        bonus_payments=[],
+        stock_grants=[],
+        signing_bonuses=[],
+    )
+
+    # Earlier salaries don't reduce the total for a later period
+    total = package.calculate_total_income(
+        start_date=date(2024, 1, 1),
+        end_date=date(2025, 1, 1),
+    )
+    assert total == Decimal("120000.00")
+
+    breakdown = package.calculate_compensation_breakdown(
+        start_date=date(2024, 1, 1),
+        end_date=date(2025, 1, 1),
+    )
+    assert breakdown.salary == total
+    assert breakdown.total == package.calculate_total_compensation(
+        start_date=date(2024, 1, 1),
+        end_date=date(2025, 1, 1),
+    )
+
+
+def test_vesting_schedule_clamps_to_month_end():
+    grant = StockGrant(
+        grant_date=date(2024, 1, 31),
+        total_shares=1200,
+        price_per_share=Currency(amount=10_00, code=CurrencyCode.USD),
+        vesting_schedule_type=VestingScheduleType.MONTHLY,
+        vesting_start_date=date(2024, 1, 31),
+        vesting_period_months=12,
+    )
+
+    events = grant.calculate_vesting_schedule()
+
+    assert [event.date for event in events[:4]] == [
+        date(2024, 2, 29),
+        date(2024, 3, 31),
+        date(2024, 4, 30),
+        date(2024, 5, 31),
+    ]
+    assert len({event.id for event in events}) == 12
+    assert all(event.id.version == 4 for event in events)
+
+
+def test_vesting_schedule_with_cliff_at_end():
+    grant = StockGrant(
+        grant_date=date(2024, 1, 1),
+        total_shares=4000,
+        price_per_share=Currency(amount=10_00, code=CurrencyCode.USD),
+        vesting_schedule_type=VestingScheduleType.QUARTERLY,
+        vesting_start_date=date(2024, 1, 1),
+        vesting_period_months=12,
+        cliff_months=12,
+    )
+
+    events = grant.calculate_vesting_schedule()
+
+    assert [(event.date, event.num_shares) for event in events] == [
+        (date(2025, 1, 1), 4000)
+    ]
+    assert events[0].amount == Currency(amount=40_000_00, code=CurrencyCode.USD)
+
+
+def test_compensation_breakdowns_match_single_windows():
+    package = CompensationPackageFactory.build(
+        stock_grants=RegularStockGrantFactory.build_batch(3)
+    )
+    vest_dates = [
+        event.date
+        for grant in package.stock_grants
+        for event in grant.calculate_vesting_schedule()
+    ]
+    # Windows starting and ending on every item's date, to cover the
+    # exclusive and inclusive ends, plus quarters, an empty and a reversed one
+    edges = sorted(
+        {s.effective_date for s in package.base_salary_history}
+        | {b.date for b in package.bonus_payments}
+        | {b.payment_date for b in package.signing_bonuses}
+        | set(vest_dates[:5])
+    )
+    windows = [(start, end) for start in edges for end in edges]
+    quarters = [date(y, m, 1) for y in range(2020, 2029) for m in (1, 4, 7, 10)]
+    windows += list(zip(quarters, quarters[1:]))
+    windows += [
+        (date(2024, 1, 1), date(2024, 1, 1)),
+        (date(2025, 1, 1), date(2024, 1, 1)),
+    ]
+
+    breakdowns = package.calculate_compensation_breakdowns(windows)
+
+    assert breakdowns == [
+        package.calculate_compensation_breakdown(start, end) for start, end in windows
+    ]
+    assert [b.total for b in breakdowns] == [
+        package.calculate_total_compensation(start, end) for start, end in windows
+    ]
+    assert package.calculate_compensation_breakdowns([]) == []
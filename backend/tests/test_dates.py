@@ -0,0 +1,60 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from networth.dates import (
+    EPOCH_ORDINAL,
+    add_months,
+    calendar_years,
+    date_range,
+    days_between,
+    from_days,
+    month_lengths,
+    to_days,
+)
+
+
+def test_add_months_clamps_to_month_end():
+    shifted = add_months(np.datetime64("2024-01-31"), np.arange(5))
+    assert shifted.tolist() == [
+        date(2024, 1, 31),
+        date(2024, 2, 29),
+        date(2024, 3, 31),
+        date(2024, 4, 30),
+        date(2024, 5, 31),
+    ]
+    # Clamping does not carry over into later months
+    assert add_months([date(2024, 2, 29)], 12).tolist() == [date(2025, 2, 28)]
+    assert add_months([date(2024, 3, 31)], -1).tolist() == [date(2024, 2, 29)]
+
+
+def test_add_months_broadcasts():
+    starts = np.array(["2023-01-15", "2023-08-31"], "datetime64[D]")
+    shifted = add_months(starts[:, np.newaxis], [1, 6])
+    assert shifted.astype(str).tolist() == [
+        ["2023-02-15", "2023-07-15"],
+        ["2023-09-30", "2024-02-29"],
+    ]
+
+
+def test_day_conversions():
+    days = to_days([date(1970, 1, 1), date(2024, 3, 1), date(1969, 12, 31)])
+    assert days.tolist() == [0, 19783, -1]
+    assert from_days(19783) == date(2024, 3, 1)
+    assert date(2024, 3, 1).toordinal() - EPOCH_ORDINAL == 19783
+    assert calendar_years(days).tolist() == [1970, 2024, 1969]
+    assert days_between(date(2024, 1, 1), [date(2024, 3, 1)]).tolist() == [60]
+    assert month_lengths(["2023-02", "2024-02", "2024-12"]).astype(int).tolist() == [
+        28,
+        29,
+        31,
+    ]
+
+
+def test_date_range():
+    dates = date_range(date(2024, 1, 1), date(2024, 1, 15), 7)
+    assert dates.tolist() == [date(2024, 1, 1), date(2024, 1, 8)]
+    assert not len(date_range(date(2024, 1, 1), date(2023, 1, 1)))
+    with pytest.raises(ValueError):
+        date_range(date(2024, 1, 1), date(2024, 2, 1), 0)
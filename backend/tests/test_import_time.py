@@ -0,0 +1,56 @@
+"""Import-time budget for the API process.
+
+Runs a fresh interpreter with `-X importtime` so that the numbers reflect a
+cold start, and prints the most expensive modules (visible with `pytest -s`).
+"""
+
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+# Generous enough for slow CI machines; fastapi + pydantic alone take ~0.4s
+IMPORT_BUDGET_SECONDS = 1.5
+
+# Dependencies that must only be loaded on first use
+LAZY_MODULES = ("pandas", "pyarrow")
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+
+def import_times(statement: str) -> dict[str, int]:
+    """Cumulative import time in microseconds for every module imported."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(SRC_DIR), env.get("PYTHONPATH")) if p
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def test_api_import_time_budget():
+    times = import_times("from networth.main import create_app; create_app()")
+
+    report = sorted(times.items(), key=lambda item: item[1], reverse=True)[:15]
+    print("\nSlowest imports (cumulative ms):")
+    for module, micros in report:
+        print(f"  {micros / 1000:8.1f}  {module}")
+
+    for module in LAZY_MODULES:
+        assert module not in times, f"{module} should not be imported at startup"
+
+    total = sum(micros for module, micros in times.items() if "." not in module)
+    assert total / 1_000_000 < IMPORT_BUDGET_SECONDS
@@ -0,0 +1,59 @@
+import asyncio
+import importlib.util
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from networth.main import create_app
+
+_SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "loadtest.py"
+
+
+@pytest.fixture(scope="module")
+def loadtest():
+    spec = importlib.util.spec_from_file_location("loadtest", _SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_summary_percentiles_and_errors(loadtest):
+    samples = [loadtest.Sample("a", 200, i / 1_000) for i in range(1, 101)] + [
+        loadtest.Sample("b", 500, 0.01),
+        loadtest.Sample("b", None, 0.03),
+    ]
+
+    report = loadtest.summarize(samples, elapsed=2.0)
+
+    assert report["routes"]["a"]["latency_ms"]["p50"] == pytest.approx(50.5)
+    assert report["routes"]["a"]["latency_ms"]["p99"] == pytest.approx(99.01)
+    assert report["routes"]["b"]["error_rate"] == 1
+    assert report["routes"]["b"]["statuses"] == {"500": 1, "failed": 1}
+    assert report["all"]["requests"] == 102
+    assert report["all"]["throughput"] == 51
+    json.dumps(report)
+
+
+def test_generated_requests_succeed_in_process(loadtest):
+    payloads = loadtest.Payloads.build(2)
+
+    async def run():
+        transport = httpx.ASGITransport(app=create_app())
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            return await loadtest.run_load(
+                client,
+                list(loadtest.ROUTES.values()),
+                payloads,
+                concurrency=4,
+                requests=28,
+            )
+
+    samples, elapsed = asyncio.run(run())
+
+    assert len(samples) == 28
+    assert [s for s in samples if not s.ok] == []
+    assert elapsed > 0
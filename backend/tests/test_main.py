@@ -0,0 +1,29 @@
+from datetime import date
+
+from fastapi.testclient import TestClient
+
+from networth.main import create_app
+
+from .test_util.factories import CompensationPackageFactory
+
+
+def test_create_app_registers_routes():
+    client = TestClient(create_app())
+
+    response = client.get("/api/items")
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 3
+
+
+def test_create_job():
+    client = TestClient(create_app())
+    package = CompensationPackageFactory(start_date=date(2024, 1, 1))
+
+    response = client.post(
+        "/jobs/",
+        json={"name": "Engineer", "comp_package": package.model_dump(mode="json")},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "Engineer"
+    assert response.json()["comp_package"]["employee_id"] == package.employee_id
@@ -97,6 +97,19 @@ class StockGrantFactory(factory.Factory):
     vesting_period_months = factory.Faker("pyint", min_value=12, max_value=60)
 
 
+class RegularStockGrantFactory(StockGrantFactory):
+    """A stock grant whose generated vesting schedule can always be expanded."""
+
+    vesting_schedule_type = FuzzyChoice(
+        [VestingScheduleType.MONTHLY, VestingScheduleType.QUARTERLY]
+    )
+    vesting_start_date = factory.LazyFunction(
+        lambda: Faker().date_between(start_date="-2y", end_date="now").replace(day=15)
+    )
+    cliff_months = 12
+    vesting_period_months = 48
+
+
 class CompensationPackageFactory(factory.Factory):
     class Meta:
         model = CompensationPackage